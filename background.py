@@ -0,0 +1,112 @@
+"""Run blocking work off the Tk main thread."""
+
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled."""
+
+
+class BackgroundTask:
+    """
+    Run a callable on a daemon thread and deliver its results on the Tk loop.
+
+    Tk widgets must only be touched from the main thread, so the worker posts
+    messages to a queue that the main thread drains with root.after. The work
+    callable receives the task itself and may call report() with progress
+    payloads and check cancel_event. Only the most recent progress payload is
+    delivered per poll, so fast workers cannot flood the UI. Callbacks are
+    suppressed once the task is cancelled.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(
+        self,
+        root,
+        work: Callable[['BackgroundTask'], Any],
+        on_progress: Optional[Callable[[Any], None]] = None,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        self.root = root
+        self.cancel_event = threading.Event()
+        self._work = work
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._on_error = on_error
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.finished = False
+
+    def start(self) -> 'BackgroundTask':
+        """Start the worker thread and begin polling for its messages."""
+        self._thread.start()
+        self.root.after(self.POLL_INTERVAL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop; no further callbacks will run."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report(self, payload: Any):
+        """Post a progress payload from the worker thread."""
+        self._queue.put(('progress', payload))
+
+    def check_cancelled(self):
+        """Raise TaskCancelled from the worker if the task was cancelled."""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def _run(self):
+        try:
+            result = self._work(self)
+        except TaskCancelled:
+            self._queue.put(('cancelled', None))
+        except Exception as e:
+            self._queue.put(('error', e))
+        else:
+            self._queue.put(('done', result))
+
+    def _poll(self):
+        progress = None
+        has_progress = False
+        final = None
+        try:
+            while True:
+                message = self._queue.get_nowait()
+                if message[0] == 'progress':
+                    progress = message[1]
+                    has_progress = True
+                else:
+                    final = message
+        except queue.Empty:
+            pass
+
+        if self.cancelled:
+            # Keep polling quietly until the worker notices and exits
+            if final is None:
+                self.root.after(self.POLL_INTERVAL_MS, self._poll)
+            else:
+                self.finished = True
+            return
+
+        if has_progress and self._on_progress:
+            self._on_progress(progress)
+
+        if final is None:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+            return
+
+        self.finished = True
+        kind, value = final
+        if kind == 'done' and self._on_done:
+            self._on_done(value)
+        elif kind == 'error' and self._on_error:
+            self._on_error(value)
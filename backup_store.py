@@ -0,0 +1,335 @@
+"""Versioned backups of character files taken before they are overwritten.
+
+Each file body is stored once, zlib-compressed, under objects/<sha256>, so
+backing up an unchanged file again costs nothing but a manifest entry. A
+snapshot is a small JSON manifest naming the files of one directory as they
+were at that moment:
+
+    <CONFIG_DIR>/backups/
+        objects/ab/ab12...        compressed file bodies
+        snapshots/<id>.json       {"id", "created", "reason", "directory", "files"}
+
+Snapshots are pruned by age and total store size; objects no longer named by
+any snapshot are deleted with them. Pruning reads every manifest, so it runs
+automatically once per session and again only when new objects take the
+store past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import CONFIG_DIR
+from character_scanner import classify_filename
+from installs import Directory, split_qualified
+
+
+BACKUP_DIR = CONFIG_DIR / "backups"
+OBJECTS_DIR = BACKUP_DIR / "objects"
+SNAPSHOTS_DIR = BACKUP_DIR / "snapshots"
+
+# Pruning limits
+MAX_STORE_BYTES = 200 * 1024 * 1024
+MAX_AGE_DAYS = 90
+# The newest snapshots are kept even when they are over the limits
+KEEP_LATEST = 10
+
+COMPRESS_LEVEL = 6
+
+_lock = threading.Lock()
+# Bytes of stored objects, known once this session has pruned; None before that
+_store_bytes: Optional[int] = None
+# _store_bytes as the last prune left it; the newest KEEP_LATEST snapshots
+# alone may exceed the limit, so pruning again waits for new objects
+_pruned_bytes = 0
+
+
+def _directory_key(directory: str) -> str:
+    """Normalize a directory path so snapshots of one directory compare equal."""
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def _object_path(digest: str):
+    return OBJECTS_DIR / digest[:2] / digest
+
+
+def _write_atomic(path, data: bytes):
+    """Write data next to path and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.urandom(4).hex()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _store_object(data: bytes) -> str:
+    """Store a file body unless an identical one is already stored; returns its hash."""
+    global _store_bytes
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest)
+    if not path.exists():
+        compressed = zlib.compress(data, COMPRESS_LEVEL)
+        _write_atomic(path, compressed)
+        if _store_bytes is not None:
+            _store_bytes += len(compressed)
+    return digest
+
+
+def _read_object(digest: str) -> bytes:
+    with open(_object_path(digest), 'rb') as f:
+        return zlib.decompress(f.read())
+
+
+def snapshot(directory: str, filenames: Iterable[str], reason: str) -> Optional[dict]:
+    """
+    Back up the named files of directory before they are overwritten.
+
+    Files that don't exist yet are left out. Returns the snapshot record, or
+    None if none of the files existed. Old snapshots are pruned afterwards
+    on the first snapshot of a session, and again only once new objects have
+    taken the store past MAX_STORE_BYTES and past its size after the last
+    prune.
+    """
+    files: Dict[str, dict] = {}
+    # Held throughout so pruning never deletes an object before its manifest exists
+    with _lock:
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            files[filename] = {'blob': _store_object(data), 'size': len(data), 'mtime': mtime}
+
+        if not files:
+            return None
+
+        created = time.time()
+        snapshot_id = time.strftime('%Y%m%d-%H%M%S', time.localtime(created)) + '-' + os.urandom(3).hex()
+        record = {
+            'id': snapshot_id,
+            'created': created,
+            'reason': reason,
+            'directory': os.path.abspath(directory),
+            'files': files,
+        }
+        _write_atomic(SNAPSHOTS_DIR / f"{snapshot_id}.json", json.dumps(record, indent=2).encode())
+        if _store_bytes is None or _store_bytes > max(MAX_STORE_BYTES, _pruned_bytes):
+            _prune()
+    return record
+
+
+def backup_files(directory: Directory, written: Iterable[str], reason: str) -> List[dict]:
+    """
+    Snapshot files that are about to be written.
+
+    written uses the same names as apply_written_files: plain file names for
+    a single directory, "install:filename" for an install mapping, which
+    gives one snapshot per install. Returns the snapshots taken.
+    """
+    if isinstance(directory, str):
+        groups = {directory: list(written)}
+    else:
+        groups: Dict[str, List[str]] = {}
+        for name in written:
+            install, filename = split_qualified(name)
+            if install in directory:
+                groups.setdefault(directory[install], []).append(filename)
+
+    records = []
+    for path, filenames in groups.items():
+        record = snapshot(path, filenames, reason)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def _read_snapshots() -> List[dict]:
+    """Return every readable snapshot, newest first."""
+    records = []
+    try:
+        entries = list(os.scandir(SNAPSHOTS_DIR))
+    except FileNotFoundError:
+        return records
+    for entry in entries:
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path, 'r') as f:
+                records.append(json.load(f))
+        except (OSError, ValueError):
+            # A damaged manifest only loses that one snapshot
+            continue
+    records.sort(key=lambda record: record['created'], reverse=True)
+    return records
+
+
+def snapshot_characters(record: dict) -> List[str]:
+    """Return the sorted character names with files in a snapshot."""
+    names = set()
+    for filename in record['files']:
+        classified = classify_filename(filename)
+        if classified is not None:
+            names.add(classified[0])
+    return sorted(names)
+
+
+def list_snapshots(directories: Optional[Iterable[str]] = None, character: Optional[str] = None) -> List[dict]:
+    """
+    Return snapshots newest first, optionally only those of some directories
+    or those holding files of one (unqualified) character.
+    """
+    records = _read_snapshots()
+    if directories is not None:
+        keys = {_directory_key(directory) for directory in directories}
+        records = [record for record in records if _directory_key(record['directory']) in keys]
+    if character is not None:
+        records = [record for record in records if character in snapshot_characters(record)]
+    return records
+
+
+def get_snapshot(snapshot_id: str) -> dict:
+    """Load one snapshot; raises ValueError if it doesn't exist."""
+    path = SNAPSHOTS_DIR / f"{snapshot_id}.json"
+    if os.path.basename(snapshot_id) != snapshot_id or not path.exists():
+        raise ValueError(f"No backup named '{snapshot_id}'")
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def restore_snapshot(snapshot_id: str, characters: Optional[List[str]] = None) -> Tuple[str, List[str]]:
+    """
+    Write a snapshot's files back into its directory.
+
+    Pass characters (unqualified names) to roll back only those characters.
+    The files being replaced are backed up first, so a restore can itself be
+    undone. Returns (directory, file names written).
+    """
+    record = get_snapshot(snapshot_id)
+    directory = record['directory']
+    files = record['files']
+    if characters is not None:
+        wanted = set(characters)
+        files = {
+            filename: entry for filename, entry in files.items()
+            if (classify_filename(filename) or (None,))[0] in wanted
+        }
+
+    # Manifests are ours, but never let one write outside the directory
+    files = {
+        filename: entry for filename, entry in files.items()
+        if os.path.basename(filename) == filename and classify_filename(filename) is not None
+    }
+    # Read the bodies first: the snapshot below may prune this one
+    bodies = {filename: _read_object(entry['blob']) for filename, entry in files.items()}
+    snapshot(directory, files, f"before restoring {snapshot_id}")
+
+    written = []
+    for filename, entry in files.items():
+        target = os.path.join(directory, filename)
+        data = bodies[filename]
+        tmp_path = f"{target}.{os.urandom(4).hex()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.utime(tmp_path, (entry['mtime'], entry['mtime']))
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        written.append(filename)
+    return directory, written
+
+
+def _object_sizes() -> Dict[str, int]:
+    """Return the on-disk size of every stored object by hash."""
+    sizes = {}
+    try:
+        buckets = list(os.scandir(OBJECTS_DIR))
+    except FileNotFoundError:
+        return sizes
+    for bucket in buckets:
+        if not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            if not entry.name.endswith('.tmp'):
+                sizes[entry.name] = entry.stat().st_size
+    return sizes
+
+
+def store_size() -> int:
+    """Return the total size of stored file bodies in bytes."""
+    return sum(_object_sizes().values())
+
+
+def prune(max_bytes: int = MAX_STORE_BYTES, max_age_days: float = MAX_AGE_DAYS,
+          keep_latest: int = KEEP_LATEST) -> Tuple[int, int]:
+    """
+    Delete old snapshots until the store is within its limits.
+
+    See _prune; returns (snapshots removed, bytes freed).
+    """
+    with _lock:
+        return _prune(max_bytes, max_age_days, keep_latest)
+
+
+def _prune(max_bytes: int = MAX_STORE_BYTES, max_age_days: float = MAX_AGE_DAYS,
+           keep_latest: int = KEEP_LATEST) -> Tuple[int, int]:
+    """
+    Delete old snapshots until the store is within its limits.
+
+    Snapshots older than max_age_days go first, then the oldest remaining ones
+    until the objects they share fit in max_bytes. The newest keep_latest
+    snapshots are always kept. Objects left unreferenced are deleted.
+    Returns (snapshots removed, bytes freed).
+    """
+    global _store_bytes, _pruned_bytes
+    records = _read_snapshots()
+    sizes = _object_sizes()
+    cutoff = time.time() - max_age_days * 86400
+
+    kept = records[:keep_latest]
+    candidates = records[keep_latest:]
+    removed = [record for record in candidates if record['created'] < cutoff]
+    kept += [record for record in candidates if record['created'] >= cutoff]
+
+    def referenced(records):
+        return {entry['blob'] for record in records for entry in record['files'].values()}
+
+    used = referenced(kept)
+    total = sum(sizes.get(digest, 0) for digest in used)
+    # kept is newest first, so drop from the end
+    while total > max_bytes and len(kept) > keep_latest:
+        removed.append(kept.pop())
+        still_used = referenced(kept)
+        total -= sum(sizes.get(digest, 0) for digest in used - still_used)
+        used = still_used
+
+    for record in removed:
+        try:
+            os.unlink(SNAPSHOTS_DIR / f"{record['id']}.json")
+        except FileNotFoundError:
+            pass
+
+    freed = 0
+    for digest, size in sizes.items():
+        if digest not in used:
+            try:
+                os.unlink(_object_path(digest))
+                freed += size
+            except FileNotFoundError:
+                pass
+    _store_bytes = _pruned_bytes = total
+    return len(removed), freed
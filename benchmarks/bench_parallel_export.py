@@ -0,0 +1,61 @@
+"""Compare the serial and parallel export writers on a synthetic directory.
+
+Usage: python benchmarks/bench_parallel_export.py [--characters N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character_scanner import scan_character_files  # noqa: E402
+from file_operations import create_export_zip  # noqa: E402
+from synthetic import generate_quarm_directory  # noqa: E402
+
+
+def _time_export(zip_path, characters, compression, max_workers, repeat):
+    """Return the best wall time of repeated exports."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        create_export_zip(
+            zip_path, list(characters), characters, True, True, True,
+            compression=compression, max_workers=max_workers
+        )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--characters', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = generate_quarm_directory(os.path.join(tmp, 'quarm'), args.characters)
+        characters = scan_character_files(directory)
+        serial_zip = os.path.join(tmp, 'serial.zip')
+        parallel_zip = os.path.join(tmp, 'parallel.zip')
+
+        print(f"{args.characters} characters, {os.cpu_count()} CPUs, best of {args.repeat}")
+        for compression in ('fast', 'normal', 'max'):
+            serial = _time_export(serial_zip, characters, compression, 1, args.repeat)
+            parallel = _time_export(parallel_zip, characters, compression, None, args.repeat)
+
+            with open(serial_zip, 'rb') as a, open(parallel_zip, 'rb') as b:
+                identical = a.read() == b.read()
+            with zipfile.ZipFile(parallel_zip) as zipf:
+                valid = zipf.testzip() is None
+
+            print(f"  {compression:<7} serial {serial:7.3f}s  parallel {parallel:7.3f}s  "
+                  f"speedup {serial / parallel:4.2f}x  identical={identical}  valid={valid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Benchmark suite for the scanning, copy and export paths.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scales small medium large] [--output results.json]
+    python benchmarks/run_benchmarks.py --baseline baseline.json [--threshold 0.25]
+
+Each scale generates a synthetic directory (see synthetic.py) with a realistic
+mix of missing files and file sizes, then times the operations below, keeping
+the best of --repeat runs. Results are written as JSON; with --baseline the
+run is compared against an earlier results file and exits with status 1 if
+any benchmark got slower than the threshold allows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+# Keep the scan cache and config of the benchmark away from the user's own
+os.environ['LOCALAPPDATA'] = tempfile.mkdtemp(prefix='quarm-bench-config-')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character_scanner import scan_character_files  # noqa: E402
+from copy_plan import plan_copy  # noqa: E402
+from duplicates import find_duplicates  # noqa: E402
+from file_operations import copy_character_files, copy_character_files_batch, create_export_zip  # noqa: E402
+from import_operations import mark_conflicts, plan_import  # noqa: E402
+from installs import apply_written_files  # noqa: E402
+from scan_cache import clear_cache, load_character_index, refresh_files  # noqa: E402
+from synthetic import REALISTIC_MISSING, generate_quarm_directory  # noqa: E402
+
+
+# name -> (characters, size_scale); the large scale uses smaller files so it
+# fits in a temporary directory (~150 MB instead of ~1.5 GB)
+SCALES = {
+    'small': (10, 1.0),
+    'medium': (1000, 1.0),
+    'large': (20000, 0.1),
+}
+
+# Copy benchmarks write to at most this many new characters
+COPY_TARGETS = 100
+
+# Differences below this many seconds are never reported as regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def _best_of(repeat, func, setup=None):
+    """Return the best wall time of func over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _remove_files(directory, names):
+    for name in names:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def run_scale(name, root, repeat):
+    """Generate one synthetic directory and time every benchmark on it."""
+    count, size_scale = SCALES[name]
+    directory = os.path.join(root, name)
+    start = time.perf_counter()
+    generate_quarm_directory(directory, count, missing=REALISTIC_MISSING, vary_sizes=True, size_scale=size_scale)
+    print(f"{name}: {count} characters generated in {time.perf_counter() - start:.1f}s")
+
+    characters = scan_character_files(directory)
+    names = list(characters)
+    source = next((n for n in names if all(characters[n].get(k) for k in ('ui', 'config', 'spellsets'))), names[0])
+    targets = [f"Bench{i:05d}" for i in range(min(COPY_TARGETS, count))]
+    copied = []
+    results = {}
+
+    def timed(bench, func, setup=None):
+        results[bench] = _best_of(repeat, func, setup)
+        print(f"  {bench:<32} {results[bench] * 1000:10.2f} ms")
+
+    # Scanning: a full listing, a cold scan-cache load and a cache hit
+    timed('scan_character_files', lambda: scan_character_files(directory))
+    timed('load_character_index_cold', lambda: load_character_index(directory), setup=clear_cache)
+    timed('load_character_index_cached', lambda: load_character_index(directory))
+
+    # Planning a copy to every character, and the overwrite check the confirmation shows
+    others = [n for n in names if n != source]
+    timed('plan_copy_all', lambda: plan_copy(source, others, characters, directory, True, True, True))
+    timed('plan_copy_overwrites', lambda: plan_copy(source, others, characters, directory,
+                                                    True, True, True).overwrites())
+
+    timed('find_duplicates', lambda: find_duplicates(characters))
+
+    # Copies to new characters, one at a time and as a fan-out
+    def copy_each():
+        for target in targets:
+            copied.extend(copy_character_files(source, target, characters, directory, True, True, True))
+
+    def reset_copies():
+        _remove_files(directory, copied)
+        copied.clear()
+
+    timed('copy_character_files', copy_each, setup=reset_copies)
+    reset_copies()
+    timed('copy_character_files_batch', lambda: copy_character_files_batch(
+        source, targets, characters, directory, True, True, True
+    ), setup=reset_copies)
+    timed('copy_batch_skip_identical', lambda: copy_character_files_batch(
+        source, targets, characters, directory, True, True, True, skip_identical=True
+    ))
+
+    # The index refresh and list building the window does after a copy
+    written = [f for target in targets for f in os.listdir(directory) if target in f]
+    timed('refresh_files_after_copy', lambda: refresh_files(directory, written))
+    timed('apply_written_files_after_copy', lambda: apply_written_files(dict(characters), directory, written))
+    timed('sort_and_filter_targets', lambda: [c for c in sorted(characters) if c != source])
+
+    # Export, and planning an import of the result
+    zip_path = os.path.join(root, f"{name}.zip")
+    timed('create_export_zip', lambda: create_export_zip(zip_path, names, characters, True, True, True))
+    timed('create_export_zip_dedup', lambda: create_export_zip(
+        zip_path + '.dedup', names, characters, True, True, True, dedup=True
+    ))
+    plan = []
+    timed('plan_import', lambda: plan.__setitem__(slice(None), plan_import(zip_path, characters)))
+    timed('mark_conflicts', lambda: mark_conflicts(plan, characters))
+
+    shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print current vs. baseline timings; returns the list of regressions."""
+    regressions = []
+    print(f"\nComparison against baseline (threshold +{threshold:.0%}):")
+    for scale, benches in results['results'].items():
+        base_benches = baseline.get('results', {}).get(scale, {})
+        for bench, seconds in benches.items():
+            base = base_benches.get(bench)
+            if base is None:
+                continue
+            ratio = seconds / base if base else float('inf')
+            regressed = ratio > 1 + threshold and seconds - base > MIN_REGRESSION_SECONDS
+            flag = "REGRESSION" if regressed else ""
+            print(f"  {scale:<7} {bench:<32} {base * 1000:10.2f} -> {seconds * 1000:10.2f} ms  {ratio:5.2f}x  {flag}")
+            if regressed:
+                regressions.append((scale, bench, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', nargs='+', default=['small', 'medium'], choices=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix='quarm-bench-') as root:
+            for scale in args.scales:
+                results['results'][scale] = run_scale(scale, root, args.repeat)
+    finally:
+        shutil.rmtree(os.environ['LOCALAPPDATA'], ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found.")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
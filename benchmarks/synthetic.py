@@ -0,0 +1,63 @@
+"""Generate synthetic Project Quarm directories for benchmarks."""
+
+import os
+import random
+from typing import Dict, Optional
+
+
+# Share of characters missing each file kind in a "realistic" directory:
+# alts that never opened a spell book have no spellsets, and some characters
+# only ever got a UI layout copied to them
+REALISTIC_MISSING = {'ui': 0.05, 'config': 0.10, 'spellsets': 0.30}
+
+
+def _ini_text(rng: random.Random, sections: int, keys_per_section: int) -> str:
+    """Build INI text shaped like the game's window/hotbar files."""
+    lines = []
+    for section in range(sections):
+        lines.append(f"[Window{section}]")
+        for key in range(keys_per_section):
+            lines.append(f"Key{key}={rng.randint(0, 4000)}")
+    return "\n".join(lines) + "\n"
+
+
+def _sections(rng: random.Random, base: int, size_scale: float, vary_sizes: bool) -> int:
+    """Return a section count around base, scaled and optionally jittered."""
+    if vary_sizes:
+        base = rng.randint(base // 2, base * 3 // 2)
+    return max(1, round(base * size_scale))
+
+
+def generate_quarm_directory(
+    directory: str,
+    characters: int,
+    seed: Optional[int] = 0,
+    missing: Optional[Dict[str, float]] = None,
+    vary_sizes: bool = False,
+    size_scale: float = 1.0
+) -> str:
+    """
+    Fill directory with UI, config and spellsets files for N characters.
+
+    By default each character gets a ~64 KB UI file, a ~11 KB config file and
+    a ~2 KB spellsets file. missing maps a file kind to the probability that a
+    character lacks it (see REALISTIC_MISSING), vary_sizes spreads file sizes
+    from half to one and a half times the default, and size_scale shrinks or
+    grows every file so very large directories fit on disk.
+    """
+    rng = random.Random(seed)
+    missing = missing or {}
+    os.makedirs(directory, exist_ok=True)
+    for index in range(characters):
+        name = f"Char{index:05d}"
+        files = (
+            ('ui', f"UI_{name}_pq.proj.ini", 120, 50),
+            ('config', f"{name}_pq.proj.ini", 20, 50),
+            ('spellsets', f"{name}_spellsets.ini", 4, 40),
+        )
+        for kind, filename, sections, keys in files:
+            if kind in missing and rng.random() < missing[kind]:
+                continue
+            with open(os.path.join(directory, filename), 'w') as f:
+                f.write(_ini_text(rng, _sections(rng, sections, size_scale, vary_sizes), keys))
+    return directory
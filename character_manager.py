@@ -2,25 +2,90 @@
 
 import os
 import sys
-import shutil
+import time
+from collections import Counter
 from typing import Dict
-from datetime import datetime
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
-from config import load_saved_directory, save_directory
-from character_scanner import scan_character_files
-from file_operations import copy_character_files, get_files_to_overwrite, create_export_zip
-from ui_components import create_directory_section, create_copy_tab, create_export_tab
+from config import (
+    load_active_profiles, load_profiles, load_saved_directory, save_directory, save_profiles, settings
+)
+from character_scanner import CharacterFiles, classify_filename
+from name_index import IncrementalFilter, NameIndex
+from installs import apply_written_files, check_install_name, directory_stamps, qualify, scan_installs, split_qualified
+from scan_cache import directory_stamp, load_character_index
+from copy_plan import OVERWRITE, execute_plan, plan_copy
+from ini_engine import parse_patterns
+from file_operations import create_export_zip, default_export_filename
+from background import BackgroundTask
+import metrics
+import startup_timing
+from copy_engine import CopyStats
+from ui_components import COMPRESSION_CHOICES, COPY_MODE_CHOICES, create_directory_section, create_profile_row, create_progress_row, create_copy_tab, create_export_tab, create_import_tab, create_backups_tab, create_duplicates_tab, create_templates_tab, create_diff_dialog
 
 
 class CharacterManager:
     """Main application class for managing character configurations."""
     
+    COPY_TAB = "Copy Configuration"
+    EXPORT_TAB = "Export Character Config"
+    IMPORT_TAB = "Import Character Config"
+    BACKUPS_TAB = "Backups"
+    DUPLICATES_TAB = "Identical Files"
+    TEMPLATES_TAB = "Templates"
+    
+    # Backup tab entry meaning "every character in the backup"
+    ALL_CHARACTERS = "All characters"
+    
+    # File kind -> label used in the Identical Files tab
+    KIND_LABELS = {'ui': "UI", 'config': "Config", 'spellsets': "Spellsets"}
+    
+    # Copy tab checkbox for each file kind
+    KIND_CHECKBOXES = {'ui': 'ui_checkbox', 'config': 'config_checkbox', 'spellsets': 'spellsets_checkbox'}
+    
+    # Most diff lines shown in the overwrite confirmation; the summary counts everything
+    MAX_DIFF_LINES = 5000
+    
+    # Maximum characters listed individually in confirmation/result dialogs
+    CONFIRM_LIST_LIMIT = 15
+    
+    DEFAULT_GEOMETRY = "900x650"
+    
+    # Most names put in a combo box drop-down; typing in its filter narrows the rest
+    MAX_COMBO_VALUES = 500
+    
+    # Milliseconds between applying batches of file changes the watcher saw
+    WATCH_APPLY_MS = 250
+    
+    # Pickers with their own type-to-filter state
+    FILTERED_PICKERS = ('source', 'target', 'target_list', 'export', 'template_source')
+    
+    # Setting name -> widget key of checkboxes remembered between sessions
+    COPY_CHECKBOX_SETTINGS = {
+        'copy_ui': 'ui_checkbox',
+        'copy_config': 'config_checkbox',
+        'copy_spellsets': 'spellsets_checkbox',
+        'skip_identical': 'skip_identical_checkbox',
+    }
+    EXPORT_CHECKBOX_SETTINGS = {
+        'export_ui': 'export_ui_checkbox',
+        'export_config': 'export_config_checkbox',
+        'export_spellsets': 'export_spellsets_checkbox',
+        'export_dedup': 'dedup_checkbox',
+    }
+    IMPORT_CHECKBOX_SETTINGS = {
+        'import_overwrite': 'overwrite_checkbox',
+    }
+    TEMPLATE_CHECKBOX_SETTINGS = {
+        'template_overwrite': 'overwrite_checkbox',
+    }
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Quarm Quick Character Copy")
-        self.root.geometry("900x650")
+        self.root.geometry(settings.get('window_geometry') or self.DEFAULT_GEOMETRY)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Set window icon (for title bar and taskbar)
         try:
@@ -46,15 +111,88 @@ class CharacterManager:
             pass
         
         self.quarm_dir = load_saved_directory()
-        self.characters: Dict[str, Dict[str, str]] = {}
-        self.char_checkboxes: Dict[str, ctk.CTkCheckBox] = {}
+        self.characters: Dict[str, CharacterFiles] = {}
+        self.name_index = NameIndex([])
+        self.filters = {picker: IncrementalFilter(self.name_index) for picker in self.FILTERED_PICKERS}
+        # Directory (or install -> directory mapping) the index was scanned from
+        self.scan_target = None
         self.directory_valid = False
+        self._scan_task = None
+        self._scan_directory = None
+        self._copy_task = None
+        self._export_task = None
+        self._import_task = None
+        self._import_plan = None
+        self._duplicates_task = None
+        self._template_task = None
+        # Overwrite confirmation with its background diff
+        self._diff_task = None
+        self.diff_widgets = None
+        # Watches the scanned directories so the index follows the game's writes
+        self._watcher = None
+        self._watch_job = None
+        self._progress_cancel = None
+        # What owns the progress row (e.g. "scan"), or None when it is free
+        self._progress_owner = None
+        self.copy_widgets = None
+        self.export_widgets = None
+        self.import_widgets = None
+        self.backup_widgets = None
+        self.duplicate_widgets = None
+        self.template_widgets = None
+        # Group combo label -> DuplicateCluster from the last Identical Files run
+        self._cluster_choices = {}
+        # Backups of the scanned directories, paired with their install name (or None)
+        self._backups = []
+        # Backup combo label -> snapshot record
+        self._backup_choices = {}
         
         self.setup_ui()
-        if self.quarm_dir and os.path.exists(self.quarm_dir):
+        
+        # Scan once the window is on screen so the first frame isn't delayed
+        self._map_binding = self.root.bind("<Map>", self.on_first_map, add="+")
+    
+    def on_first_map(self, event):
+        """Start the initial scan after the main window is first mapped."""
+        # Child widgets' Map events also reach the root binding
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>", self._map_binding)
+        startup_timing.mark('window_mapped')
+        
+        if self.profile_widgets['profiles_switch'].get() or (self.quarm_dir and os.path.exists(self.quarm_dir)):
             self.scan_characters()
         else:
             self.hide_main_sections()
+            startup_timing.report(characters=0)
+    
+    def on_close(self):
+        """Remember the window size and position, write settings and exit."""
+        settings.set('window_geometry', self.root.geometry())
+        settings.flush()
+        self.stop_watching()
+        self.root.destroy()
+    
+    def restore_checkboxes(self, widgets, checkbox_settings):
+        """Set checkboxes from their remembered values."""
+        for setting, widget_key in checkbox_settings.items():
+            value = settings.get(setting)
+            if value is not None:
+                if value:
+                    widgets[widget_key].select()
+                else:
+                    widgets[widget_key].deselect()
+    
+    def remember_checkboxes(self, widgets, checkbox_settings):
+        """Store the current checkbox values; unchanged values cause no write."""
+        settings.update(**{setting: bool(widgets[widget_key].get()) for setting, widget_key in checkbox_settings.items()})
+    
+    def restore_menu(self, menu, choices, setting):
+        """Select a remembered option menu value if it is still a valid choice."""
+        value = settings.get(setting)
+        for label, choice in choices.items():
+            if choice == value:
+                menu.set(label)
     
     def setup_ui(self):
         """Set up the user interface."""
@@ -67,39 +205,82 @@ class CharacterManager:
             main_frame,
             self.quarm_dir,
             self.browse_directory,
-            self.scan_characters
+            self.scan_characters,
+            self.on_directory_focus_out
         )
         
+        # Install profiles scanned together as one index
+        self.profile_widgets = create_profile_row(main_frame, self.on_profiles_toggle, self.save_profile)
+        if settings.get('use_profiles'):
+            self.profile_widgets['profiles_switch'].select()
+        self.update_profiles_label()
+        
+        # Progress indicator for background scans, copies and exports
+        self.progress_widgets = create_progress_row(main_frame, self.cancel_progress_task)
+        
         # Tabview for Copy and Export tabs
         self.tabs_container = ctk.CTkFrame(main_frame)
         # Don't pack initially - will be shown after directory is set
         
-        self.tabview = ctk.CTkTabview(self.tabs_container, corner_radius=8)
+        # Style the tabs to make them more prominent
+        self.tabview = ctk.CTkTabview(
+            self.tabs_container,
+            corner_radius=8,
+            command=self.on_tab_change,
+            segmented_button_selected_color=("#1f538d", "#14375e"),  # Blue when selected
+            segmented_button_selected_hover_color=("#2a5f9f", "#1a4370"),
+            segmented_button_unselected_color=("gray60", "gray40"),
+            segmented_button_unselected_hover_color=("gray65", "gray35")
+        )
         self.tabview.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Style the tabs to make them more prominent
         try:
-            # Access the internal segmented button to customize
+            # Font and height are not constructor options; set them before any
+            # tab buttons exist so nothing has to be redrawn
             if hasattr(self.tabview, '_segmented_button'):
-                seg_button = self.tabview._segmented_button
-                seg_button.configure(
-                    font=("Arial", 16, "bold"),
-                    height=50,
-                    selected_color=("#1f538d", "#14375e"),  # Blue when selected
-                    selected_hover_color=("#2a5f9f", "#1a4370"),
-                    unselected_color=("gray60", "gray40"),
-                    unselected_hover_color=("gray65", "gray35")
-                )
+                self.tabview._segmented_button.configure(font=("Arial", 16, "bold"), height=50)
         except Exception:
             # If styling fails, tabs will still work with defaults
             pass
         
-        # Copy Configuration Tab
-        copy_tab = self.tabview.add("Copy Configuration")
+        # Tab contents are built the first time each tab is shown
+        self._tab_builders = {
+            self.COPY_TAB: self.build_copy_tab,
+            self.EXPORT_TAB: self.build_export_tab,
+            self.IMPORT_TAB: self.build_import_tab,
+            self.BACKUPS_TAB: self.build_backups_tab,
+            self.DUPLICATES_TAB: self.build_duplicates_tab,
+            self.TEMPLATES_TAB: self.build_templates_tab,
+        }
+        self._built_tabs = set()
+        # Set when writes may have taken backups the Backups tab doesn't show yet
+        self._backups_stale = False
+        for name in self._tab_builders:
+            self.tabview.add(name)
+        
+        # Hide tabs initially until directory is set
+        if not self.directory_valid:
+            self.tabs_container.pack_forget()
+    
+    def on_tab_change(self):
+        """Build the newly selected tab if it hasn't been shown before."""
+        self.ensure_tab_built(self.tabview.get())
+    
+    def ensure_tab_built(self, name):
+        """Build a tab's widgets on first use, and catch the Backups tab up with writes."""
+        if name not in self._built_tabs:
+            self._built_tabs.add(name)
+            self._tab_builders[name](self.tabview.tab(name))
+        elif name == self.BACKUPS_TAB and self._backups_stale:
+            self.populate_backups_tab()
+    
+    def build_copy_tab(self, copy_tab):
+        """Build the Copy Configuration tab and fill it from the current index."""
         self.copy_widgets = create_copy_tab(
             copy_tab,
             self.on_new_char_entry_change,
-            self.copy_configuration
+            self.copy_configuration,
+            self.on_multi_target_toggle
         )
         
         # Clear new character entry when target combo is selected
@@ -108,18 +289,77 @@ class CharacterManager:
         # Update target combo when source changes
         self.copy_widgets['source_combo'].configure(command=self.on_source_combo_change)
         
-        # Export Characters Tab
-        export_tab = self.tabview.add("Export Character Config")
+        # Explain what shared files mean when hard links are picked
+        self.copy_widgets['copy_mode_menu'].configure(command=self.on_copy_mode_change)
+        
+        # Type-to-filter for each picker
+        self.copy_widgets['source_filter'].bind("<KeyRelease>", self.on_source_filter)
+        self.copy_widgets['target_filter'].bind("<KeyRelease>", self.refresh_target_combo)
+        self.copy_widgets['target_list_filter'].bind("<KeyRelease>", self.refresh_target_list)
+        
+        self.restore_checkboxes(self.copy_widgets, self.COPY_CHECKBOX_SETTINGS)
+        self.restore_menu(self.copy_widgets['copy_mode_menu'], COPY_MODE_CHOICES, 'copy_mode')
+        self.populate_copy_tab()
+    
+    def build_export_tab(self, export_tab):
+        """Build the Export tab and fill it from the current index."""
         self.export_widgets = create_export_tab(
             export_tab,
             self.select_all_chars,
             self.deselect_all_chars,
             self.export_to_zip
         )
-        
-        # Hide tabs initially until directory is set
-        if not self.directory_valid:
-            self.tabs_container.pack_forget()
+        self.export_widgets['char_filter'].bind("<KeyRelease>", self.on_export_filter)
+        self.restore_checkboxes(self.export_widgets, self.EXPORT_CHECKBOX_SETTINGS)
+        self.restore_menu(self.export_widgets['compression_menu'], COMPRESSION_CHOICES, 'compression')
+        self.populate_export_tab()
+    
+    def build_import_tab(self, import_tab):
+        """Build the Import tab."""
+        self.import_widgets = create_import_tab(
+            import_tab,
+            self.browse_import_archive,
+            self.analyze_import,
+            self.import_characters
+        )
+        self.restore_checkboxes(self.import_widgets, self.IMPORT_CHECKBOX_SETTINGS)
+    
+    def build_backups_tab(self, backups_tab):
+        """Build the Backups tab and list the backups of the scanned directory."""
+        self.backup_widgets = create_backups_tab(
+            backups_tab,
+            self.on_backup_character_change,
+            self.on_backup_select,
+            self.restore_backup,
+            self.prune_backups
+        )
+        self.populate_backups_tab()
+    
+    def build_duplicates_tab(self, duplicates_tab):
+        """Build the Identical Files tab; the analysis runs when asked for."""
+        self.duplicate_widgets = create_duplicates_tab(
+            duplicates_tab,
+            self.find_identical_files,
+            self.on_cluster_select,
+            self.copy_from_cluster,
+            self.copy_to_cluster,
+            self.export_cluster
+        )
+        self.show_clusters([], "Find characters that already share a UI, config or spellsets file.")
+    
+    def build_templates_tab(self, templates_tab):
+        """Build the Templates tab and list the saved templates."""
+        self.template_widgets = create_templates_tab(
+            templates_tab,
+            self.save_character_template,
+            self.on_template_select,
+            self.delete_selected_template,
+            self.apply_selected_template
+        )
+        self.template_widgets['char_filter'].bind("<KeyRelease>", self.on_template_source_filter)
+        self.restore_checkboxes(self.template_widgets, self.TEMPLATE_CHECKBOX_SETTINGS)
+        self.on_template_source_filter()
+        self.populate_template_list()
     
     def on_new_char_entry_change(self, event=None):
         """Clear the 'To Character' dropdown when typing in new character field."""
@@ -130,27 +370,60 @@ class CharacterManager:
         """Clear the 'New Character' entry when target combo is selected."""
         if value:
             self.copy_widgets['new_char_entry'].delete(0, "end")
+            settings.set('last_target', value)
     
     def update_target_combo_values(self):
-        """Update target combo to exclude the currently selected source character."""
+        """Update the target pickers to exclude the currently selected source character."""
+        self.refresh_target_combo()
+        self.refresh_target_list()
+    
+    def current_source(self):
+        """Return the selected source character, or None if there isn't a valid one."""
         source = self.copy_widgets['source_combo'].get()
-        all_chars = sorted(self.characters.keys())
+        return source if source in self.characters else None
+    
+    def refresh_target_combo(self, event=None):
+        """Fill the target combo with filtered names, leaving out the source."""
+        source = self.current_source()
+        targets = self.filters['target'].filter(self.copy_widgets['target_filter'].get(), exclude=source)
+        self.copy_widgets['target_combo'].configure(values=targets[:self.MAX_COMBO_VALUES])
         
-        if source and source in all_chars:
-            # Filter out the source character from target list
-            target_chars = [char for char in all_chars if char != source]
-            self.copy_widgets['target_combo'].configure(values=target_chars)
-            
-            # If current target is the source, clear it
-            current_target = self.copy_widgets['target_combo'].get()
-            if current_target == source:
-                self.copy_widgets['target_combo'].set("")
+        # If current target is the source, clear it
+        if source and self.copy_widgets['target_combo'].get() == source:
+            self.copy_widgets['target_combo'].set("")
+    
+    def refresh_target_list(self, event=None):
+        """Show the filtered names, minus the source, in the multi-target list."""
+        query = self.copy_widgets['target_list_filter'].get()
+        self.copy_widgets['target_list'].set_filter(self.filters['target_list'].filter(query, exclude=self.current_source()))
+    
+    def on_source_filter(self, event=None):
+        """Narrow the source combo as the user types, selecting the best match."""
+        matches = self.filters['source'].filter(self.copy_widgets['source_filter'].get())
+        combo = self.copy_widgets['source_combo']
+        combo.configure(values=matches[:self.MAX_COMBO_VALUES])
+        if matches and combo.get() not in matches:
+            combo.set(matches[0])
+            self.on_source_combo_change(matches[0])
+    
+    def on_export_filter(self, event=None):
+        """Narrow the export list as the user types."""
+        query = self.export_widgets['char_filter'].get()
+        matches = self.filters['export'].filter(query)
+        self.export_widgets['char_list'].set_filter(matches if query.strip() else None)
+    
+    def on_multi_target_toggle(self):
+        """Swap between the single target inputs and the multi-target list."""
+        if self.copy_widgets['multi_switch'].get():
+            self.copy_widgets['single_target_frame'].pack_forget()
+            self.copy_widgets['multi_target_frame'].pack(fill="x", before=self.copy_widgets['file_types_label'])
         else:
-            # Show all characters if no source selected
-            self.copy_widgets['target_combo'].configure(values=all_chars)
+            self.copy_widgets['multi_target_frame'].pack_forget()
+            self.copy_widgets['single_target_frame'].pack(fill="x", before=self.copy_widgets['file_types_label'])
     
     def on_source_combo_change(self, value):
         """Update target combo when source changes."""
+        settings.set('last_source', value)
         self.update_target_combo_values()
     
     def browse_directory(self):
@@ -166,54 +439,278 @@ class CharacterManager:
             save_directory(directory)
             self.scan_characters()
     
+    def on_directory_focus_out(self):
+        """Rescan when focus leaves the directory entry, but only if it was edited."""
+        if self.dir_entry.get().strip() != self.quarm_dir or not self.directory_valid:
+            self.scan_characters()
+    
     def scan_characters(self, event=None):
-        """Scan the directory for character files."""
+        """Scan the directory for character files on a background thread."""
+        if self.progress_busy("scan"):
+            return
+        if self.profile_widgets['profiles_switch'].get():
+            self.scan_profiles()
+            return
+        
         directory = self.dir_entry.get().strip()
         if not directory or not os.path.exists(directory):
+            self.cancel_scan()
             messagebox.showerror("Error", "Please select a valid Project Quarm directory.")
             self.hide_main_sections()
             return
         
+        # Let an in-flight scan of the same directory finish; supersede any other
+        if self._scan_task and not self._scan_task.finished:
+            if directory == self._scan_directory:
+                return
+            self._scan_task.cancel()
+        
         self.quarm_dir = directory
         save_directory(directory)
         
-        # Clear existing
-        self.characters = {}
-        self.char_checkboxes = {}
+        self._scan_directory = directory
+        self._scan_task = BackgroundTask(
+            self.root,
+            lambda task: load_character_index(
+                directory, progress=task.report, cancel_check=task.check_cancelled
+            ),
+            on_progress=self.on_scan_progress,
+            on_done=lambda characters: self.on_scan_done(characters, directory),
+            on_error=self.on_scan_error
+        ).start()
+        self.show_progress(f"Scanning {directory}...", "scan", on_cancel=self.cancel_scan)
+    
+    def scan_profiles(self):
+        """Scan every active install profile concurrently into one tagged index."""
+        profiles = load_profiles()
+        directories = {name: profiles[name] for name in load_active_profiles()}
+        if not directories:
+            self.cancel_scan()
+            self.profile_widgets['profiles_switch'].deselect()
+            messagebox.showerror("Error", "No active profiles. Save a directory as a profile first.")
+            return
+        
+        scan_key = tuple(directories.items())
+        if self._scan_task and not self._scan_task.finished:
+            if scan_key == self._scan_directory:
+                return
+            self._scan_task.cancel()
         
-        # Clear listbox
-        if self.export_widgets['char_listbox']:
-            for widget in self.export_widgets['char_listbox'].winfo_children():
-                widget.destroy()
+        self._scan_directory = scan_key
+        self._scan_task = BackgroundTask(
+            self.root,
+            lambda task: scan_installs(
+                directories,
+                progress=lambda done, total: task.report((done, total)),
+                cancel_check=task.check_cancelled
+            ),
+            on_progress=lambda p: self.update_progress(f"Scanning profiles... {p[0]}/{p[1]} install(s)"),
+            on_done=lambda characters: self.on_scan_done(characters, directories),
+            on_error=self.on_scan_error
+        ).start()
+        self.show_progress(f"Scanning {len(directories)} profile(s)...", "scan", on_cancel=self.cancel_scan)
+    
+    def on_profiles_toggle(self):
+        """Rescan when switching between one directory and all active profiles."""
+        settings.set('use_profiles', bool(self.profile_widgets['profiles_switch'].get()))
+        self.scan_characters()
+    
+    def save_profile(self):
+        """Save the directory in the entry as a named, active install profile."""
+        directory = self.dir_entry.get().strip()
+        if not directory or not os.path.isdir(directory):
+            messagebox.showerror("Error", "Please select a valid Project Quarm directory.")
+            return
         
+        name = ctk.CTkInputDialog(text="Profile name (e.g. live, test):", title="Save Profile").get_input()
+        if name is None:
+            return
+        name = name.strip()
         try:
-            # Scan for characters
-            self.characters = scan_character_files(directory)
-            
-            # Add checkboxes to export tab
-            for char_name in sorted(self.characters.keys()):
-                checkbox = ctk.CTkCheckBox(self.export_widgets['char_listbox'], text=char_name)
-                checkbox.pack(anchor="w", padx=10, pady=2)
-                self.char_checkboxes[char_name] = checkbox
-            
-            # Update combo boxes
-            char_list = sorted(self.characters.keys())
-            self.copy_widgets['source_combo'].configure(values=char_list)
-            
-            if char_list:
-                self.copy_widgets['source_combo'].set(char_list[0])
-                # Update target combo to exclude source
-                self.update_target_combo_values()
-                if len(char_list) > 1:
-                    target_list = [c for c in char_list if c != char_list[0]]
-                    if target_list:
-                        self.copy_widgets['target_combo'].set(target_list[0])
+            check_install_name(name)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        profiles = load_profiles()
+        active = load_active_profiles()
+        profiles[name] = directory
+        if name not in active:
+            active.append(name)
+        save_profiles(profiles, active)
+        self.update_profiles_label()
+        if self.profile_widgets['profiles_switch'].get():
+            self.scan_characters()
+    
+    def update_profiles_label(self):
+        """Show which profiles are active."""
+        active = load_active_profiles()
+        text = f"Active: {', '.join(active)}" if active else "No profiles saved"
+        self.profile_widgets['profiles_label'].configure(text=text)
+    
+    def cancel_scan(self):
+        """Cancel the in-flight scan, keeping the previous character list."""
+        if self._scan_task and not self._scan_task.finished:
+            self._scan_task.cancel()
+            self.hide_progress("Scan cancelled.")
+        self._scan_task = None
+        self._scan_directory = None
+    
+    def on_scan_progress(self, found_count):
+        """Show how many character files the running scan has found."""
+        self.update_progress(f"Scanning... {found_count} character file(s) found")
+    
+    def on_scan_done(self, characters, scan_target):
+        """Apply a finished scan to the UI."""
+        self._scan_task = None
+        self._scan_directory = None
+        self.characters = characters
+        self.scan_target = scan_target
+        self.watch_directories(scan_target)
+        self.hide_progress(f"{len(characters)} character(s) found.")
+        with metrics.span('ui.populate', characters=len(characters)):
+            self.populate_characters()
             
             # Show main sections after successful scan
             self.show_main_sections()
+        startup_timing.mark('first_scan')
+        startup_timing.report(characters=len(characters))
+    
+    def on_scan_error(self, error):
+        """Report a failed scan."""
+        self._scan_task = None
+        self._scan_directory = None
+        self.hide_progress("")
+        startup_timing.report(scan_error=True)
+        messagebox.showerror("Error", f"Error scanning directory: {str(error)}")
+    
+    def watch_directories(self, scan_target):
+        """Start following file changes in the scanned directories, replacing any earlier watcher."""
+        from watcher import create_watcher
+        self.stop_watching()
+        try:
+            self._watcher = create_watcher(scan_target).start()
+        except OSError:
+            # Without a watcher the list only updates on a rescan
+            self._watcher = None
+            return
+        self._watch_job = self.root.after(self.WATCH_APPLY_MS, self.apply_watched_changes)
+    
+    def stop_watching(self):
+        """Stop the directory watcher and its UI updates."""
+        if self._watch_job is not None:
+            self.root.after_cancel(self._watch_job)
+            self._watch_job = None
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
+    def apply_watched_changes(self):
+        """Apply the files changed since the last batch to the index and lists."""
+        changed = self._watcher.drain()
+        if changed:
+            with metrics.span('watch.apply', files=len(changed)):
+                self.apply_file_changes(changed)
+        self._watch_job = self.root.after(self.WATCH_APPLY_MS, self.apply_watched_changes)
+    
+    def progress_busy(self, owner):
+        """
+        Return True, after telling the user, if another kind of task owns the
+        progress row.
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Error scanning directory: {str(e)}")
+        Tasks share the one row and its Cancel button, so a task only starts
+        once the row is free; a scan may still supersede a scan.
+        """
+        if self._progress_owner is None or self._progress_owner == owner:
+            return False
+        messagebox.showinfo("Please Wait", f"Please wait for the running {self._progress_owner} to finish, or cancel it, first.")
+        return True
+    
+    def show_progress(self, text, owner, on_cancel=None, determinate=False):
+        """Show the progress bar, plus a cancel button if the task can be cancelled."""
+        self._progress_owner = owner
+        self._progress_cancel = on_cancel
+        progress = self.progress_widgets['progress']
+        self.progress_widgets['label'].configure(text=text)
+        progress.pack(side="left", padx=10)
+        if on_cancel:
+            self.progress_widgets['cancel_button'].pack(side="left")
+        if determinate:
+            progress.configure(mode="determinate")
+            progress.set(0)
+        else:
+            progress.configure(mode="indeterminate")
+            progress.start()
+    
+    def update_progress(self, text, fraction=None):
+        """Update the progress text and, for determinate tasks, the bar."""
+        self.progress_widgets['label'].configure(text=text)
+        if fraction is not None:
+            self.progress_widgets['progress'].set(fraction)
+    
+    def hide_progress(self, text):
+        """Hide the progress bar and cancel button."""
+        self._progress_owner = None
+        self._progress_cancel = None
+        self.progress_widgets['progress'].stop()
+        self.progress_widgets['progress'].pack_forget()
+        self.progress_widgets['cancel_button'].pack_forget()
+        self.progress_widgets['label'].configure(text=text)
+    
+    def cancel_progress_task(self):
+        """Cancel whichever task owns the progress row."""
+        if self._progress_cancel:
+            self._progress_cancel()
+    
+    def populate_characters(self):
+        """Re-index character names and refresh the built tabs."""
+        self.name_index = NameIndex(self.characters)
+        self.filters = {picker: IncrementalFilter(self.name_index) for picker in self.FILTERED_PICKERS}
+        self.populate_copy_tab()
+        self.populate_export_tab()
+        self.populate_backups_tab()
+        if self.template_widgets is not None:
+            self.on_template_source_filter()
+        if self.duplicate_widgets is not None:
+            self.show_clusters([], "Characters were rescanned; find identical files again.")
+    
+    def populate_copy_tab(self):
+        """Refresh the copy tab's combo boxes and target list."""
+        if self.copy_widgets is None:
+            return
+        char_list = self.name_index.names
+        self.copy_widgets['target_list'].set_items(char_list)
+        # Prefer the source and target picked last time; read them before
+        # on_source_filter(), which saves whatever source it selects
+        last_source = settings.get('last_source')
+        last_target = settings.get('last_target')
+        if char_list:
+            source = last_source
+            if source not in self.characters:
+                source = self.copy_widgets['source_combo'].get()
+            if source not in self.characters:
+                source = char_list[0]
+            self.copy_widgets['source_combo'].set(source)
+        self.on_source_filter()
+        
+        if char_list:
+            # The source filter may have picked another match
+            source = self.copy_widgets['source_combo'].get()
+            # Update target combo to exclude source
+            self.update_target_combo_values()
+            if len(char_list) > 1:
+                target = last_target
+                if target not in self.characters or target == source:
+                    target = next(c for c in char_list if c != source)
+                self.copy_widgets['target_combo'].set(target)
+    
+    def populate_export_tab(self):
+        """Refresh the export list."""
+        if self.export_widgets is None:
+            return
+        # The virtual list only renders visible rows, so this is cheap at any size
+        self.export_widgets['char_list'].set_items(self.name_index.names)
+        self.on_export_filter()
     
     def hide_main_sections(self):
         """Hide the main sections until a valid directory is set."""
@@ -225,20 +722,25 @@ class CharacterManager:
         """Show the main sections after a valid directory is set."""
         if hasattr(self, 'tabs_container'):
             self.tabs_container.pack(fill="both", expand=True, padx=10, pady=10)
+            self.ensure_tab_built(self.tabview.get())
         self.directory_valid = True
     
     def select_all_chars(self):
-        """Select all character checkboxes."""
-        for checkbox in self.char_checkboxes.values():
-            checkbox.select()
+        """Select all characters in the export list."""
+        self.export_widgets['char_list'].select_all()
     
     def deselect_all_chars(self):
-        """Deselect all character checkboxes."""
-        for checkbox in self.char_checkboxes.values():
-            checkbox.deselect()
+        """Deselect all characters in the export list."""
+        self.export_widgets['char_list'].deselect_all()
     
     def copy_configuration(self):
         """Copy configuration from source to target character."""
+        if self.progress_busy("copy"):
+            return
+        if self.copy_widgets['multi_switch'].get():
+            self.copy_to_multiple_characters()
+            return
+        
         source = self.copy_widgets['source_combo'].get()
         target = self.copy_widgets['target_combo'].get()
         new_char = self.copy_widgets['new_char_entry'].get().strip()
@@ -263,6 +765,10 @@ class CharacterManager:
             if new_char.lower() == source.lower():
                 messagebox.showerror("Error", "Cannot copy to the same character. The new character name matches the source character.")
                 return
+            # Across installs, new names must say which install they go to
+            if isinstance(self.scan_target, dict) and split_qualified(new_char)[0] not in self.scan_target:
+                messagebox.showerror("Error", f"Enter the new character as profile:Name, using one of: {', '.join(self.scan_target)}")
+                return
             # Check if manually entered name already exists
             if new_char in self.characters:
                 messagebox.showerror("Error", f"Character '{new_char}' already exists. Please select it from the 'To Character' dropdown or choose a different name.")
@@ -283,12 +789,18 @@ class CharacterManager:
             messagebox.showerror("Error", "Please select at least one file type to copy.")
             return
         
-        # Check which files will be overwritten
-        files_to_overwrite = []
-        if not is_new:
-            files_to_overwrite = get_files_to_overwrite(
-                target, self.quarm_dir, copy_ui, copy_config, copy_spellsets
-            )
+        # One plan drives both the confirmation and the copy
+        mode, skip_identical, sections = self.get_copy_options()
+        try:
+            plan = plan_copy(source, [target], self.characters, self.scan_target,
+                             copy_ui, copy_config, copy_spellsets, mode, skip_identical, sections)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not plan.actions:
+            messagebox.showwarning("Warning", "No files were copied. The source character may not have the selected file types.")
+            return
+        files_to_overwrite = plan.overwrites().get(target, [])
         
         # Build confirmation message
         file_types = []
@@ -310,46 +822,331 @@ class CharacterManager:
             else:
                 confirm_msg += f"  • {', '.join(file_types)} file(s) (will be created if they don't exist)\n"
             confirm_msg += f"\nSelected file types: {', '.join(file_types)}"
+        if sections:
+            confirm_msg += f"\n\nOnly sections matching {', '.join(sections)} are merged in; the rest of each file is kept."
         
+        if files_to_overwrite:
+            # Show what the copy would change while the user decides
+            self.confirm_with_diff(plan, confirm_msg, lambda: self.run_single_copy(plan, target))
+            return
         if not messagebox.askyesno("Confirm", confirm_msg):
             return
+        self.run_single_copy(plan, target)
+    
+    def run_single_copy(self, plan, target):
+        """Execute a confirmed single-target copy on a background thread."""
+        if self._copy_task and not self._copy_task.finished:
+            messagebox.showerror("Error", "A copy is already in progress.")
+            return
+        # The confirmation window doesn't block other tabs
+        if self.progress_busy("copy"):
+            return
+        
+        stats = CopyStats()
+        self.copy_widgets['copy_button'].configure(state="disabled")
+        self.show_progress(f"Copying to {target}...", "copy")
+        before = directory_stamps(plan.directory)
+        self._copy_task = BackgroundTask(
+            self.root,
+            lambda task: execute_plan(plan, stats=stats),
+            on_done=lambda result: self.on_single_copy_done(result, plan, target, stats, before),
+            on_error=self.on_batch_copy_error
+        ).start()
+    
+    def on_single_copy_done(self, result, plan, target, stats, before):
+        """Report a single-target copy and refresh the list."""
+        copied, errors = result
+        self.copy_widgets['copy_button'].configure(state="normal")
+        copied_files = copied.get(target, [])
+        if errors:
+            self.hide_progress("")
+            # Some files may have been written before the failure
+            self.refresh_after_write([action.dest_name for action in plan.actions], before)
+            messagebox.showerror("Error", f"An error occurred while copying files:\n{errors[target]}")
+        else:
+            self.hide_progress(f"Copied {len(copied_files)} file(s) to {target}.")
+            self.refresh_after_write(copied_files, before)
+            messagebox.showinfo("Success", f"Successfully copied {len(copied_files)} file(s) ({stats.summary()}):\n" + "\n".join(copied_files))
+    
+    def confirm_with_diff(self, plan, message, on_confirm):
+        """
+        Ask to confirm an overwrite in a window that fills in, section by
+        section, what the copy would change; on_confirm runs if the user agrees.
+        
+        The comparison runs on a background thread and the window can be
+        answered before it finishes.
+        """
+        from ini_diff import diff_files
+        self.close_diff_dialog()
+        actions = [action for action in plan.actions if action.action == OVERWRITE]
+        # Appended by the worker only; the UI renders the entries it hasn't shown yet
+        diffs = self._diffs = []
+        self._diff_counts = Counter()
+        self._diff_rendered = 0
+        self._diff_lines = 0
+        self._diff_file = None
+        
+        def confirm():
+            self.close_diff_dialog()
+            on_confirm()
+        
+        self.diff_widgets = create_diff_dialog(self.root, message, confirm, self.close_diff_dialog)
+        
+        def work(task):
+            for action in actions:
+                for diff in diff_files(action.source.path, action.dest_path, plan.sections, action.dest_name):
+                    task.check_cancelled()
+                    diffs.append(diff)
+                    task.report(len(diffs))
+            return len(diffs)
+        
+        self._diff_task = BackgroundTask(
+            self.root,
+            work,
+            on_progress=self.render_diffs,
+            on_done=self.on_diff_done,
+            on_error=self.on_diff_error
+        ).start()
+    
+    def render_diffs(self, count):
+        """Append the differences found since the last update to the confirmation window."""
+        from ini_diff import category, describe_counts, format_diff
+        lines = []
+        for diff in self._diffs[self._diff_rendered:count]:
+            self._diff_counts[category(diff)] += 1
+            if self._diff_lines >= self.MAX_DIFF_LINES:
+                continue
+            diff_lines = format_diff(diff)
+            if diff.filename != self._diff_file:
+                # A blank line between files
+                diff_lines.insert(0, f"{diff.filename}:" if self._diff_file is None else f"\n{diff.filename}:")
+                self._diff_file = diff.filename
+            lines.extend(diff_lines)
+            self._diff_lines += len(diff_lines)
+            if self._diff_lines >= self.MAX_DIFF_LINES:
+                lines.append("...more changes are counted in the summary but not listed")
+        self._diff_rendered = max(self._diff_rendered, count)
+        
+        if lines:
+            textbox = self.diff_widgets['diff_textbox']
+            textbox.configure(state="normal")
+            textbox.insert("end", "\n".join(lines) + "\n")
+            textbox.configure(state="disabled")
+        self.diff_widgets['summary_label'].configure(text=f"Comparing files... so far: {describe_counts(self._diff_counts)}")
+    
+    def on_diff_done(self, count):
+        """Show the final change summary."""
+        self._diff_task = None
+        self.render_diffs(count)
+        if count:
+            summary = f"This copy will make: {describe_counts(self._diff_counts)}"
+        else:
+            summary = "The target's files already have the same settings as the source."
+        self.diff_widgets['summary_label'].configure(text=summary)
+    
+    def on_diff_error(self, error):
+        """Report files that could not be compared; the copy can still be confirmed."""
+        self._diff_task = None
+        self.diff_widgets['summary_label'].configure(text=f"Could not compare the files: {str(error)}")
+    
+    def close_diff_dialog(self):
+        """Close the overwrite confirmation window and stop its comparison."""
+        if self._diff_task and not self._diff_task.finished:
+            self._diff_task.cancel()
+        self._diff_task = None
+        if self.diff_widgets is not None:
+            self.diff_widgets['window'].destroy()
+            self.diff_widgets = None
+    
+    def copy_to_multiple_characters(self):
+        """Copy configuration from the source to every selected target in one operation."""
+        if self._copy_task and not self._copy_task.finished:
+            messagebox.showerror("Error", "A copy is already in progress.")
+            return
         
-        # Perform copy
+        source = self.copy_widgets['source_combo'].get()
+        if not source:
+            messagebox.showerror("Error", "Please select a source character.")
+            return
+        
+        targets = [t for t in self.copy_widgets['target_list'].get_selected() if t != source]
+        if not targets:
+            messagebox.showerror("Error", "Please select at least one target character.")
+            return
+        
+        # Check which file types to copy
+        copy_ui = self.copy_widgets['ui_checkbox'].get()
+        copy_config = self.copy_widgets['config_checkbox'].get()
+        copy_spellsets = self.copy_widgets['spellsets_checkbox'].get()
+        
+        if not (copy_ui or copy_config or copy_spellsets):
+            messagebox.showerror("Error", "Please select at least one file type to copy.")
+            return
+        
+        # One plan drives both the combined confirmation and the batch copy
+        mode, skip_identical, sections = self.get_copy_options()
         try:
-            copied_files = copy_character_files(
-                source, target, self.characters, self.quarm_dir,
-                copy_ui, copy_config, copy_spellsets
+            plan = plan_copy(source, targets, self.characters, self.scan_target,
+                             copy_ui, copy_config, copy_spellsets, mode, skip_identical, sections)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        overwrites = plan.overwrites()
+        overwrite_count = sum(len(files) for files in overwrites.values())
+        
+        confirm_msg = f"Are you sure you want to copy files from '{source}' to {len(targets)} character(s)?\n\n"
+        if overwrites:
+            confirm_msg += f"This will overwrite {overwrite_count} existing file(s) across {len(overwrites)} character(s):\n"
+            for target in list(overwrites)[:self.CONFIRM_LIST_LIMIT]:
+                confirm_msg += f"  • {target}: {', '.join(overwrites[target])}\n"
+            if len(overwrites) > self.CONFIRM_LIST_LIMIT:
+                confirm_msg += f"  • ...and {len(overwrites) - self.CONFIRM_LIST_LIMIT} more\n"
+        else:
+            confirm_msg += "No existing files will be overwritten.\n"
+        if sections:
+            confirm_msg += f"\nOnly sections matching {', '.join(sections)} are merged in; the rest of each file is kept.\n"
+        
+        if not messagebox.askyesno("Confirm", confirm_msg):
+            return
+        
+        stats = CopyStats()
+        self.copy_widgets['copy_button'].configure(state="disabled")
+        self.show_progress(f"Copying to {len(targets)} character(s)...", "copy", determinate=True)
+        before = directory_stamps(plan.directory)
+        self._copy_task = BackgroundTask(
+            self.root,
+            lambda task: execute_plan(
+                plan,
+                progress=lambda done, total: task.report((done, total)),
+                stats=stats
+            ),
+            on_progress=lambda p: self.update_progress(f"Copying... {p[0]}/{p[1]} character(s)", p[0] / p[1]),
+            on_done=lambda result: self.on_batch_copy_done(result, stats, before),
+            on_error=self.on_batch_copy_error
+        ).start()
+    
+    def on_batch_copy_done(self, result, stats, before):
+        """Report per-target results of a fan-out copy and refresh the list."""
+        copied, errors = result
+        self.copy_widgets['copy_button'].configure(state="normal")
+        
+        copied_files = [name for files in copied.values() for name in files]
+        self.hide_progress(f"Copied {len(copied_files)} file(s) to {len(copied)} character(s).")
+        if copied_files:
+            self.refresh_after_write(copied_files, before)
+        
+        summary = f"Copied {len(copied_files)} file(s) to {len(copied)} character(s) ({stats.summary()})."
+        if errors:
+            summary += f"\n\n{len(errors)} character(s) failed:\n"
+            for target, error in list(errors.items())[:self.CONFIRM_LIST_LIMIT]:
+                summary += f"  • {target}: {error}\n"
+            if len(errors) > self.CONFIRM_LIST_LIMIT:
+                summary += f"  • ...and {len(errors) - self.CONFIRM_LIST_LIMIT} more\n"
+            messagebox.showwarning("Copy Completed With Errors", summary)
+        elif copied_files:
+            messagebox.showinfo("Success", summary)
+        else:
+            messagebox.showwarning("Warning", "No files were copied. The source character may not have the selected file types.")
+    
+    def on_copy_mode_change(self, label):
+        """Warn that hard-linked characters share their files."""
+        if COPY_MODE_CHOICES[label] == 'hardlink':
+            messagebox.showwarning(
+                "Shared Files",
+                "New characters will share the source's files instead of getting copies.\n\n"
+                "When the game saves one of these characters, the change shows up in every "
+                "character sharing the file, until you copy over them again.\n\n"
+                "Existing characters are always copied normally."
             )
-            
-            if copied_files:
-                messagebox.showinfo("Success", f"Successfully copied {len(copied_files)} file(s):\n" + "\n".join(copied_files))
-                # Refresh scan to update character list, but preserve input selections
-                # Store current selections
-                current_source = self.copy_widgets['source_combo'].get()
-                current_target = self.copy_widgets['target_combo'].get()
-                current_new_char = self.copy_widgets['new_char_entry'].get()
-                
-                # Refresh scan
-                self.scan_characters()
-                
-                # Restore selections
-                if current_source and current_source in self.characters:
-                    self.copy_widgets['source_combo'].set(current_source)
-                if current_target and current_target in self.characters:
-                    self.copy_widgets['target_combo'].set(current_target)
-                if current_new_char:
-                    self.copy_widgets['new_char_entry'].delete(0, "end")
-                    self.copy_widgets['new_char_entry'].insert(0, current_new_char)
-            else:
-                messagebox.showwarning("Warning", "No files were copied. The source character may not have the selected file types.")
+    
+    def get_copy_options(self):
+        """Return the (copy mode, skip identical, section patterns) options chosen in the Copy tab."""
+        mode = COPY_MODE_CHOICES[self.copy_widgets['copy_mode_menu'].get()]
+        skip_identical = bool(self.copy_widgets['skip_identical_checkbox'].get())
+        sections = parse_patterns(self.copy_widgets['sections_entry'].get())
         
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while copying files:\n{str(e)}")
+        # Called as a copy starts, so these become next session's defaults
+        self.remember_checkboxes(self.copy_widgets, self.COPY_CHECKBOX_SETTINGS)
+        settings.set('copy_mode', mode)
+        return mode, skip_identical, sections
+    
+    def on_batch_copy_error(self, error):
+        """Report a single or fan-out copy that failed as a whole."""
+        self.copy_widgets['copy_button'].configure(state="normal")
+        self.hide_progress("")
+        messagebox.showerror("Error", f"An error occurred while copying files:\n{str(error)}")
+    
+    def refresh_after_write(self, written_files, before=None):
+        """
+        Re-stat written files and update only the list rows that changed.
+        
+        before is the directory_stamps() taken just before writing.
+        """
+        self.apply_file_changes(written_files, before)
+        # Writes by this app may have taken backups. Listing them reads every
+        # manifest, so only do it now if the Backups tab is showing.
+        if self.tabview.get() == self.BACKUPS_TAB:
+            self.populate_backups_tab()
+        else:
+            self._backups_stale = True
+    
+    def apply_file_changes(self, changed_files, before=None):
+        """Re-stat changed files, update the index in place and reconcile the lists."""
+        # Re-stat only the changed files instead of rescanning
+        changes = apply_written_files(self.characters, self.scan_target, changed_files, before)
+        with metrics.span('ui.reconcile', added=len(changes.added), removed=len(changes.removed)):
+            self.reconcile_names(changes.added, changes.removed)
+        if self._cluster_choices:
+            self.duplicate_widgets['summary_label'].configure(text="Files changed since this report; run it again to update.")
+    
+    def name_lists(self):
+        """Return the built check lists that show every character name."""
+        lists = []
+        if self.copy_widgets is not None:
+            lists.append(self.copy_widgets['target_list'])
+        if self.export_widgets is not None:
+            lists.append(self.export_widgets['char_list'])
+        return lists
+    
+    def reconcile_names(self, added, removed):
+        """
+        Insert and remove characters in the name index, lists and combos.
+        
+        Selections, scroll positions and typed filters are kept; rewriting
+        existing characters' files changes no names, so it costs nothing here.
+        """
+        if not added and not removed:
+            return
+        
+        lists = self.name_lists()
+        for name in removed:
+            if self.name_index.remove(name) is not None:
+                for check_list in lists:
+                    check_list.remove_item(name)
+        for name in added:
+            position = self.name_index.add(name)
+            if position is not None:
+                for check_list in lists:
+                    check_list.insert_item(position, name)
+        
+        # Cached matches hold positions, which have shifted
+        for name_filter in self.filters.values():
+            name_filter.reset()
+        if self.copy_widgets is not None:
+            self.on_source_filter()
+            self.update_target_combo_values()
+        if self.export_widgets is not None:
+            self.on_export_filter()
+        if self.template_widgets is not None:
+            self.on_template_source_filter()
     
     def export_to_zip(self):
         """Export selected characters to a ZIP file."""
+        if self.progress_busy("export"):
+            return
+        
         # Get selected characters
-        selected_chars = [name for name, checkbox in self.char_checkboxes.items() if checkbox.get()]
+        selected_chars = self.export_widgets['char_list'].get_selected()
         
         if not selected_chars:
             messagebox.showerror("Error", "Please select at least one character to export.")
@@ -364,32 +1161,612 @@ class CharacterManager:
             messagebox.showerror("Error", "Please select at least one file type to export.")
             return
         
-        # Ask for save location
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        default_filename = f"quarm_characters_export_{timestamp}.zip"
+        if self._export_task and not self._export_task.finished:
+            messagebox.showerror("Error", "An export is already in progress.")
+            return
+        
+        # Ask for save location before doing any compression work
         zip_path = filedialog.asksaveasfilename(
             title="Save Export ZIP",
             defaultextension=".zip",
             filetypes=[("ZIP files", "*.zip")],
-            initialfile=default_filename
+            initialfile=default_export_filename()
         )
         
         if not zip_path:
             return
         
-        zip_path_temp = None
+        compression = COMPRESSION_CHOICES[self.export_widgets['compression_menu'].get()]
+        self.remember_checkboxes(self.export_widgets, self.EXPORT_CHECKBOX_SETTINGS)
+        settings.set('compression', compression)
+        dedup = bool(self.export_widgets['dedup_checkbox'].get())
+        characters = self.characters
+        
+        self.export_widgets['export_button'].configure(state="disabled")
+        self.show_progress("Exporting...", "export", on_cancel=self.cancel_export, determinate=True)
+        self._export_task = BackgroundTask(
+            self.root,
+            lambda task: create_export_zip(
+                zip_path, selected_chars, characters,
+                export_ui, export_config, export_spellsets,
+                compression=compression,
+                progress=lambda done, total: task.report((done, total)),
+                cancel_check=task.check_cancelled,
+                dedup=dedup
+            ),
+            on_progress=lambda p: self.update_progress(f"Exporting... {p[0]}/{p[1]} file(s)", p[0] / p[1]),
+            on_done=lambda count: self.on_export_done(zip_path, len(selected_chars)),
+            on_error=self.on_export_error
+        ).start()
+    
+    def cancel_export(self):
+        """Cancel the running export; its partial archive is removed by the worker."""
+        if self._export_task and not self._export_task.finished:
+            self._export_task.cancel()
+        self.export_widgets['export_button'].configure(state="normal")
+        self.hide_progress("Export cancelled.")
+    
+    def on_export_done(self, zip_path, char_count):
+        """Report a finished export."""
+        self.export_widgets['export_button'].configure(state="normal")
+        self.hide_progress(f"Exported {char_count} character(s).")
+        messagebox.showinfo("Success", f"Successfully exported {char_count} character(s) to:\n{zip_path}")
+    
+    def on_export_error(self, error):
+        """Report a failed export."""
+        self.export_widgets['export_button'].configure(state="normal")
+        self.hide_progress("")
+        messagebox.showerror("Error", f"An error occurred while exporting:\n{str(error)}")
+    
+    def browse_import_archive(self):
+        """Pick an export archive and analyze it."""
+        zip_path = filedialog.askopenfilename(
+            title="Select Export ZIP",
+            filetypes=[("ZIP files", "*.zip")]
+        )
+        if zip_path:
+            self.import_widgets['archive_entry'].delete(0, "end")
+            self.import_widgets['archive_entry'].insert(0, zip_path)
+            self.analyze_import()
+    
+    def analyze_import(self):
+        """Plan the import of the chosen archive on a background thread."""
+        from import_operations import parse_rename_mapping, plan_import
+        if isinstance(self.scan_target, dict):
+            messagebox.showerror("Error", "Imports go into one directory. Turn off 'Use all active profiles' first.")
+            return
+        
+        zip_path = self.import_widgets['archive_entry'].get().strip()
+        if not zip_path or not os.path.isfile(zip_path):
+            messagebox.showerror("Error", "Please select an export ZIP file.")
+            return
+        
         try:
-            zip_path_temp, filename = create_export_zip(
-                selected_chars, self.characters,
-                export_ui, export_config, export_spellsets
-            )
-            
-            # Move temp file to user's chosen location
-            shutil.move(zip_path_temp, zip_path)
-            
-            messagebox.showinfo("Success", f"Successfully exported {len(selected_chars)} character(s) to:\n{zip_path}")
+            rename_map = parse_rename_mapping(self.import_widgets['rename_textbox'].get("1.0", "end"))
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid rename mapping:\n{str(e)}")
+            return
+        
+        if self._import_task and not self._import_task.finished:
+            self._import_task.cancel()
+        
+        characters = self.characters
+        self._import_plan = None
+        self.import_widgets['summary_label'].configure(text="Reading archive...")
+        self._import_task = BackgroundTask(
+            self.root,
+            lambda task: plan_import(zip_path, characters, rename_map),
+            on_done=lambda plan: self.on_import_planned(zip_path, plan),
+            on_error=self.on_import_plan_error
+        ).start()
+    
+    def on_import_planned(self, zip_path, plan):
+        """Show the characters found in the archive and their conflicts."""
+        self._import_plan = (zip_path, plan)
+        char_names = sorted({entry.char_name for entry in plan})
+        conflicts = sum(1 for entry in plan if entry.conflict)
+        duplicates = [name for entry in plan for name in entry.duplicates]
+        
+        self.import_widgets['char_list'].set_items(char_names)
+        self.import_widgets['char_list'].select_all()
+        summary = f"{len(plan)} file(s) for {len(char_names)} character(s); {conflicts} already exist."
+        if duplicates:
+            # A multi-install export can hold one character per install folder
+            folder = duplicates[0].replace('\\', '/').rpartition('/')[0] or "the archive root"
+            summary += (f"\n{len(duplicates)} file(s) repeat a name from another folder and are skipped; "
+                        f"rename them with a folder prefix such as '{folder}/Name=NewName' to import them.")
+        self.import_widgets['summary_label'].configure(text=summary)
+    
+    def on_import_plan_error(self, error):
+        """Report an archive that could not be read."""
+        self.import_widgets['summary_label'].configure(text="Select an archive to import.")
+        messagebox.showerror("Error", f"Could not read the archive:\n{str(error)}")
+    
+    def import_characters(self):
+        """Import the selected characters from the analyzed archive."""
+        from import_operations import apply_import, mark_conflicts
+        if self.progress_busy("import"):
+            return
+        if isinstance(self.scan_target, dict):
+            messagebox.showerror("Error", "Imports go into one directory. Turn off 'Use all active profiles' first.")
+            return
+        
+        if not self._import_plan:
+            messagebox.showerror("Error", "Please select an export archive first.")
+            return
+        
+        if self._import_task and not self._import_task.finished:
+            messagebox.showerror("Error", "An import is already in progress.")
+            return
+        
+        if not self.directory_valid:
+            messagebox.showerror("Error", "Please select a valid Project Quarm directory.")
+            return
+        
+        zip_path, plan = self._import_plan
+        selected = set(self.import_widgets['char_list'].get_selected())
+        entries = [entry for entry in plan if entry.char_name in selected]
+        if not entries:
+            messagebox.showerror("Error", "Please select at least one character to import.")
+            return
+        
+        # The index may have changed since the archive was analyzed
+        mark_conflicts(entries, self.characters)
+        conflicts = [entry for entry in entries if entry.conflict]
+        overwrite = self.import_widgets['overwrite_checkbox'].get()
+        self.remember_checkboxes(self.import_widgets, self.IMPORT_CHECKBOX_SETTINGS)
+        if not overwrite:
+            entries = [entry for entry in entries if not entry.conflict]
+            if not entries:
+                messagebox.showerror("Error", "All selected files already exist. Check 'Overwrite existing files' to replace them.")
+                return
+        
+        confirm_msg = f"Import {len(entries)} file(s) for {len({e.char_name for e in entries})} character(s) into:\n{self.quarm_dir}\n\n"
+        if conflicts:
+            action = "overwritten" if overwrite else "skipped"
+            confirm_msg += f"{len(conflicts)} existing file(s) will be {action}:\n"
+            for entry in conflicts[:self.CONFIRM_LIST_LIMIT]:
+                confirm_msg += f"  • {entry.target_name}\n"
+            if len(conflicts) > self.CONFIRM_LIST_LIMIT:
+                confirm_msg += f"  • ...and {len(conflicts) - self.CONFIRM_LIST_LIMIT} more\n"
+        
+        if not messagebox.askyesno("Confirm", confirm_msg):
+            return
+        
+        directory = self.quarm_dir
+        self.import_widgets['import_button'].configure(state="disabled")
+        self.show_progress("Importing...", "import", on_cancel=self.cancel_import, determinate=True)
+        before = directory_stamps(self.scan_target)
+        self._import_task = BackgroundTask(
+            self.root,
+            lambda task: apply_import(
+                zip_path, entries, directory,
+                progress=lambda done, total: task.report((done, total)),
+                cancel_check=task.check_cancelled
+            ),
+            on_progress=lambda p: self.update_progress(f"Importing... {p[0]}/{p[1]} file(s)", p[0] / p[1]),
+            on_done=lambda written: self.on_import_done(written, before),
+            on_error=self.on_import_error
+        ).start()
+    
+    def cancel_import(self):
+        """Cancel the running import; files already written are kept."""
+        if self._import_task and not self._import_task.finished:
+            self._import_task.cancel()
+        self.import_widgets['import_button'].configure(state="normal")
+        self.hide_progress("Import cancelled.")
+    
+    def on_import_done(self, written, before):
+        """Refresh the index with the imported files and report."""
+        from import_operations import mark_conflicts
+        self.import_widgets['import_button'].configure(state="normal")
+        self.hide_progress(f"Imported {len(written)} file(s).")
+        if written:
+            self.refresh_after_write(written, before)
+            # Analyzed conflicts are stale now
+            mark_conflicts(self._import_plan[1], self.characters)
+        messagebox.showinfo("Success", f"Successfully imported {len(written)} file(s).")
+    
+    def on_import_error(self, error):
+        """Report a failed import."""
+        self.import_widgets['import_button'].configure(state="normal")
+        self.hide_progress("")
+        messagebox.showerror("Error", f"An error occurred while importing:\n{str(error)}")
+    
+    def populate_backups_tab(self):
+        """List the backups of the scanned directories by character."""
+        import backup_store
+        if self.backup_widgets is None:
+            return
+        self._backups_stale = False
+        if isinstance(self.scan_target, dict):
+            installs = {os.path.normcase(os.path.abspath(path)): name for name, path in self.scan_target.items()}
+        elif self.scan_target:
+            installs = {os.path.normcase(os.path.abspath(self.scan_target)): None}
+        else:
+            installs = {}
+        
+        self._backups = [
+            (record, installs[os.path.normcase(record['directory'])])
+            for record in backup_store.list_snapshots(installs)
+        ]
+        char_names = sorted({
+            name if install is None else qualify(install, name)
+            for record, install in self._backups
+            for name in backup_store.snapshot_characters(record)
+        })
+        
+        combo = self.backup_widgets['char_combo']
+        combo.configure(values=[self.ALL_CHARACTERS] + char_names)
+        if combo.get() not in char_names:
+            combo.set(self.ALL_CHARACTERS)
+        self.on_backup_character_change(combo.get())
+        
+        size_mb = backup_store.store_size() / (1024 * 1024)
+        self.backup_widgets['store_label'].configure(
+            text=f"{len(self._backups)} backup(s); the backup store uses {size_mb:.1f} MB."
+        )
+    
+    def selected_backup_character(self):
+        """Return (install, name) picked in the Backups tab; name is None for all characters."""
+        value = self.backup_widgets['char_combo'].get()
+        if value == self.ALL_CHARACTERS:
+            return None, None
+        return split_qualified(value) if isinstance(self.scan_target, dict) else (None, value)
+    
+    def on_backup_character_change(self, value=None):
+        """List the backups holding files of the chosen character, newest first."""
+        import backup_store
+        install, name = self.selected_backup_character()
+        self._backup_choices = {}
+        for record, record_install in self._backups:
+            if name is not None and (record_install != install or name not in backup_store.snapshot_characters(record)):
+                continue
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['created']))
+            where = f" [{record_install}]" if record_install else ""
+            self._backup_choices[f"{created}{where} - {record['reason']}"] = record
         
+        combo = self.backup_widgets['backup_combo']
+        labels = list(self._backup_choices)
+        combo.configure(values=labels)
+        combo.set(labels[0] if labels else "")
+        self.on_backup_select(combo.get())
+    
+    def backup_files_shown(self, record):
+        """Return the file names of a backup that a restore would write."""
+        _install, name = self.selected_backup_character()
+        if name is None:
+            return list(record['files'])
+        return [
+            filename for filename in record['files']
+            if (classify_filename(filename) or (None,))[0] == name
+        ]
+    
+    def on_backup_select(self, label):
+        """Show the files of the selected backup."""
+        record = self._backup_choices.get(label)
+        lines = [] if record is None else [f"{record['directory']}:"] + [
+            f"  {filename}" for filename in sorted(self.backup_files_shown(record))
+        ]
+        textbox = self.backup_widgets['details_textbox']
+        textbox.configure(state="normal")
+        textbox.delete("1.0", "end")
+        textbox.insert("1.0", "\n".join(lines) if lines else "No backups yet. Files are backed up before a copy or import overwrites them.")
+        textbox.configure(state="disabled")
+    
+    def restore_backup(self):
+        """Roll the chosen character (or every character) back to the selected backup."""
+        import backup_store
+        record = self._backup_choices.get(self.backup_widgets['backup_combo'].get())
+        if record is None:
+            messagebox.showerror("Error", "Please select a backup to restore.")
+            return
+        
+        install, name = self.selected_backup_character()
+        files = self.backup_files_shown(record)
+        confirm_msg = f"Restore {len(files)} file(s) from the backup of {self.backup_widgets['backup_combo'].get()}?\n\n"
+        for filename in files[:self.CONFIRM_LIST_LIMIT]:
+            confirm_msg += f"  • {filename}\n"
+        if len(files) > self.CONFIRM_LIST_LIMIT:
+            confirm_msg += f"  • ...and {len(files) - self.CONFIRM_LIST_LIMIT} more\n"
+        confirm_msg += "\nThe current files are backed up first, so this can be undone."
+        if not messagebox.askyesno("Confirm", confirm_msg):
+            return
+        
+        record_install = next(i for r, i in self._backups if r is record)
+        before = {record_install: directory_stamp(record['directory'])}
+        try:
+            _directory, written = backup_store.restore_snapshot(record['id'], None if name is None else [name])
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while exporting:\n{str(e)}")
-            if zip_path_temp and os.path.exists(zip_path_temp):
-                os.unlink(zip_path_temp)
+            messagebox.showerror("Error", f"An error occurred while restoring the backup:\n{str(e)}")
+            return
+        
+        if written:
+            self.refresh_after_write([
+                filename if record_install is None else qualify(record_install, filename)
+                for filename in written
+            ], before)
+        messagebox.showinfo("Success", f"Restored {len(written)} file(s).")
+    
+    def prune_backups(self):
+        """Delete backups past the age and size limits."""
+        import backup_store
+        removed, freed = backup_store.prune()
+        self.populate_backups_tab()
+        messagebox.showinfo(
+            "Backups Pruned",
+            f"Removed {removed} old backup(s) and freed {freed / (1024 * 1024):.1f} MB."
+        )
+    
+    def find_identical_files(self):
+        """Group characters by identical file content on a background thread."""
+        from duplicates import find_duplicates
+        if self._duplicates_task and not self._duplicates_task.finished:
+            return
+        if self.progress_busy("identical files search"):
+            return
+        
+        # The watcher adds and removes characters while the analysis iterates
+        characters = dict(self.characters)
+        self.duplicate_widgets['find_button'].configure(state="disabled")
+        self.show_progress("Finding identical files...", "identical files search", on_cancel=self.cancel_duplicates, determinate=True)
+        self._duplicates_task = BackgroundTask(
+            self.root,
+            lambda task: find_duplicates(
+                characters,
+                progress=lambda done, total: task.report((done, total)),
+                cancel_check=task.check_cancelled
+            ),
+            on_progress=lambda p: self.update_progress(f"Comparing files... {p[0]}/{p[1]}", p[0] / p[1]),
+            on_done=self.on_duplicates_done,
+            on_error=self.on_duplicates_error
+        ).start()
+    
+    def cancel_duplicates(self):
+        """Stop the running analysis."""
+        if self._duplicates_task and not self._duplicates_task.finished:
+            self._duplicates_task.cancel()
+        self.duplicate_widgets['find_button'].configure(state="normal")
+        self.hide_progress("Search cancelled.")
+    
+    def on_duplicates_done(self, clusters):
+        """List the groups of characters sharing a file."""
+        self.duplicate_widgets['find_button'].configure(state="normal")
+        self.hide_progress(f"{len(clusters)} group(s) of identical files found.")
+        shared = sum(len(cluster.members) for cluster in clusters)
+        self.show_clusters(clusters, f"{len(clusters)} group(s); {shared} file(s) are identical to another character's.")
+    
+    def on_duplicates_error(self, error):
+        """Report a failed analysis."""
+        self.duplicate_widgets['find_button'].configure(state="normal")
+        self.hide_progress("")
+        messagebox.showerror("Error", f"An error occurred while comparing files:\n{str(error)}")
+    
+    def show_clusters(self, clusters, summary):
+        """Fill the group picker, largest group first."""
+        self._cluster_choices = {}
+        for number, cluster in enumerate(clusters, 1):
+            label = f"{number}. {self.KIND_LABELS[cluster.kind]} shared by {len(cluster.members)}: {', '.join(cluster.members[:3])}"
+            if len(cluster.members) > 3:
+                label += ", ..."
+            self._cluster_choices[label] = cluster
+        
+        combo = self.duplicate_widgets['cluster_combo']
+        labels = list(self._cluster_choices)
+        combo.configure(values=labels[:self.MAX_COMBO_VALUES])
+        combo.set(labels[0] if labels else "")
+        self.duplicate_widgets['summary_label'].configure(text=summary)
+        self.on_cluster_select(combo.get())
+    
+    def on_cluster_select(self, label):
+        """Show the characters of the selected group."""
+        cluster = self._cluster_choices.get(label)
+        textbox = self.duplicate_widgets['members_textbox']
+        textbox.configure(state="normal")
+        textbox.delete("1.0", "end")
+        if cluster is not None:
+            textbox.insert("1.0", f"{self.KIND_LABELS[cluster.kind]} file, {cluster.size:,} bytes, identical for:\n"
+                           + "\n".join(f"  {name}" for name in cluster.members))
+        textbox.configure(state="disabled")
+    
+    def selected_cluster(self):
+        """Return the selected group's still-indexed members and the group, or (None, None)."""
+        cluster = self._cluster_choices.get(self.duplicate_widgets['cluster_combo'].get())
+        if cluster is None:
+            messagebox.showerror("Error", "Please find identical files and select a group first.")
+            return None, None
+        members = [name for name in cluster.members if name in self.characters]
+        if not members:
+            messagebox.showerror("Error", "The characters in this group no longer exist. Find identical files again.")
+            return None, None
+        return members, cluster
+    
+    def show_tab(self, name):
+        """Switch to a tab, building it first if needed."""
+        self.ensure_tab_built(name)
+        self.tabview.set(name)
+    
+    def copy_from_cluster(self):
+        """Use the group's shared file as the copy source."""
+        members, cluster = self.selected_cluster()
+        if members is None:
+            return
+        self.show_tab(self.COPY_TAB)
+        # Every member holds the same file, so any one of them is the source
+        self.copy_widgets['source_filter'].delete(0, "end")
+        self.on_source_filter()
+        self.copy_widgets['source_combo'].set(members[0])
+        self.on_source_combo_change(members[0])
+        for kind, widget_key in self.KIND_CHECKBOXES.items():
+            if kind == cluster.kind:
+                self.copy_widgets[widget_key].select()
+            else:
+                self.copy_widgets[widget_key].deselect()
+    
+    def copy_to_cluster(self):
+        """Select the group's characters as the copy targets."""
+        members, _cluster = self.selected_cluster()
+        if members is None:
+            return
+        self.show_tab(self.COPY_TAB)
+        if not self.copy_widgets['multi_switch'].get():
+            self.copy_widgets['multi_switch'].select()
+            self.on_multi_target_toggle()
+        self.copy_widgets['target_list'].select_only(members)
+    
+    def export_cluster(self):
+        """Select the group's characters for export."""
+        members, _cluster = self.selected_cluster()
+        if members is None:
+            return
+        self.show_tab(self.EXPORT_TAB)
+        self.export_widgets['char_list'].select_only(members)
+    
+    def on_template_source_filter(self, event=None):
+        """Narrow the template source picker as the user types."""
+        matches = self.filters['template_source'].filter(self.template_widgets['char_filter'].get())
+        combo = self.template_widgets['char_combo']
+        combo.configure(values=matches[:self.MAX_COMBO_VALUES])
+        if combo.get() not in matches:
+            combo.set(matches[0] if matches else "")
+    
+    def populate_template_list(self, selected=None):
+        """List the saved templates, keeping (or moving to) the selected one."""
+        import templates
+        names = [manifest['name'] for manifest in templates.list_templates()]
+        combo = self.template_widgets['template_combo']
+        combo.configure(values=names)
+        if selected is None:
+            selected = combo.get()
+        combo.set(selected if selected in names else (names[0] if names else ""))
+        self.on_template_select(combo.get())
+    
+    def on_template_select(self, name):
+        """Show where the selected template came from and what it holds."""
+        import templates
+        label = self.template_widgets['details_label']
+        if not name:
+            label.configure(text="No templates yet. Save a character as a template first.")
+            return
+        try:
+            template = templates.load_template(name)
+        except (OSError, ValueError) as e:
+            label.configure(text=str(e))
+            return
+        created = time.strftime('%Y-%m-%d %H:%M', time.localtime(template.created))
+        kinds = ', '.join(self.KIND_LABELS[kind] for kind in template.kinds)
+        label.configure(text=f"From {template.source}, saved {created}: {kinds}")
+    
+    def save_character_template(self):
+        """Save the chosen character's files as a named template."""
+        import templates
+        source = self.template_widgets['char_combo'].get()
+        name = self.template_widgets['name_entry'].get().strip()
+        if source not in self.characters:
+            messagebox.showerror("Error", "Please select a character to save as a template.")
+            return
+        if not name:
+            messagebox.showerror("Error", "Please enter a template name.")
+            return
+        
+        overwrite = name in {manifest['name'] for manifest in templates.list_templates()}
+        if overwrite and not messagebox.askyesno("Confirm", f"Replace the existing template '{name}' with '{source}'s files?"):
+            return
+        try:
+            template = templates.save_template(name, source, self.characters[source], overwrite=overwrite)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save the template:\n{str(e)}")
+            return
+        self.template_widgets['name_entry'].delete(0, "end")
+        self.populate_template_list(template.name)
+    
+    def delete_selected_template(self):
+        """Delete the selected template after confirmation."""
+        import templates
+        name = self.template_widgets['template_combo'].get()
+        if not name:
+            messagebox.showerror("Error", "Please select a template to delete.")
+            return
+        if not messagebox.askyesno("Confirm", f"Delete the template '{name}'? Characters created from it are not affected."):
+            return
+        try:
+            templates.delete_template(name)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+        self.populate_template_list()
+    
+    def apply_selected_template(self):
+        """Create every listed character from the selected template in one batch."""
+        import templates
+        if self._template_task and not self._template_task.finished:
+            messagebox.showerror("Error", "Characters are already being created.")
+            return
+        if self.progress_busy("character creation"):
+            return
+        
+        try:
+            template = templates.load_template(self.template_widgets['template_combo'].get())
+        except (OSError, ValueError):
+            messagebox.showerror("Error", "Please select a template.")
+            return
+        names = templates.parse_names(self.template_widgets['names_textbox'].get("1.0", "end"))
+        if not names:
+            messagebox.showerror("Error", "Please enter at least one new character name.")
+            return
+        
+        overwrite = bool(self.template_widgets['overwrite_checkbox'].get())
+        self.remember_checkboxes(self.template_widgets, self.TEMPLATE_CHECKBOX_SETTINGS)
+        existing = [name for name in names if name in self.characters]
+        confirm_msg = f"Create {len(names)} character(s) from the template '{template.name}'?\n"
+        if existing:
+            action = "overwritten (their files are backed up first)" if overwrite else "skipped"
+            confirm_msg += f"\n{len(existing)} already exist and will be {action}:\n"
+            for name in existing[:self.CONFIRM_LIST_LIMIT]:
+                confirm_msg += f"  • {name}\n"
+            if len(existing) > self.CONFIRM_LIST_LIMIT:
+                confirm_msg += f"  • ...and {len(existing) - self.CONFIRM_LIST_LIMIT} more\n"
+        if not messagebox.askyesno("Confirm", confirm_msg):
+            return
+        
+        characters = self.characters
+        scan_target = self.scan_target
+        self.template_widgets['apply_button'].configure(state="disabled")
+        self.show_progress(f"Creating {len(names)} character(s)...", "character creation", determinate=True)
+        before = directory_stamps(scan_target)
+        self._template_task = BackgroundTask(
+            self.root,
+            lambda task: templates.apply_template(
+                template, names, characters, scan_target, overwrite=overwrite,
+                progress=lambda done, total: task.report((done, total))
+            ),
+            on_progress=lambda p: self.update_progress(f"Creating... {p[0]}/{p[1]} character(s)", p[0] / p[1]),
+            on_done=lambda result: self.on_template_applied(result, before),
+            on_error=self.on_template_error
+        ).start()
+    
+    def on_template_applied(self, result, before):
+        """Report the characters created from a template and add them to the lists."""
+        written, errors = result
+        self.template_widgets['apply_button'].configure(state="normal")
+        
+        written_files = [name for files in written.values() for name in files]
+        self.hide_progress(f"Created {len(written)} character(s).")
+        if written_files:
+            self.refresh_after_write(written_files, before)
+        
+        summary = f"Created {len(written)} character(s) with {len(written_files)} file(s)."
+        if errors:
+            summary += f"\n\n{len(errors)} character(s) were not created:\n"
+            for name, error in list(errors.items())[:self.CONFIRM_LIST_LIMIT]:
+                summary += f"  • {name}: {error}\n"
+            if len(errors) > self.CONFIRM_LIST_LIMIT:
+                summary += f"  • ...and {len(errors) - self.CONFIRM_LIST_LIMIT} more\n"
+            messagebox.showwarning("Templates Applied With Errors", summary)
+        else:
+            messagebox.showinfo("Success", summary)
+    
+    def on_template_error(self, error):
+        """Report a failed batch."""
+        self.template_widgets['apply_button'].configure(state="normal")
+        self.hide_progress("")
+        messagebox.showerror("Error", f"An error occurred while creating characters:\n{str(error)}")
@@ -1,65 +1,160 @@
 """Character file scanning functionality."""
 
 import os
-from typing import Dict, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import metrics
 
-def scan_character_files(directory: str) -> Dict[str, Dict[str, str]]:
+
+# File kinds tracked per character, in display order
+FILE_KINDS = ('ui', 'config', 'spellsets')
+
+UI_PREFIX = "UI_"
+PROJ_SUFFIX = "_pq.proj.ini"
+SPELLSETS_SUFFIX = "_spellsets.ini"
+CHARACTER_FILE_SUFFIXES = (PROJ_SUFFIX, SPELLSETS_SUFFIX)
+
+
+class FileEntry:
+    """A single character file with the stat data captured during the scan."""
+
+    __slots__ = ('path', 'size', 'mtime')
+
+    def __init__(self, path: str, size: int, mtime: float):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+
+    def restat(self) -> 'FileEntry':
+        """
+        Return an entry with the file's current size and mtime.
+
+        Index entries can be older than the file (the game rewrites files in
+        place, which a cached scan doesn't see). Raises OSError if it is gone.
+        """
+        st = os.stat(self.path)
+        return FileEntry(self.path, st.st_size, st.st_mtime)
+
+    def __repr__(self):
+        return f"FileEntry({self.path!r}, size={self.size}, mtime={self.mtime})"
+
+
+class CharacterFiles:
+    """The UI, config and spellsets files found for one character."""
+
+    __slots__ = FILE_KINDS
+
+    def __init__(self, ui: Optional[FileEntry] = None, config: Optional[FileEntry] = None,
+                 spellsets: Optional[FileEntry] = None):
+        self.ui = ui
+        self.config = config
+        self.spellsets = spellsets
+
+    def get(self, kind: str) -> Optional[FileEntry]:
+        """Return the entry for a file kind, or None if the character lacks it."""
+        return getattr(self, kind)
+
+    def items(self) -> Iterator[Tuple[str, FileEntry]]:
+        """Yield (kind, entry) pairs for the files that exist."""
+        for kind in FILE_KINDS:
+            entry = getattr(self, kind)
+            if entry is not None:
+                yield kind, entry
+
+    def __bool__(self):
+        return self.ui is not None or self.config is not None or self.spellsets is not None
+
+    def __repr__(self):
+        return f"CharacterFiles(ui={self.ui!r}, config={self.config!r}, spellsets={self.spellsets!r})"
+
+
+def selected_kinds(ui: bool, config: bool, spellsets: bool) -> List[str]:
+    """Return the file kinds enabled by the UI/config/spellsets flags."""
+    return [kind for kind, enabled in zip(FILE_KINDS, (ui, config, spellsets)) if enabled]
+
+
+def character_filename(kind: str, char_name: str) -> str:
+    """Return the file name a character's file of the given kind uses."""
+    if kind == 'ui':
+        return f"{UI_PREFIX}{char_name}{PROJ_SUFFIX}"
+    if kind == 'config':
+        return f"{char_name}{PROJ_SUFFIX}"
+    if kind == 'spellsets':
+        return f"{char_name}{SPELLSETS_SUFFIX}"
+    raise ValueError(f"Unknown file kind: {kind}")
+
+
+def classify_filename(filename: str) -> Optional[Tuple[str, str]]:
+    """
+    Classify a file name as a character file.
+
+    Returns (character_name, kind) or None if the name is not a character file.
+    """
+    if filename.endswith(PROJ_SUFFIX):
+        stem = filename[:-len(PROJ_SUFFIX)]
+        if filename.startswith(UI_PREFIX):
+            char_name, kind = stem[len(UI_PREFIX):], 'ui'
+        else:
+            char_name, kind = stem, 'config'
+    elif filename.endswith(SPELLSETS_SUFFIX):
+        char_name, kind = filename[:-len(SPELLSETS_SUFFIX)], 'spellsets'
+    else:
+        return None
+
+    if not char_name:
+        return None
+    return char_name, kind
+
+
+def build_character_index(files: Iterable[Tuple[str, FileEntry]]) -> Dict[str, CharacterFiles]:
+    """Build a character index, sorted by name, from (file name, entry) pairs."""
+    found: Dict[str, CharacterFiles] = {}
+    for filename, file_entry in files:
+        classified = classify_filename(filename)
+        if classified is None:
+            continue
+        char_name, kind = classified
+        char_files = found.get(char_name)
+        if char_files is None:
+            char_files = found[char_name] = CharacterFiles()
+        setattr(char_files, kind, file_entry)
+    return {name: found[name] for name in sorted(found)}
+
+
+def _iter_scandir_entries(directory: str) -> Iterator[Tuple[str, FileEntry]]:
+    """Yield (file name, entry) for every character file in one scandir pass."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.name.endswith(CHARACTER_FILE_SUFFIXES):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                # File vanished or is unreadable between listing and stat
+                continue
+            yield entry.name, FileEntry(entry.path, st.st_size, st.st_mtime)
+
+
+def scan_character_files(directory: str) -> Dict[str, CharacterFiles]:
     """
     Scan directory for character files.
-    
-    Returns a dictionary mapping character names to their file paths:
+
+    The directory is listed once with os.scandir and each entry is classified
+    a single time. Returns a dictionary mapping character names (sorted) to
+    their files:
     {
-        'CharacterName': {
-            'config': 'path/to/CharacterName_pq.proj.ini',
-            'ui': 'path/to/UI_CharacterName_pq.proj.ini',
-            'spellsets': 'path/to/CharacterName_spellsets.ini'
-        }
+        'CharacterName': CharacterFiles(
+            ui=FileEntry('path/to/UI_CharacterName_pq.proj.ini', size, mtime),
+            config=FileEntry('path/to/CharacterName_pq.proj.ini', size, mtime),
+            spellsets=FileEntry('path/to/CharacterName_spellsets.ini', size, mtime)
+        )
     }
+    Missing file kinds are None.
     """
-    characters: Dict[str, Dict[str, str]] = {}
-    char_names: Set[str] = set()
-    
-    # Scan for config files
-    for file in os.listdir(directory):
-        if file.endswith("_pq.proj.ini") and not file.startswith("UI_"):
-            char_name = file.replace("_pq.proj.ini", "")
-            char_names.add(char_name)
-    
-    # Scan for UI files
-    for file in os.listdir(directory):
-        if file.startswith("UI_") and file.endswith("_pq.proj.ini"):
-            char_name = file.replace("UI_", "").replace("_pq.proj.ini", "")
-            char_names.add(char_name)
-    
-    # Scan for spellsets
-    for file in os.listdir(directory):
-        if file.endswith("_spellsets.ini"):
-            char_name = file.replace("_spellsets.ini", "")
-            char_names.add(char_name)
-    
-    # Build character info
-    for char_name in sorted(char_names):
-        char_info = {
-            'config': None,
-            'ui': None,
-            'spellsets': None
-        }
-        
-        config_file = os.path.join(directory, f"{char_name}_pq.proj.ini")
-        ui_file = os.path.join(directory, f"UI_{char_name}_pq.proj.ini")
-        spellsets_file = os.path.join(directory, f"{char_name}_spellsets.ini")
-        
-        if os.path.exists(config_file):
-            char_info['config'] = config_file
-        if os.path.exists(ui_file):
-            char_info['ui'] = ui_file
-        if os.path.exists(spellsets_file):
-            char_info['spellsets'] = spellsets_file
-        
-        # Only add if at least one file exists
-        if any(char_info.values()):
-            characters[char_name] = char_info
-    
+    with metrics.span('scan', directory=directory) as span:
+        characters = build_character_index(_iter_scandir_entries(directory))
+        if span:
+            span.set(characters=len(characters), files=sum(1 for c in characters.values() for _ in c.items()))
     return characters
-
@@ -0,0 +1,610 @@
+"""Headless command-line interface.
+
+Runs scans, copies, exports and imports without loading Tk/CustomTkinter:
+
+    python main.py scan [--dir DIR]
+    python main.py copy --source Main --targets Alt1 Alt2 [--overwrite]
+    python main.py export --output chars.zip [--chars A B | --all]
+    python main.py import --archive chars.zip [--rename Bob=Robert]
+    python main.py batch ops.json
+    python main.py profile add live "C:\\Games\\Project Quarm"
+    python main.py backup restore 20240101-120000-a1b2c3 --chars Bob
+    python main.py diff --source Main --target Alt1 [--types ui]
+    python main.py duplicates --types ui [--group 1]
+    python main.py template save Warrior --source Main
+    python main.py template apply Warrior --names-file new_alts.txt
+
+Every command accepts --json for machine-readable output, and --profile NAME
+or --all-profiles to work on several installs at once; character names are
+then qualified with their install, e.g. "live:Main". A batch file is a
+JSON list of operations whose keys mirror the long options, e.g.
+[{"command": "copy", "source": "Main", "targets": ["Alt1"], "overwrite": true}].
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from typing import Dict, List, Optional
+
+import backup_store
+import templates
+from config import load_active_profiles, load_profiles, load_saved_directory, save_profiles
+from character_scanner import FILE_KINDS, CharacterFiles, FileEntry
+from installs import Directory, apply_written_files, check_install_name, directory_stamps, scan_installs, split_qualified
+from scan_cache import directory_stamp, load_character_index, refresh_files
+from copy_engine import COPY_MODES, DEFAULT_COPY_MODE, CopyStats
+from copy_plan import OVERWRITE, execute_plan, plan_copy
+from ini_diff import KeyChange, SectionDiff, diff_files, format_diff, summarize
+from duplicates import find_duplicates
+from file_operations import COMPRESSION_LEVELS, DEFAULT_COMPRESSION, create_export_zip
+from import_operations import apply_import, parse_rename_mapping, plan_import
+
+
+class CLIError(Exception):
+    """A user-facing command error."""
+
+
+# Errors reported as a failed command rather than a traceback; archives
+# raise BadZipFile when damaged and KeyError for a missing member
+COMMAND_ERRORS = (CLIError, OSError, ValueError, zipfile.BadZipFile, KeyError)
+
+
+def _resolve_directory(args) -> Directory:
+    """
+    Return the Quarm directory from --dir or the saved configuration, or an
+    install -> directory mapping when --profile/--all-profiles is given.
+    """
+    if args.profile or args.all_profiles:
+        profiles = load_profiles()
+        names = load_active_profiles() if args.all_profiles else args.profile
+        unknown = [name for name in names if name not in profiles]
+        if unknown:
+            raise CLIError(f"Unknown profile(s): {', '.join(unknown)}")
+        if not names:
+            raise CLIError("No active profiles; add one with 'profile add'.")
+        return {name: profiles[name] for name in names}
+
+    directory = args.dir or load_saved_directory()
+    if not directory or not os.path.isdir(directory):
+        raise CLIError("No valid Project Quarm directory; pass --dir.")
+    return directory
+
+
+def _load_index(directory: Directory, force: bool = False) -> Dict[str, CharacterFiles]:
+    """Load the index of one directory, or the merged index of several installs."""
+    if isinstance(directory, str):
+        return load_character_index(directory, force=force)
+    return scan_installs(directory, force=force)
+
+
+def _kind_flags(types: List[str]):
+    """Convert a --types list into (ui, config, spellsets) flags."""
+    unknown = set(types) - set(FILE_KINDS)
+    if unknown:
+        raise CLIError(f"Unknown file type(s): {', '.join(sorted(unknown))}")
+    return 'ui' in types, 'config' in types, 'spellsets' in types
+
+
+def _read_name_file(path: Optional[str]) -> List[str]:
+    """Read one character name per line, ignoring blanks."""
+    if not path:
+        return []
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _entry_to_json(entry: Optional[FileEntry]) -> Optional[dict]:
+    """Describe a file as it is now; the index may predate in-place rewrites."""
+    if entry is None:
+        return None
+    try:
+        entry = entry.restat()
+    except OSError:
+        return None
+    return {'path': entry.path, 'size': entry.size, 'mtime': entry.mtime}
+
+
+def _files_to_json(char_files: CharacterFiles) -> Dict[str, Optional[dict]]:
+    return {kind: _entry_to_json(char_files.get(kind)) for kind in FILE_KINDS}
+
+
+def cmd_scan(args) -> dict:
+    """List characters and the files each one has."""
+    directory = _resolve_directory(args)
+    characters = _load_index(directory, force=args.force)
+    return {
+        'directory': directory,
+        'characters': {name: _files_to_json(files) for name, files in characters.items()},
+    }
+
+
+def cmd_copy(args) -> dict:
+    """Copy one character's files to many targets."""
+    directory = _resolve_directory(args)
+    characters = _load_index(directory)
+    if args.source not in characters:
+        raise CLIError(f"Unknown source character: {args.source}")
+
+    targets = [t for t in (args.targets or []) + _read_name_file(args.targets_file) if t != args.source]
+    if not targets:
+        raise CLIError("No target characters given.")
+    if not isinstance(directory, str):
+        unqualified = [t for t in targets if split_qualified(t)[0] not in directory]
+        if unqualified:
+            raise CLIError(f"Qualify targets with a profile, e.g. {next(iter(directory))}:{unqualified[0]}")
+    copy_ui, copy_config, copy_spellsets = _kind_flags(args.types)
+
+    plan = plan_copy(args.source, targets, characters, directory,
+                     copy_ui, copy_config, copy_spellsets, args.mode, args.skip_identical, args.sections)
+    overwrites = plan.overwrites()
+    if overwrites and not args.overwrite:
+        raise CLIError(
+            f"{len(overwrites)} target(s) already have files ({', '.join(list(overwrites)[:5])}...); "
+            "pass --overwrite to replace them."
+        )
+
+    stats = CopyStats()
+    before = directory_stamps(directory)
+    copied, errors = execute_plan(plan, stats=stats)
+    apply_written_files(characters, directory, [action.dest_name for action in plan.actions], before)
+    return {
+        'source': args.source,
+        'copied': copied,
+        'errors': errors,
+        'stats': {'copied': stats.copied, 'linked': stats.linked, 'skipped': stats.skipped},
+    }
+
+
+def cmd_diff(args) -> dict:
+    """Show what copying one character over another would change, section by section."""
+    directory = _resolve_directory(args)
+    characters = _load_index(directory)
+    for name in (args.source, args.target):
+        if name not in characters:
+            raise CLIError(f"Unknown character: {name}")
+    copy_ui, copy_config, copy_spellsets = _kind_flags(args.types)
+
+    plan = plan_copy(args.source, [args.target], characters, directory,
+                     copy_ui, copy_config, copy_spellsets, sections=args.sections)
+    diffs = [
+        diff
+        for action in plan.actions if action.action == OVERWRITE
+        for diff in diff_files(action.source.path, action.dest_path, plan.sections, action.dest_name)
+    ]
+    return {
+        'source': args.source,
+        'target': args.target,
+        'summary': summarize(diffs),
+        'sections': [
+            {'file': diff.filename, 'section': diff.section, 'status': diff.status,
+             'changes': [change._asdict() for change in diff.changes]}
+            for diff in diffs
+        ],
+    }
+
+
+def cmd_export(args) -> dict:
+    """Export characters to a ZIP archive."""
+    directory = _resolve_directory(args)
+    characters = _load_index(directory)
+    selected = list(characters) if args.all else (args.chars or []) + _read_name_file(args.chars_file)
+    missing = [name for name in selected if name not in characters]
+    if missing:
+        raise CLIError(f"Unknown character(s): {', '.join(missing)}")
+    if not selected:
+        raise CLIError("No characters selected; pass --chars or --all.")
+
+    export_ui, export_config, export_spellsets = _kind_flags(args.types)
+    count = create_export_zip(
+        args.output, selected, characters, export_ui, export_config, export_spellsets,
+        compression=args.compression, dedup=args.dedup
+    )
+    return {'output': args.output, 'characters': len(selected), 'files': count}
+
+
+def cmd_import(args) -> dict:
+    """Import characters from an export archive."""
+    directory = _resolve_directory(args)
+    if not isinstance(directory, str):
+        if len(directory) != 1:
+            raise CLIError("Imports go into one directory; pass a single --profile.")
+        directory = next(iter(directory.values()))
+    characters = load_character_index(directory)
+    try:
+        rename_map = parse_rename_mapping("\n".join(args.rename or []))
+        if args.rename_file:
+            with open(args.rename_file, 'r') as f:
+                rename_map.update(parse_rename_mapping(f.read()))
+    except ValueError as e:
+        raise CLIError(f"Invalid rename mapping: {e}")
+
+    plan = plan_import(args.archive, characters, rename_map)
+    if args.chars:
+        wanted = set(args.chars)
+        plan = [entry for entry in plan if entry.char_name in wanted]
+    skipped = [entry.target_name for entry in plan if entry.conflict and not args.overwrite]
+    duplicates = [name for entry in plan for name in entry.duplicates]
+    entries = [entry for entry in plan if args.overwrite or not entry.conflict]
+
+    before = directory_stamps(directory)
+    written = apply_import(args.archive, entries, directory)
+    apply_written_files(characters, directory, written, before)
+    return {'archive': args.archive, 'written': written, 'skipped_existing': skipped,
+            'skipped_duplicates': duplicates}
+
+
+def cmd_profile(args) -> dict:
+    """List, add, remove, activate or deactivate install profiles."""
+    profiles = load_profiles()
+    active = load_active_profiles()
+    names = args.names
+
+    if args.action == 'add':
+        if len(names) != 2:
+            raise CLIError("Usage: profile add NAME DIRECTORY")
+        name, path = names
+        try:
+            check_install_name(name)
+        except ValueError as e:
+            raise CLIError(str(e))
+        if not os.path.isdir(path):
+            raise CLIError(f"Not a directory: {path}")
+        profiles[name] = os.path.abspath(path)
+        if name not in active:
+            active.append(name)
+    elif args.action in ('remove', 'activate', 'deactivate'):
+        unknown = [name for name in names if name not in profiles]
+        if unknown:
+            raise CLIError(f"Unknown profile(s): {', '.join(unknown)}")
+        for name in names:
+            if args.action == 'remove':
+                del profiles[name]
+            if args.action == 'activate' and name not in active:
+                active.append(name)
+            if args.action != 'activate' and name in active:
+                active.remove(name)
+
+    if args.action != 'list':
+        save_profiles(profiles, active)
+    return {'profiles': profiles, 'active': [name for name in active if name in profiles]}
+
+
+def _snapshot_to_json(record: dict) -> dict:
+    return {
+        'id': record['id'],
+        'created': record['created'],
+        'reason': record['reason'],
+        'directory': record['directory'],
+        'characters': backup_store.snapshot_characters(record),
+        'files': len(record['files']),
+    }
+
+
+def cmd_backup(args) -> dict:
+    """List, restore or prune the backups taken before files are overwritten."""
+    if args.action == 'prune':
+        limits = {}
+        if args.max_mb is not None:
+            limits['max_bytes'] = int(args.max_mb * 1024 * 1024)
+        if args.max_age_days is not None:
+            limits['max_age_days'] = args.max_age_days
+        removed, freed = backup_store.prune(**limits)
+        return {'removed': removed, 'freed_bytes': freed, 'store_bytes': backup_store.store_size()}
+
+    chars = [split_qualified(name)[1] for name in args.chars] if args.chars else None
+    if args.action == 'restore':
+        if not args.snapshot:
+            raise CLIError("Usage: backup restore SNAPSHOT [--chars NAME...]")
+        before = directory_stamp(backup_store.get_snapshot(args.snapshot)['directory'])
+        directory, written = backup_store.restore_snapshot(args.snapshot, chars)
+        if written:
+            refresh_files(directory, written, before)
+        return {'snapshot': args.snapshot, 'directory': directory, 'written': written}
+
+    directory = _resolve_directory(args)
+    directories = [directory] if isinstance(directory, str) else list(directory.values())
+    records = backup_store.list_snapshots(directories)
+    if chars:
+        records = [r for r in records if set(chars) & set(backup_store.snapshot_characters(r))]
+    return {'snapshots': [_snapshot_to_json(record) for record in records],
+            'store_bytes': backup_store.store_size()}
+
+
+def cmd_duplicates(args) -> dict:
+    """Group characters whose files of a kind are identical."""
+    directory = _resolve_directory(args)
+    characters = _load_index(directory)
+    clusters = [
+        {'kind': cluster.kind, 'size': cluster.size, 'digest': cluster.digest, 'characters': cluster.members}
+        for cluster in find_duplicates(characters, args.types)
+    ]
+    if args.group is None:
+        return {'groups': clusters}
+    if not 1 <= args.group <= len(clusters):
+        raise CLIError(f"No group {args.group}; found {len(clusters)} group(s).")
+    return {'group': clusters[args.group - 1]}
+
+
+def cmd_template(args) -> dict:
+    """List, save, apply or delete named layout templates."""
+    if args.action == 'list':
+        return {'templates': templates.list_templates()}
+    if not args.name:
+        raise CLIError(f"Usage: template {args.action} NAME")
+    if args.action == 'delete':
+        templates.delete_template(args.name)
+        return {'deleted': args.name}
+
+    directory = _resolve_directory(args)
+    characters = _load_index(directory)
+    if args.action == 'save':
+        if args.source not in characters:
+            raise CLIError(f"Unknown source character: {args.source}")
+        template = templates.save_template(args.name, args.source, characters[args.source], args.types, args.overwrite)
+        return {'saved': template.name, 'source': template.source, 'kinds': template.kinds}
+
+    names = list(dict.fromkeys((args.names or []) + _read_name_file(args.names_file)))
+    if not names:
+        raise CLIError("No character names given; pass --names or --names-file.")
+    template = templates.load_template(args.name)
+    before = directory_stamps(directory)
+    written, errors = templates.apply_template(template, names, characters, directory, overwrite=args.overwrite)
+    apply_written_files(characters, directory, [name for files in written.values() for name in files], before)
+    return {'template': template.name, 'written': written, 'errors': errors}
+
+
+def cmd_batch(args) -> dict:
+    """Run a JSON list of operations in one process."""
+    with open(args.file, 'r') as f:
+        operations = json.load(f)
+    if not isinstance(operations, list):
+        raise CLIError("Batch file must contain a JSON list of operations.")
+
+    parser = build_parser()
+    results = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results.append({'command': None, 'ok': False, 'error': f"Operation #{index} is not a JSON object"})
+            if args.stop_on_error:
+                break
+            continue
+        try:
+            op_args = parser.parse_args(_operation_to_argv(operation, args))
+            results.append({'command': op_args.command, 'ok': True, 'result': op_args.handler(op_args)})
+        except SystemExit:
+            results.append({'command': operation.get('command'), 'ok': False, 'error': f"Invalid operation #{index}"})
+            if args.stop_on_error:
+                break
+        except COMMAND_ERRORS as e:
+            results.append({'command': operation.get('command'), 'ok': False, 'error': str(e)})
+            if args.stop_on_error:
+                break
+    return {'operations': results}
+
+
+def _operation_to_argv(operation: dict, batch_args) -> List[str]:
+    """Turn a batch operation dict into an argv list for the command parser."""
+    operation = dict(operation)
+    command = operation.pop('command', None)
+    if command not in COMMANDS or command == 'batch':
+        raise CLIError(f"Unknown batch command: {command}")
+    if batch_args.dir and 'dir' not in operation:
+        operation['dir'] = batch_args.dir
+
+    argv = [command]
+    for key, value in operation.items():
+        option = '--' + key.replace('_', '-')
+        if value is True:
+            argv.append(option)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, list):
+            argv.append(option)
+            argv.extend(str(item) for item in value)
+        else:
+            argv.extend([option, str(value)])
+    return argv
+
+
+def _print_text(command: str, result: dict):
+    """Print a human-readable summary of a command result."""
+    if command == 'scan':
+        directory = result['directory']
+        where = directory if isinstance(directory, str) else ', '.join(directory)
+        print(f"{len(result['characters'])} character(s) in {where}")
+        for name, files in result['characters'].items():
+            present = [kind for kind in FILE_KINDS if files[kind]]
+            print(f"  {name:<24} {', '.join(present)}")
+    elif command == 'copy':
+        stats = result['stats']
+        print(f"Copied from {result['source']} to {len(result['copied'])} character(s): "
+              f"{stats['copied']} copied, {stats['linked']} linked, {stats['skipped']} unchanged")
+        for target, error in result['errors'].items():
+            print(f"  FAILED {target}: {error}")
+    elif command == 'diff':
+        current_file = None
+        for section in result['sections']:
+            if section['file'] != current_file:
+                current_file = section['file']
+                print(f"{current_file}:")
+            diff = SectionDiff(section['file'], section['section'], section['status'],
+                               [KeyChange(**change) for change in section['changes']])
+            for line in format_diff(diff):
+                print(f"  {line}")
+        print(f"Copying {result['source']} over {result['target']}: {result['summary']}")
+    elif command == 'export':
+        print(f"Exported {result['files']} file(s) for {result['characters']} character(s) to {result['output']}")
+    elif command == 'import':
+        print(f"Imported {len(result['written'])} file(s) from {result['archive']}")
+        if result['skipped_existing']:
+            print(f"  Skipped {len(result['skipped_existing'])} existing file(s); pass --overwrite to replace them")
+        if result['skipped_duplicates']:
+            print(f"  Skipped {len(result['skipped_duplicates'])} file(s) repeating a name from another folder; "
+                  "rename them with a folder prefix, e.g. --rename test/Bob=BobTest")
+            for name in result['skipped_duplicates']:
+                print(f"    {name}")
+    elif command == 'profile':
+        for name, path in result['profiles'].items():
+            marker = '*' if name in result['active'] else ' '
+            print(f"{marker} {name:<16} {path}")
+    elif command == 'backup':
+        if 'snapshots' in result:
+            for snapshot in result['snapshots']:
+                created = time.strftime('%Y-%m-%d %H:%M', time.localtime(snapshot['created']))
+                print(f"{snapshot['id']}  {created}  {snapshot['reason']}: {', '.join(snapshot['characters'])}")
+            print(f"{len(result['snapshots'])} backup(s), store uses {result['store_bytes'] // 1024} KiB")
+        elif 'written' in result:
+            print(f"Restored {len(result['written'])} file(s) into {result['directory']} from {result['snapshot']}")
+        else:
+            print(f"Removed {result['removed']} backup(s), freed {result['freed_bytes'] // 1024} KiB")
+    elif command == 'duplicates':
+        if 'group' in result:
+            # Bare names, ready for --targets-file or --chars-file
+            for name in result['group']['characters']:
+                print(name)
+            return
+        for number, group in enumerate(result['groups'], 1):
+            print(f"{number:>4}. {group['kind']:<9} {group['size']:>9} bytes  {len(group['characters'])} character(s): "
+                  f"{', '.join(group['characters'])}")
+        print(f"{len(result['groups'])} group(s) of identical files")
+    elif command == 'template':
+        if 'templates' in result:
+            for manifest in result['templates']:
+                created = time.strftime('%Y-%m-%d %H:%M', time.localtime(manifest['created']))
+                print(f"{manifest['name']:<24} {created}  from {manifest['source']}: {', '.join(manifest['kinds'])}")
+        elif 'deleted' in result:
+            print(f"Deleted template {result['deleted']}")
+        elif 'saved' in result:
+            print(f"Saved {result['source']}'s {', '.join(result['kinds'])} file(s) as template {result['saved']}")
+        else:
+            print(f"Created {len(result['written'])} character(s) from template {result['template']}")
+            for name, error in result['errors'].items():
+                print(f"  FAILED {name}: {error}")
+    elif command == 'batch':
+        for operation in result['operations']:
+            if operation['ok']:
+                _print_text(operation['command'], operation['result'])
+            else:
+                print(f"{operation['command']}: FAILED: {operation['error']}")
+
+
+COMMANDS = {
+    'scan': cmd_scan,
+    'copy': cmd_copy,
+    'diff': cmd_diff,
+    'export': cmd_export,
+    'import': cmd_import,
+    'profile': cmd_profile,
+    'backup': cmd_backup,
+    'duplicates': cmd_duplicates,
+    'template': cmd_template,
+    'batch': cmd_batch,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--dir', help="Project Quarm directory (default: the saved directory)")
+    common.add_argument('--json', action='store_true', help="Print machine-readable JSON")
+    common.add_argument('--profile', nargs='+', help="Use these install profiles instead of --dir")
+    common.add_argument('--all-profiles', action='store_true', help="Use every active install profile")
+
+    parser = argparse.ArgumentParser(prog='QuarmQuickCharacterCopy', description="Quarm Quick Character Copy")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser('scan', parents=[common], help="List characters")
+    scan.add_argument('--force', action='store_true', help="Ignore the scan cache")
+
+    copy = subparsers.add_parser('copy', parents=[common], help="Copy one character to many")
+    copy.add_argument('--source', required=True)
+    copy.add_argument('--targets', nargs='+')
+    copy.add_argument('--targets-file', help="File with one target name per line")
+    copy.add_argument('--types', nargs='+', default=list(FILE_KINDS), choices=FILE_KINDS)
+    copy.add_argument('--mode', default=DEFAULT_COPY_MODE, choices=COPY_MODES,
+                      help="'hardlink' makes new targets share the source's files; existing targets are copied")
+    copy.add_argument('--skip-identical', action='store_true')
+    copy.add_argument('--overwrite', action='store_true', help="Allow replacing existing files")
+    copy.add_argument('--sections', nargs='+', help="Only merge these INI sections, e.g. 'HotButton*' 'Main/Width'")
+
+    diff = subparsers.add_parser('diff', parents=[common], help="Show what a copy would change")
+    diff.add_argument('--source', required=True)
+    diff.add_argument('--target', required=True)
+    diff.add_argument('--types', nargs='+', default=list(FILE_KINDS), choices=FILE_KINDS)
+    diff.add_argument('--sections', nargs='+', help="Only compare these INI sections, e.g. 'HotButton*' 'Main/Width'")
+
+    export = subparsers.add_parser('export', parents=[common], help="Export characters to a ZIP")
+    export.add_argument('--output', required=True)
+    export.add_argument('--chars', nargs='+')
+    export.add_argument('--chars-file', help="File with one character name per line")
+    export.add_argument('--all', action='store_true')
+    export.add_argument('--types', nargs='+', default=list(FILE_KINDS), choices=FILE_KINDS)
+    export.add_argument('--compression', default=DEFAULT_COMPRESSION, choices=list(COMPRESSION_LEVELS))
+    export.add_argument('--dedup', action='store_true')
+
+    import_ = subparsers.add_parser('import', parents=[common], help="Import characters from a ZIP")
+    import_.add_argument('--archive', required=True)
+    import_.add_argument('--chars', nargs='+', help="Only import these (post-rename) characters")
+    import_.add_argument('--rename', nargs='+', help="Rename mappings such as Bob=Robert")
+    import_.add_argument('--rename-file', help="File with one Old=New mapping per line")
+    import_.add_argument('--overwrite', action='store_true', help="Replace existing files")
+
+    profile = subparsers.add_parser('profile', parents=[common], help="Manage install profiles")
+    profile.add_argument('action', choices=['list', 'add', 'remove', 'activate', 'deactivate'])
+    profile.add_argument('names', nargs='*', help="Profile names (add takes NAME DIRECTORY)")
+
+    backup = subparsers.add_parser('backup', parents=[common], help="List, restore or prune backups")
+    backup.add_argument('action', choices=['list', 'restore', 'prune'])
+    backup.add_argument('snapshot', nargs='?', help="Backup to restore (from 'backup list')")
+    backup.add_argument('--chars', nargs='+', help="Only these characters")
+    backup.add_argument('--max-mb', type=float, help="Prune down to this store size")
+    backup.add_argument('--max-age-days', type=float, help="Prune backups older than this")
+
+    duplicates = subparsers.add_parser('duplicates', parents=[common], help="Find characters with identical files")
+    duplicates.add_argument('--types', nargs='+', default=list(FILE_KINDS), choices=FILE_KINDS)
+    duplicates.add_argument('--group', type=int, help="Only list the characters of this group number")
+
+    template = subparsers.add_parser('template', parents=[common], help="Save and apply named layout templates")
+    template.add_argument('action', choices=['list', 'save', 'apply', 'delete'])
+    template.add_argument('name', nargs='?', help="Template name")
+    template.add_argument('--source', help="Character to save as the template")
+    template.add_argument('--types', nargs='+', default=list(FILE_KINDS), choices=FILE_KINDS)
+    template.add_argument('--names', nargs='+', help="New characters to create from the template")
+    template.add_argument('--names-file', help="File with one new character name per line")
+    template.add_argument('--overwrite', action='store_true', help="Replace an existing template or characters")
+
+    batch = subparsers.add_parser('batch', parents=[common], help="Run operations from a JSON file")
+    batch.add_argument('file')
+    batch.add_argument('--stop-on-error', action='store_true')
+
+    for name, sub in subparsers.choices.items():
+        sub.set_defaults(handler=COMMANDS[name])
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a CLI command; returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        result = args.handler(args)
+    except COMMAND_ERRORS as e:
+        if args.json:
+            print(json.dumps({'command': args.command, 'ok': False, 'error': str(e)}))
+        else:
+            print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({'command': args.command, 'ok': True, 'result': result}, indent=2))
+    else:
+        _print_text(args.command, result)
+
+    failed = result.get('errors') or any(not op['ok'] for op in result.get('operations', []))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
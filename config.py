@@ -1,9 +1,19 @@
-"""Configuration management for the application."""
+"""Configuration management for the application.
 
+Settings live in one in-memory Config object that reads config.json once.
+set() only marks it dirty when a value actually changes, and dirty settings
+are written atomically SAVE_DELAY seconds after the last change, or by
+flush(), which also runs at exit. Keys this version doesn't know about are
+kept as they are.
+"""
+
+import atexit
+import copy
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 # Use standard Windows AppData\Local directory for config
@@ -12,25 +22,111 @@ APP_NAME = "QuarmQuickCharacterCopy"
 CONFIG_DIR = Path(os.getenv('LOCALAPPDATA', os.path.expanduser('~'))) / APP_NAME
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
-# Create config directory if it doesn't exist
-CONFIG_DIR.mkdir(exist_ok=True)
+# Seconds to wait after the last change before writing config.json
+SAVE_DELAY = 1.0
+
+
+class Config:
+    """Settings loaded once from a JSON file, with debounced atomic writes."""
+
+    def __init__(self, path: Path, save_delay: float = SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self._values: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Any]:
+        """Read the file on first use; a missing or invalid file gives empty settings."""
+        if self._values is None:
+            self._values = {}
+            try:
+                with open(self.path, 'r') as f:
+                    values = json.load(f)
+                if isinstance(values, dict):
+                    self._values = values
+            except (OSError, ValueError):
+                pass
+        return self._values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a copy of a setting, so callers can't change it behind set()'s back."""
+        with self._lock:
+            value = self._load().get(key, default)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> bool:
+        """Change a setting; returns True (and schedules a write) only if it changed."""
+        return self.update(**{key: value})
+
+    def update(self, **values) -> bool:
+        """Change several settings at once; returns True if any changed."""
+        with self._lock:
+            current = self._load()
+            changed = {key: value for key, value in values.items()
+                       if key not in current or current[key] != value}
+            if not changed:
+                return False
+            current.update(copy.deepcopy(changed))
+            self._dirty = True
+            self._schedule()
+        return True
+
+    def _schedule(self):
+        """(Re)start the debounce timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.save_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write pending changes now, atomically."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            tmp_path = self.path.with_suffix('.tmp')
+            try:
+                # Created on first write so importing this module touches no files
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._values, f, indent=2)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError:
+                # Keep the changes in memory; the next flush tries again
+                pass
+
+
+settings = Config(CONFIG_FILE)
+atexit.register(settings.flush)
 
 
 def load_saved_directory() -> Optional[str]:
     """Load saved directory from config file."""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                return config.get('quarm_directory')
-        except Exception:
-            pass
-    return None
+    return settings.get('quarm_directory')
 
 
 def save_directory(directory: str):
-    """Save directory to config file."""
-    config = {'quarm_directory': directory}
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    """Save directory to config file (only written if it changed)."""
+    settings.set('quarm_directory', directory)
+
+
+def load_profiles() -> Dict[str, str]:
+    """Load named install profiles (name -> Quarm directory)."""
+    return settings.get('profiles', {})
+
+
+def load_active_profiles() -> List[str]:
+    """Load the names of the profiles scanned together, in order."""
+    profiles = settings.get('profiles', {})
+    return [name for name in settings.get('active_profiles', []) if name in profiles]
+
 
+def save_profiles(profiles: Dict[str, str], active: List[str]):
+    """Save install profiles and which of them are active."""
+    settings.update(profiles=profiles, active_profiles=[name for name in active if name in profiles])
@@ -0,0 +1,243 @@
+"""Fast-path file copying: skip identical targets and link or clone new ones."""
+
+import hashlib
+import os
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from character_scanner import FileEntry
+
+
+# Copy modes: physical copy, hard link, or copy-on-write clone (reflink)
+COPY_MODES = ('copy', 'hardlink', 'reflink')
+DEFAULT_COPY_MODE = 'copy'
+
+# Outcomes reported per file
+SKIPPED = 'skipped'
+LINKED = 'linked'
+COPIED = 'copied'
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+# Chunk size used when hashing file contents
+HASH_BUFFER_SIZE = 256 * 1024
+
+# Source digests remembered so fan-out copies hash each source once
+DIGEST_CACHE_SIZE = 256
+
+# mtimes closer than this are treated as equal (copy2 preserves them exactly,
+# but some filesystems round to coarser units)
+MTIME_TOLERANCE = 0.001
+
+_digest_lock = threading.Lock()
+_digest_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+
+
+class CopyStats:
+    """Counts of skipped, linked and physically copied files."""
+
+    __slots__ = ('skipped', 'linked', 'copied')
+
+    def __init__(self):
+        self.skipped = 0
+        self.linked = 0
+        self.copied = 0
+
+    def add(self, outcome: str):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def merge(self, other: 'CopyStats'):
+        self.skipped += other.skipped
+        self.linked += other.linked
+        self.copied += other.copied
+
+    def summary(self) -> str:
+        return f"{self.copied} copied, {self.linked} linked, {self.skipped} unchanged"
+
+    def __repr__(self):
+        return f"CopyStats(skipped={self.skipped}, linked={self.linked}, copied={self.copied})"
+
+
+def file_digest(path: str, size: Optional[int] = None, mtime: Optional[float] = None) -> bytes:
+    """
+    Return the SHA-256 digest of a file.
+
+    When size and mtime are given the digest is cached under (path, size,
+    mtime), so a source copied to many targets is only read once.
+    """
+    key = (path, size, mtime) if size is not None and mtime is not None else None
+    if key is not None:
+        with _digest_lock:
+            digest = _digest_cache.get(key)
+            if digest is not None:
+                _digest_cache.move_to_end(key)
+                return digest
+
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_BUFFER_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    digest = hasher.digest()
+
+    if key is not None:
+        with _digest_lock:
+            _digest_cache[key] = digest
+            while len(_digest_cache) > DIGEST_CACHE_SIZE:
+                _digest_cache.popitem(last=False)
+    return digest
+
+
+def is_identical(source: FileEntry, target_path: str) -> bool:
+    """
+    Return True if target_path already holds the source's content.
+
+    Size is compared first, then mtime, and only when sizes match but mtimes
+    differ are both files hashed. The source is re-stat-ed rather than trusting
+    the (possibly cached) index entry, since the game rewrites files in place.
+    A matching target gets the source's mtime so the next check takes the
+    fast path.
+    """
+    try:
+        source_st = os.stat(source.path)
+        target_st = os.stat(target_path)
+    except OSError:
+        return False
+
+    if target_st.st_size != source_st.st_size:
+        return False
+    if abs(target_st.st_mtime - source_st.st_mtime) < MTIME_TOLERANCE:
+        return True
+
+    try:
+        if os.path.samestat(source_st, target_st):
+            return True
+        source_digest = file_digest(source.path, source_st.st_size, source_st.st_mtime)
+        if source_digest != file_digest(target_path):
+            return False
+        os.utime(target_path, (target_st.st_atime, source_st.st_mtime))
+    except OSError:
+        return False
+    return True
+
+
+def _temp_path_for(target_path: str) -> str:
+    """Return a unique temporary name in the target's directory."""
+    directory, name = os.path.split(target_path)
+    return os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+
+
+def _try_hardlink(source_path: str, target_path: str) -> bool:
+    """
+    Hard link source to a new target.
+
+    Returns False if the target already exists: linking over it would make
+    the target share the source's file, so later in-place writes to either
+    (by the game or an import) would change both.
+    """
+    try:
+        os.link(source_path, target_path)
+    except (OSError, AttributeError, NotImplementedError):
+        return False
+    return True
+
+
+def _try_reflink(source_path: str, target_path: str) -> bool:
+    """
+    Clone source to target with FICLONE, replacing any existing target.
+
+    Returns False where cloning is unsupported (non-Linux platforms, or
+    filesystems without reflink support).
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+
+    temp_path = _temp_path_for(target_path)
+    try:
+        with open(source_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source_path, temp_path)
+        os.replace(temp_path, target_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
+    return True
+
+
+def _copy_with_copy_file_range(source_path: str, target_path: str) -> bool:
+    """
+    Copy in-kernel with os.copy_file_range, which filesystems such as NFS
+    and btrfs may turn into a server-side copy or clone.
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    try:
+        with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+            while os.copy_file_range(src.fileno(), dst.fileno(), HASH_BUFFER_SIZE * 16):
+                pass
+        shutil.copystat(source_path, target_path)
+    except OSError:
+        return False
+    return True
+
+
+def _is_shared(path: str) -> bool:
+    """Return True if path exists and has other hard links."""
+    try:
+        return os.stat(path).st_nlink > 1
+    except OSError:
+        return False
+
+
+def _physical_copy(source_path: str, target_path: str, use_copy_file_range: bool):
+    """
+    Copy file data and metadata to target_path.
+
+    A target that is hard linked elsewhere (e.g. by an earlier 'hardlink'
+    copy) is replaced rather than overwritten in place, so the other links
+    keep their content.
+    """
+    dest = _temp_path_for(target_path) if _is_shared(target_path) else target_path
+    try:
+        if not (use_copy_file_range and _copy_with_copy_file_range(source_path, dest)):
+            shutil.copy2(source_path, dest)
+        if dest != target_path:
+            os.replace(dest, target_path)
+    except BaseException:
+        if dest != target_path and os.path.exists(dest):
+            os.unlink(dest)
+        raise
+
+
+def copy_file(source: FileEntry, target_path: str, mode: str = DEFAULT_COPY_MODE,
+              skip_identical: bool = False) -> str:
+    """
+    Copy one indexed file to target_path using the requested mode.
+
+    Returns SKIPPED if the target already matched (only with skip_identical),
+    LINKED if it was hard linked or reflink-cloned, or COPIED otherwise.
+    'hardlink' only links targets that don't exist yet; existing targets,
+    and platforms without links, get a physical copy. 'reflink' falls back
+    to a physical copy where cloning is unsupported.
+    """
+    if mode not in COPY_MODES:
+        raise ValueError(f"Unknown copy mode: {mode}")
+
+    if skip_identical and is_identical(source, target_path):
+        return SKIPPED
+
+    if mode == 'hardlink' and _try_hardlink(source.path, target_path):
+        return LINKED
+    if mode == 'reflink' and _try_reflink(source.path, target_path):
+        return LINKED
+
+    _physical_copy(source.path, target_path, use_copy_file_range=(mode == 'reflink'))
+    return COPIED
@@ -0,0 +1,206 @@
+"""Plan a copy once, then confirm and execute the same plan.
+
+plan_copy() makes one pass over the scan index and produces an immutable
+CopyPlan: for every file to write, the source entry, the destination, whether
+it creates or overwrites a file and the destination's indexed stat data. The
+confirmation dialog is built from plan.overwrites() and execute_plan() writes
+exactly those files, so the two can never disagree.
+
+A plan with section patterns merges only the matching INI sections/keys into
+each destination (see ini_engine) instead of replacing whole files.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import metrics
+from character_scanner import CharacterFiles, FileEntry, character_filename, selected_kinds
+from copy_engine import COPIED, DEFAULT_COPY_MODE, COPY_MODES, SKIPPED, CopyStats, copy_file
+from ini_engine import merge_sections
+from installs import Directory, qualify_like, resolve
+
+
+# Plan actions
+CREATE = 'create'
+OVERWRITE = 'overwrite'
+
+# Upper bound on concurrent copies in a fan-out operation
+MAX_COPY_WORKERS = 8
+
+
+class CopyAction(NamedTuple):
+    """One file a copy will write."""
+
+    target_char: str
+    kind: str
+    source: FileEntry
+    dest_path: str
+    # File name reported for the write, qualified like target_char
+    dest_name: str
+    action: str
+    # The destination as last indexed, or None when it is created
+    existing: Optional[FileEntry]
+
+
+class CopyPlan(NamedTuple):
+    """Every file a copy from one source will write, grouped by target in order."""
+
+    source_char: str
+    directory: Directory
+    mode: str
+    skip_identical: bool
+    actions: Tuple[CopyAction, ...]
+    # Section/key patterns to merge; empty copies whole files
+    sections: Tuple[str, ...] = ()
+
+    @property
+    def targets(self) -> List[str]:
+        """Targets with at least one file to write, in plan order."""
+        return list(dict.fromkeys(action.target_char for action in self.actions))
+
+    def by_target(self) -> Dict[str, List[CopyAction]]:
+        """Group the actions by target character."""
+        grouped: Dict[str, List[CopyAction]] = {}
+        for action in self.actions:
+            grouped.setdefault(action.target_char, []).append(action)
+        return grouped
+
+    def overwrites(self) -> Dict[str, List[str]]:
+        """File names each target will have overwritten, for targets that have any."""
+        overwrites: Dict[str, List[str]] = {}
+        for action in self.actions:
+            if action.action == OVERWRITE:
+                overwrites.setdefault(action.target_char, []).append(action.dest_name)
+        return overwrites
+
+
+def plan_copy(
+    source_char: str,
+    target_chars: List[str],
+    characters: Dict[str, CharacterFiles],
+    directory: Directory,
+    copy_ui: bool,
+    copy_config: bool,
+    copy_spellsets: bool,
+    mode: str = DEFAULT_COPY_MODE,
+    skip_identical: bool = False,
+    sections: Optional[List[str]] = None
+) -> CopyPlan:
+    """
+    Plan copying the source's selected files to each target.
+
+    Uses only the scan index, so planning touches no files. Kinds the source
+    lacks are left out. With sections, only those INI sections/keys are
+    merged into each destination and mode/skip_identical don't apply.
+    Raises ValueError for an unknown mode, or for a target that names no
+    install when directory is a mapping.
+    """
+    if mode not in COPY_MODES:
+        raise ValueError(f"Unknown copy mode: {mode}")
+
+    source_files = characters[source_char]
+    sources = [
+        (kind, source_files.get(kind))
+        for kind in selected_kinds(copy_ui, copy_config, copy_spellsets)
+        if source_files.get(kind) is not None
+    ]
+
+    actions = []
+    for target_char in target_chars:
+        target_dir, target_name = resolve(directory, target_char)
+        target_files = characters.get(target_char)
+        for kind, source in sources:
+            filename = character_filename(kind, target_name)
+            existing = target_files.get(kind) if target_files is not None else None
+            actions.append(CopyAction(
+                target_char, kind, source,
+                os.path.join(target_dir, filename),
+                qualify_like(target_char, filename),
+                CREATE if existing is None else OVERWRITE,
+                existing
+            ))
+    return CopyPlan(source_char, directory, mode, skip_identical, tuple(actions), tuple(sections or ()))
+
+
+def backup_plan(plan: CopyPlan):
+    """Save the files a plan will replace to the backup store in one snapshot."""
+    from backup_store import backup_files
+    # Every destination is offered, since the index may predate a file; missing ones are skipped
+    backup_files(plan.directory, [action.dest_name for action in plan.actions], f"copy from {plan.source_char}")
+
+
+def run_actions(plan: CopyPlan, actions: List[CopyAction], stats: Optional[CopyStats] = None) -> List[str]:
+    """
+    Write one target's planned files in order; raises on the first failure.
+
+    Returns the written file names, including ones skipped as identical.
+    """
+    written = []
+    target = actions[0].target_char if actions else None
+    with metrics.span('copy', source=plan.source_char, target=target, mode=plan.mode) as span:
+        for action in actions:
+            if plan.sections:
+                outcome = COPIED if merge_sections(action.source.path, action.dest_path, plan.sections) else SKIPPED
+            else:
+                outcome = copy_file(action.source, action.dest_path, plan.mode, plan.skip_identical)
+            if stats is not None:
+                stats.add(outcome)
+            span.add(files=1, bytes=action.source.size, **{outcome: 1})
+            written.append(action.dest_name)
+    return written
+
+
+def _run_target(plan: CopyPlan, actions: List[CopyAction]) -> Tuple[List[str], CopyStats]:
+    """Copy one target of a fan-out; returns (written files, stats)."""
+    stats = CopyStats()
+    return run_actions(plan, actions, stats), stats
+
+
+def execute_plan(
+    plan: CopyPlan,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_workers: int = MAX_COPY_WORKERS,
+    stats: Optional[CopyStats] = None,
+    backup: bool = True
+) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """
+    Execute a plan, copying to its targets concurrently.
+
+    The files about to be replaced are backed up first unless backup=False.
+    Targets run on a bounded thread pool; a failure for one does not stop
+    the others. progress, if given, is called with (completed, total) as
+    each target finishes, and stats aggregates every file's outcome.
+
+    Returns tuple of (written file names per target, error message per target).
+    """
+    copied: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+    grouped = plan.by_target()
+    total = len(grouped)
+    if not total:
+        return copied, errors
+
+    if backup:
+        backup_plan(plan)
+
+    with metrics.span('copy_batch', source=plan.source_char, targets=total, mode=plan.mode) as span, \
+            ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+        futures = {
+            executor.submit(_run_target, plan, actions): target
+            for target, actions in grouped.items()
+        }
+        for completed, future in enumerate(as_completed(futures), 1):
+            target = futures[future]
+            try:
+                copied[target], target_stats = future.result()
+                if stats is not None:
+                    stats.merge(target_stats)
+                span.add(files=len(copied[target]))
+            except Exception as e:
+                errors[target] = str(e)
+            if progress:
+                progress(completed, total)
+        span.set(errors=len(errors))
+
+    return copied, errors
@@ -0,0 +1,88 @@
+"""Content-deduplicated export archives.
+
+A dedup archive stores each distinct file body once under blobs/<sha256> and
+a manifest.json that maps character file names to blobs:
+
+    {
+        "format": "quarm-dedup",
+        "version": 1,
+        "files": {
+            "UI_Bob_pq.proj.ini": {"blob": "<sha256>", "size": 1234, "mtime": 1700000000.0}
+        }
+    }
+"""
+
+import hashlib
+import json
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+from character_scanner import FileEntry
+from parallel_zip import zip_date_time
+
+
+MANIFEST_NAME = "manifest.json"
+BLOB_PREFIX = "blobs/"
+DEDUP_FORMAT = "quarm-dedup"
+DEDUP_VERSION = 1
+
+
+def is_dedup_archive(zipf: zipfile.ZipFile) -> bool:
+    """Return True if an open archive uses the dedup layout."""
+    try:
+        zipf.getinfo(MANIFEST_NAME)
+    except KeyError:
+        return False
+    return True
+
+
+def read_manifest(zipf: zipfile.ZipFile) -> Dict[str, dict]:
+    """Read and validate the manifest of a dedup archive; returns its files map."""
+    with zipf.open(MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != DEDUP_FORMAT or manifest.get('version') != DEDUP_VERSION:
+        raise ValueError("Unsupported export archive format.")
+    return manifest['files']
+
+
+def write_dedup_zip(
+    zip_path: str,
+    members: List[Tuple[FileEntry, str]],
+    compress_type: int,
+    compresslevel: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+) -> int:
+    """
+    Write members to a dedup archive, storing identical bodies once.
+
+    Each file is read and hashed once; only the first file with a given hash
+    is compressed into the archive. Returns the number of unique blobs.
+    """
+    files: Dict[str, dict] = {}
+    total = len(members)
+
+    with zipfile.ZipFile(zip_path, 'w', compress_type, compresslevel=compresslevel) as zipf:
+        blobs = set()
+        for written, (entry, arcname) in enumerate(members, 1):
+            if cancel_check:
+                cancel_check()
+
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            if digest not in blobs:
+                info = zipfile.ZipInfo(BLOB_PREFIX + digest, date_time=zip_date_time(entry.mtime))
+                info.external_attr = 0o644 << 16
+                zipf.writestr(info, data, compress_type, compresslevel)
+                blobs.add(digest)
+
+            files[arcname] = {'blob': digest, 'size': len(data), 'mtime': entry.mtime}
+            if progress:
+                progress(written, total)
+
+        manifest = {'format': DEDUP_FORMAT, 'version': DEDUP_VERSION, 'files': files}
+        zipf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+    return len(blobs)
@@ -0,0 +1,149 @@
+"""Find characters whose files are byte-for-byte identical.
+
+Files of each kind are grouped by the size recorded in the scan index, and
+only sizes shared by two or more files are read at all. Candidates are first
+told apart by a hash of their opening block; only files that still collide
+are hashed in full. Hashing runs on a thread pool, since hashlib releases
+the GIL while it digests a buffer.
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+import metrics
+from character_scanner import FILE_KINDS, CharacterFiles, FileEntry
+from copy_engine import file_digest
+
+
+# Bytes hashed to split same-size candidates before reading whole files
+HEAD_BYTES = 4096
+
+# Upper bound on files hashed at once
+MAX_HASH_WORKERS = 8
+
+# Candidate groups: key -> [(character name, entry)]
+_Groups = Dict[tuple, List[Tuple[str, FileEntry]]]
+
+
+class DuplicateCluster(NamedTuple):
+    """Characters whose file of one kind has identical content."""
+
+    kind: str
+    size: int
+    # Hex SHA-256 of the shared content
+    digest: str
+    # Character names in index order
+    members: List[str]
+
+
+def _head_digest(path: str) -> Tuple[bool, bytes]:
+    """
+    Return (whole file read, SHA-256 digest) of a file's first HEAD_BYTES bytes.
+
+    One byte more is read to tell whether the head is the whole file, since
+    the size in the index may be older than the file.
+    """
+    with open(path, 'rb') as f:
+        data = f.read(HEAD_BYTES + 1)
+    return len(data) <= HEAD_BYTES, hashlib.sha256(data[:HEAD_BYTES]).digest()
+
+
+def _regroup(
+    groups: _Groups,
+    digest: Callable[[str], Hashable],
+    executor: ThreadPoolExecutor,
+    on_hashed: Callable[[], None],
+    cancel_check: Optional[Callable[[], None]]
+) -> _Groups:
+    """
+    Split each group by digest(path), dropping members left on their own.
+
+    Files that vanished or became unreadable since the scan are left out.
+    """
+    futures = {
+        executor.submit(digest, entry.path): (key, name, entry)
+        for key, members in groups.items()
+        for name, entry in members
+    }
+    split: _Groups = {}
+    try:
+        for future in as_completed(futures):
+            if cancel_check:
+                cancel_check()
+            key, name, entry = futures[future]
+            try:
+                split.setdefault(key + (future.result(),), []).append((name, entry))
+            except OSError:
+                pass
+            on_hashed()
+    except BaseException:
+        # Don't keep hashing files nobody will group
+        for future in futures:
+            future.cancel()
+        raise
+    return {key: members for key, members in split.items() if len(members) > 1}
+
+
+def find_duplicates(
+    characters: Dict[str, CharacterFiles],
+    kinds: Iterable[str] = FILE_KINDS,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None,
+    max_workers: int = MAX_HASH_WORKERS
+) -> List[DuplicateCluster]:
+    """
+    Group characters whose files of each kind have identical content.
+
+    Every file is stat-ed, but only files that share a size with another
+    file of their kind are read.
+    progress, if given, is called with (files hashed, files to hash); the
+    total grows once files that need a full hash are known. Returns
+    clusters of two or more characters, largest first.
+    """
+    kinds = list(kinds)
+    order = {name: position for position, name in enumerate(characters)}
+
+    # Sizes are re-stat-ed: a cached scan doesn't see files rewritten in place
+    by_size: _Groups = {}
+    for name, char_files in characters.items():
+        for kind in kinds:
+            entry = char_files.get(kind)
+            if entry is None:
+                continue
+            try:
+                entry = entry.restat()
+            except OSError:
+                continue
+            by_size.setdefault((kind, entry.size), []).append((name, entry))
+    candidates = {key: members for key, members in by_size.items() if len(members) > 1}
+
+    hashed = 0
+    total = sum(len(members) for members in candidates.values())
+
+    def on_hashed():
+        nonlocal hashed
+        hashed += 1
+        if progress:
+            progress(hashed, total)
+
+    with metrics.span('duplicates', characters=len(characters)) as span:
+        if not candidates:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            by_head = _regroup(candidates, _head_digest, executor, on_hashed, cancel_check)
+
+            # A head hash that reached the end of the file covers it whole
+            short = {key + (key[2][1],): members for key, members in by_head.items() if key[2][0]}
+            long = {key: members for key, members in by_head.items() if not key[2][0]}
+            total += sum(len(members) for members in long.values())
+            by_content = _regroup(long, file_digest, executor, on_hashed, cancel_check)
+            by_content.update(short)
+
+        clusters = [
+            DuplicateCluster(kind, size, content.hex(), sorted((name for name, _entry in members), key=order.get))
+            for (kind, size, _head, content), members in by_content.items()
+        ]
+        clusters.sort(key=lambda c: (-len(c.members), FILE_KINDS.index(c.kind), order[c.members[0]]))
+        span.set(candidates=total, clusters=len(clusters))
+    return clusters
@@ -1,105 +1,211 @@
 """File operations for copying and exporting character files."""
 
 import os
-import shutil
 import zipfile
-import tempfile
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
+import metrics
+from character_scanner import CharacterFiles, FileEntry, character_filename, selected_kinds
+from copy_engine import DEFAULT_COPY_MODE, CopyStats
+from copy_plan import MAX_COPY_WORKERS, backup_plan, execute_plan, plan_copy, run_actions
+from dedup_archive import write_dedup_zip
+from installs import Directory, split_qualified
+from parallel_zip import fits_without_zip64_offsets, write_parallel_zip, zip_date_time
+
+
+# Deflated exports with at least this many members compress them in parallel
+PARALLEL_EXPORT_MIN_MEMBERS = 32
+
 
 def copy_character_files(
     source_char: str,
     target_char: str,
-    characters: Dict[str, Dict[str, str]],
-    directory: str,
+    characters: Dict[str, CharacterFiles],
+    directory: Directory,
     copy_ui: bool,
     copy_config: bool,
-    copy_spellsets: bool
+    copy_spellsets: bool,
+    mode: str = DEFAULT_COPY_MODE,
+    skip_identical: bool = False,
+    stats: Optional[CopyStats] = None,
+    backup: bool = True
 ) -> List[str]:
     """
     Copy character files from source to target.
     
-    Returns list of copied file names.
+    Plans and runs the copy in one go (see copy_plan); callers that confirm
+    first should plan once and execute that plan instead.
+    directory may be an install -> directory mapping (see installs), in which
+    case target_char is qualified and the copy can cross installs.
+    mode and skip_identical select the copy_engine fast paths; if stats is
+    given, each file's outcome (skipped, linked or copied) is counted in it.
+    Existing target files are saved to the backup store first unless
+    backup=False.
+    Returns list of target file names, including ones skipped as identical.
     """
-    copied_files = []
-    
-    if copy_ui and characters[source_char]['ui']:
-        source_file = characters[source_char]['ui']
-        target_file = os.path.join(directory, f"UI_{target_char}_pq.proj.ini")
-        shutil.copy2(source_file, target_file)
-        copied_files.append(f"UI_{target_char}_pq.proj.ini")
-    
-    if copy_config and characters[source_char]['config']:
-        source_file = characters[source_char]['config']
-        target_file = os.path.join(directory, f"{target_char}_pq.proj.ini")
-        shutil.copy2(source_file, target_file)
-        copied_files.append(f"{target_char}_pq.proj.ini")
-    
-    if copy_spellsets and characters[source_char]['spellsets']:
-        source_file = characters[source_char]['spellsets']
-        target_file = os.path.join(directory, f"{target_char}_spellsets.ini")
-        shutil.copy2(source_file, target_file)
-        copied_files.append(f"{target_char}_spellsets.ini")
-    
-    return copied_files
+    plan = plan_copy(source_char, [target_char], characters, directory,
+                     copy_ui, copy_config, copy_spellsets, mode, skip_identical)
+    if backup:
+        backup_plan(plan)
+    return run_actions(plan, list(plan.actions), stats)
 
 
-def get_files_to_overwrite(
-    target_char: str,
-    directory: str,
+def copy_character_files_batch(
+    source_char: str,
+    target_chars: List[str],
+    characters: Dict[str, CharacterFiles],
+    directory: Directory,
     copy_ui: bool,
     copy_config: bool,
-    copy_spellsets: bool
-) -> List[str]:
-    """Get list of files that will be overwritten."""
-    files_to_overwrite = []
+    copy_spellsets: bool,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_workers: int = MAX_COPY_WORKERS,
+    mode: str = DEFAULT_COPY_MODE,
+    skip_identical: bool = False,
+    stats: Optional[CopyStats] = None
+) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """
+    Copy character files from one source to many targets concurrently.
     
-    if copy_ui and os.path.exists(os.path.join(directory, f"UI_{target_char}_pq.proj.ini")):
-        files_to_overwrite.append(f"UI_{target_char}_pq.proj.ini")
-    if copy_config and os.path.exists(os.path.join(directory, f"{target_char}_pq.proj.ini")):
-        files_to_overwrite.append(f"{target_char}_pq.proj.ini")
-    if copy_spellsets and os.path.exists(os.path.join(directory, f"{target_char}_spellsets.ini")):
-        files_to_overwrite.append(f"{target_char}_spellsets.ini")
+    Shorthand for copy_plan.plan_copy followed by execute_plan; see those for
+    progress, stats and backups.
     
-    return files_to_overwrite
+    Returns tuple of (copied file names per target, error message per target).
+    """
+    plan = plan_copy(source_char, target_chars, characters, directory,
+                     copy_ui, copy_config, copy_spellsets, mode, skip_identical)
+    return execute_plan(plan, progress, max_workers, stats)
 
 
-def create_export_zip(
+# Export compression choices: name -> (zipfile compression, compresslevel)
+COMPRESSION_LEVELS = {
+    'stored': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'normal': (zipfile.ZIP_DEFLATED, 6),
+    'max': (zipfile.ZIP_DEFLATED, 9),
+}
+DEFAULT_COMPRESSION = 'normal'
+
+
+def default_export_filename() -> str:
+    """Return a timestamped default file name for an export archive."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"quarm_characters_export_{timestamp}.zip"
+
+
+def _zip_info_for(entry: FileEntry, arcname: str) -> zipfile.ZipInfo:
+    """Build a ZipInfo from scan data instead of stat-ing the file again."""
+    info = zipfile.ZipInfo(arcname, date_time=zip_date_time(entry.mtime))
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _write_zip_member(zipf: zipfile.ZipFile, entry: FileEntry, arcname: str):
+    """Write one indexed file into an open archive at the archive's compression."""
+    with open(entry.path, 'rb') as src:
+        data = src.read()
+    zipf.writestr(_zip_info_for(entry, arcname), data, zipf.compression, zipf.compresslevel)
+
+
+def get_export_members(
     selected_chars: List[str],
-    characters: Dict[str, Dict[str, str]],
+    characters: Dict[str, CharacterFiles],
     export_ui: bool,
     export_config: bool,
     export_spellsets: bool
-) -> Tuple[str, str]:
+) -> List[Tuple[FileEntry, str]]:
+    """
+    Return (file entry, archive name) pairs for an export, in archive order.
+    
+    Characters from a multi-install index go into one folder per install.
+    Entries are re-stat-ed, so archive sizes and timestamps match the files
+    even where the index predates an in-place rewrite.
+    """
+    kinds = selected_kinds(export_ui, export_config, export_spellsets)
+    members = []
+    for char_name in selected_chars:
+        if char_name not in characters:
+            continue
+        
+        char_files = characters[char_name]
+        install, bare_name = split_qualified(char_name)
+        
+        # Save files flat at root of zip (no character folders)
+        for kind in kinds:
+            entry = char_files.get(kind)
+            if entry is not None:
+                filename = character_filename(kind, bare_name)
+                members.append((entry.restat(), filename if install is None else f"{install}/{filename}"))
+    return members
+
+
+def create_export_zip(
+    zip_path: str,
+    selected_chars: List[str],
+    characters: Dict[str, CharacterFiles],
+    export_ui: bool,
+    export_config: bool,
+    export_spellsets: bool,
+    compression: str = DEFAULT_COMPRESSION,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None,
+    max_workers: Optional[int] = None,
+    dedup: bool = False
+) -> int:
     """
-    Create a ZIP file with exported character files.
+    Write a ZIP file with exported character files to zip_path.
+    
+    The archive is streamed to a '.part' file next to zip_path and renamed
+    into place when complete, so it never passes through the temp directory
+    and a failed or cancelled export leaves no partial archive behind.
+    compression is one of COMPRESSION_LEVELS. progress, if given, is called
+    with (written, total) after each member; cancel_check may raise to abort.
     
-    Returns tuple of (zip_path, filename).
+    Large deflated exports are compressed on a thread pool by
+    parallel_zip.write_parallel_zip; pass max_workers=1 to force the serial
+    zipfile writer. dedup=True writes the dedup_archive layout instead, storing
+    identical files once behind a manifest.
+    
+    Returns the number of files written.
     """
-    # Create temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_file:
-        zip_path = tmp_file.name
+    compress_type, compresslevel = COMPRESSION_LEVELS[compression]
+    members = get_export_members(selected_chars, characters, export_ui, export_config, export_spellsets)
+    total = len(members)
+    part_path = zip_path + '.part'
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"quarm_characters_export_{timestamp}.zip"
+    use_parallel = (
+        not dedup
+        and compress_type == zipfile.ZIP_DEFLATED
+        and max_workers != 1
+        and total >= PARALLEL_EXPORT_MIN_MEMBERS
+        and fits_without_zip64_offsets(members)
+    )
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for char_name in selected_chars:
-            if char_name not in characters:
-                continue
-            
-            char_info = characters[char_name]
-            
-            # Save files flat at root of zip (no character folders)
-            if export_ui and char_info['ui']:
-                zipf.write(char_info['ui'], f"UI_{char_name}_pq.proj.ini")
-            
-            if export_config and char_info['config']:
-                zipf.write(char_info['config'], f"{char_name}_pq.proj.ini")
-            
-            if export_spellsets and char_info['spellsets']:
-                zipf.write(char_info['spellsets'], f"{char_name}_spellsets.ini")
+    engine = 'dedup' if dedup else 'parallel' if use_parallel else 'serial'
     
-    return zip_path, filename
-
+    with metrics.span('export', members=total, compression=compression, engine=engine) as span:
+        try:
+            with span.phase('write'):
+                if dedup:
+                    write_dedup_zip(part_path, members, compress_type, compresslevel, progress, cancel_check)
+                elif use_parallel:
+                    write_parallel_zip(part_path, members, compresslevel, max_workers, progress, cancel_check)
+                else:
+                    with zipfile.ZipFile(part_path, 'w', compress_type, compresslevel=compresslevel) as zipf:
+                        for written, (entry, arcname) in enumerate(members, 1):
+                            if cancel_check:
+                                cancel_check()
+                            _write_zip_member(zipf, entry, arcname)
+                            if progress:
+                                progress(written, total)
+            if span:
+                span.set(bytes_in=sum(entry.size for entry, _arcname in members),
+                         bytes_out=os.path.getsize(part_path))
+            os.replace(part_path, zip_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+            raise
+    
+    return total
@@ -0,0 +1,177 @@
+"""Import character files from export archives."""
+
+import os
+import shutil
+import time
+import zipfile
+from typing import Callable, Dict, List, Optional
+
+from backup_store import snapshot
+from character_scanner import CharacterFiles, character_filename, classify_filename
+from dedup_archive import BLOB_PREFIX, is_dedup_archive, read_manifest
+
+
+# Chunk size used when streaming members out of an archive
+EXTRACT_BUFFER_SIZE = 64 * 1024
+
+# Characters that would let a renamed file escape the Quarm directory
+INVALID_NAME_CHARS = set('/\\:')
+
+
+class ImportEntry:
+    """One character file in an archive and where it will be written."""
+
+    __slots__ = ('member', 'source_name', 'char_name', 'kind', 'target_name', 'size', 'mtime', 'conflict',
+                 'duplicates')
+
+    def __init__(self, member: str, source_name: str, char_name: str, kind: str,
+                 size: int, mtime: float, conflict: bool):
+        self.member = member
+        self.source_name = source_name
+        self.char_name = char_name
+        self.kind = kind
+        self.target_name = character_filename(kind, char_name)
+        self.size = size
+        self.mtime = mtime
+        self.conflict = conflict
+        # Later archive members (e.g. from another install's folder) that
+        # would write the same file and are left out
+        self.duplicates: List[str] = []
+
+    def __repr__(self):
+        return f"ImportEntry({self.source_name!r} -> {self.target_name!r}, conflict={self.conflict})"
+
+
+def parse_rename_mapping(text: str) -> Dict[str, str]:
+    """
+    Parse rename lines such as "Bob=Robert" or "Bob -> Robert".
+
+    The old name may be prefixed with an archive folder, e.g. "test/Bob=Robert",
+    to rename only the copy of Bob in that folder. Blank lines are ignored.
+    Raises ValueError for malformed lines.
+    """
+    mapping = {}
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        separator = '->' if '->' in line else '='
+        old, sep, new = line.partition(separator)
+        old, new = old.strip(), new.strip()
+        if not sep or not old or not new:
+            raise ValueError(f"Line {line_number}: expected 'OldName=NewName', got '{line}'")
+        if INVALID_NAME_CHARS & set(new) or new in ('.', '..'):
+            raise ValueError(f"Line {line_number}: '{new}' is not a valid character name")
+        mapping[old] = new
+    return mapping
+
+
+def _zip_mtime(info: zipfile.ZipInfo) -> float:
+    """Convert a ZipInfo date_time to a local timestamp."""
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def plan_import(
+    zip_path: str,
+    characters: Dict[str, CharacterFiles],
+    rename_map: Optional[Dict[str, str]] = None
+) -> List[ImportEntry]:
+    """
+    Read an archive's directory and plan where each character file goes.
+
+    Plain exports and dedup archives are both supported. Entries are
+    classified with the scanner's naming rules, renamed through rename_map
+    and checked for conflicts against the scan index in a single pass. No
+    file data is read. Members inside folders (one per install in a
+    multi-install export) are matched by base name. If a target name
+    appears more than once, the first is kept and the others are listed in
+    its duplicates; renaming with a folder prefix ("test/Bob=BobTest")
+    imports them as well.
+    """
+    rename_map = rename_map or {}
+    plan: List[ImportEntry] = []
+    by_target: Dict[str, ImportEntry] = {}
+
+    with zipfile.ZipFile(zip_path) as zipf:
+        if is_dedup_archive(zipf):
+            candidates = [
+                (BLOB_PREFIX + record['blob'], name, record['size'], record['mtime'])
+                for name, record in read_manifest(zipf).items()
+            ]
+        else:
+            candidates = [
+                (info.filename, info.filename, info.file_size, _zip_mtime(info))
+                for info in zipf.infolist()
+                if not info.is_dir()
+            ]
+
+    for member, archive_name, size, mtime in candidates:
+        folder, _sep, source_name = archive_name.replace('\\', '/').rpartition('/')
+        classified = classify_filename(source_name)
+        if classified is None:
+            continue
+        char_name, kind = classified
+        char_name = rename_map.get(f"{folder}/{char_name}", rename_map.get(char_name, char_name))
+        if INVALID_NAME_CHARS & set(char_name):
+            continue
+
+        target_name = character_filename(kind, char_name)
+        if target_name in by_target:
+            by_target[target_name].duplicates.append(archive_name)
+            continue
+
+        existing = characters.get(char_name)
+        conflict = existing is not None and existing.get(kind) is not None
+        entry = by_target[target_name] = ImportEntry(member, source_name, char_name, kind, size, mtime, conflict)
+        plan.append(entry)
+
+    return plan
+
+
+def mark_conflicts(entries: List[ImportEntry], characters: Dict[str, CharacterFiles]):
+    """Recompute conflict flags of planned entries against a newer scan index."""
+    for entry in entries:
+        existing = characters.get(entry.char_name)
+        entry.conflict = existing is not None and existing.get(entry.kind) is not None
+
+
+def apply_import(
+    zip_path: str,
+    entries: List[ImportEntry],
+    directory: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+) -> List[str]:
+    """
+    Write planned entries into directory, streaming each member from the archive.
+
+    Each file is written beside its target and renamed into place, so an
+    existing file hard linked to other characters is replaced rather than
+    rewritten under them. File modification times are restored from the
+    archive, and existing files are saved to the backup store first. Returns the list of written
+    file names.
+    """
+    written = []
+    total = len(entries)
+    snapshot(directory, [entry.target_name for entry in entries], f"import {os.path.basename(zip_path)}")
+
+    with zipfile.ZipFile(zip_path) as zipf:
+        for count, entry in enumerate(entries, 1):
+            if cancel_check:
+                cancel_check()
+            target = os.path.join(directory, entry.target_name)
+            tmp_path = f"{target}.{os.urandom(4).hex()}.tmp"
+            try:
+                with zipf.open(entry.member) as src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
+                os.utime(tmp_path, (entry.mtime, entry.mtime))
+                os.replace(tmp_path, target)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            written.append(entry.target_name)
+            if progress:
+                progress(count, total)
+
+    return written
@@ -0,0 +1,167 @@
+"""Section-by-section, key-by-key comparison of character INI files.
+
+Differences are described from the target's point of view: what copying the
+source over it would change. Files are parsed through ini_engine.load(), so
+a file already parsed for a merge or an earlier diff costs one stat. Values
+are compared after stripping whitespace; comments, blank lines and key
+order are ignored.
+"""
+
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ini_engine import IniFile, IniSection, load, select
+
+
+# Section statuses
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# Keys that only place or size a window (lower case, shell-style patterns)
+LAYOUT_KEY_PATTERNS = ('*pos', 'x', 'y', '*width', '*height')
+
+# Sections holding hotbars and hot buttons (lower case, shell-style patterns)
+HOTBAR_SECTION_PATTERNS = ('hotbutton*', '*hotbar*', 'hotkey*')
+
+# Summary categories in display order: category -> (singular, plural)
+CATEGORY_LABELS = {
+    'moved': ("window moved", "windows moved"),
+    'hotbars': ("hotbar changed", "hotbars changed"),
+    'added': ("section added", "sections added"),
+    'removed': ("section removed", "sections removed"),
+    'changed': ("other section changed", "other sections changed"),
+}
+
+
+class KeyChange(NamedTuple):
+    """One key whose value a copy would change."""
+
+    key: str
+    # The target's current value, or None if the key is added
+    old: Optional[str]
+    # The source's value, or None if the key is removed
+    new: Optional[str]
+
+
+class SectionDiff(NamedTuple):
+    """How one section of a target file would change."""
+
+    filename: str
+    section: str
+    status: str
+    changes: List[KeyChange]
+
+
+def _section_values(ini: IniFile, section: IniSection) -> Dict[str, Tuple[str, str]]:
+    """Return lower-case key -> (key as written, stripped value) for a section."""
+    values = {}
+    for lower, index in section.keys.items():
+        key, _sep, value = ini.lines[index].partition('=')
+        values[lower] = (key.strip(), value.strip())
+    return values
+
+
+def diff_inis(source: IniFile, target: IniFile, patterns: Optional[Iterable[str]] = None,
+              filename: str = '') -> Iterator[SectionDiff]:
+    """
+    Yield the differences copying source over target would make, one section at a time.
+
+    With patterns, only the selected sections/keys are compared, and
+    sections only the target has are kept (as a section merge does).
+    Sections come in the target's order, then those only the source has.
+    """
+    selection = select(source, patterns) if patterns else None
+
+    for lower, target_section in target.sections.items():
+        source_section = source.sections.get(lower)
+        if source_section is None:
+            if selection is None:
+                values = _section_values(target, target_section)
+                yield SectionDiff(filename, target_section.name, REMOVED,
+                                  [KeyChange(key, value, None) for key, value in values.values()])
+            continue
+        if selection is not None and lower not in selection:
+            continue
+
+        old = _section_values(target, target_section)
+        new = _section_values(source, source_section)
+        keys = selection.get(lower) if selection is not None else None
+        changes = []
+        for key in (new if keys is None else [key for key in new if key in keys]):
+            name, value = new[key]
+            if key not in old:
+                changes.append(KeyChange(name, None, value))
+            elif old[key][1] != value:
+                changes.append(KeyChange(name, old[key][1], value))
+        if keys is None:
+            changes.extend(KeyChange(name, value, None) for key, (name, value) in old.items() if key not in new)
+        if changes:
+            yield SectionDiff(filename, target_section.name, CHANGED, changes)
+
+    for lower, source_section in source.sections.items():
+        if lower in target.sections or (selection is not None and lower not in selection):
+            continue
+        keys = selection.get(lower) if selection is not None else None
+        values = _section_values(source, source_section)
+        yield SectionDiff(filename, source_section.name, ADDED, [
+            KeyChange(name, None, value) for key, (name, value) in values.items() if keys is None or key in keys
+        ])
+
+
+def diff_files(source_path: str, target_path: str, patterns: Optional[Iterable[str]] = None,
+               filename: str = '') -> Iterator[SectionDiff]:
+    """Yield the section differences between two files; a missing target has every section added."""
+    source = load(source_path)
+    try:
+        target = load(target_path)
+    except FileNotFoundError:
+        target = IniFile(target_path, '')
+    yield from diff_inis(source, target, patterns, filename)
+
+
+def _is_layout_key(key: str) -> bool:
+    lower = key.lower()
+    return any(fnmatchcase(lower, pattern) for pattern in LAYOUT_KEY_PATTERNS)
+
+
+def category(diff: SectionDiff) -> str:
+    """Return the CATEGORY_LABELS key a section difference is counted under."""
+    lower = diff.section.lower()
+    if any(fnmatchcase(lower, pattern) for pattern in HOTBAR_SECTION_PATTERNS):
+        return 'hotbars'
+    if diff.status != CHANGED:
+        return diff.status
+    if all(change.old is not None and change.new is not None and _is_layout_key(change.key)
+           for change in diff.changes):
+        return 'moved'
+    return 'changed'
+
+
+def describe_counts(counts: Dict[str, int]) -> str:
+    """Describe category counts, e.g. "12 windows moved, 3 hotbars changed"."""
+    parts = []
+    for name, (singular, plural) in CATEGORY_LABELS.items():
+        count = counts.get(name, 0)
+        if count:
+            parts.append(f"{count} {singular if count == 1 else plural}")
+    return ", ".join(parts) if parts else "no changes"
+
+
+def summarize(diffs: Iterable[SectionDiff]) -> str:
+    """Describe a set of differences by category."""
+    return describe_counts(Counter(category(diff) for diff in diffs))
+
+
+def format_diff(diff: SectionDiff) -> List[str]:
+    """Render one section difference as text lines."""
+    lines = [f"[{diff.section}] {diff.status}"]
+    for change in diff.changes:
+        if change.old is None:
+            lines.append(f"  + {change.key}={change.new}")
+        elif change.new is None:
+            lines.append(f"  - {change.key}={change.old}")
+        else:
+            lines.append(f"  ~ {change.key}: {change.old} -> {change.new}")
+    return lines
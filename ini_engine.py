@@ -0,0 +1,273 @@
+"""Parsed INI files, cached, with section- and key-level merging.
+
+Character INIs are parsed into a flat list of lines plus an index of where
+each section and key is, so untouched parts of a file are written back
+exactly as they were. Parsed files are cached by (path, size, mtime_ns) and
+shared; never modify an IniFile returned by load().
+
+Section and key names compare case-insensitively, like the game's own INI
+reader. A selection pattern is "Section" for a whole section or
+"Section/Key" for single keys; both parts may use shell-style wildcards,
+e.g. "HotButton*" or "Main/*Width".
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# Parsed files kept in memory, least recently used evicted first
+MAX_CACHED_FILES = 128
+
+# INIs are ANSI text; latin-1 round-trips every byte unchanged
+ENCODING = 'latin-1'
+
+# Lines written per writelines() call when streaming a merge to disk
+WRITE_BATCH_LINES = 256
+
+_lock = threading.Lock()
+_cache: 'OrderedDict[Tuple[str, int, int], IniFile]' = OrderedDict()
+
+
+class IniSection:
+    """Where one section sits in its file's lines, and where its keys are."""
+
+    __slots__ = ('name', 'start', 'end', 'keys')
+
+    def __init__(self, name: str, start: int):
+        self.name = name
+        # Index of the header line, and one past the section's last line
+        self.start = start
+        self.end = start + 1
+        # Lower-case key -> index of the line that sets it (the last one wins)
+        self.keys: Dict[str, int] = {}
+
+    def __repr__(self):
+        return f"IniSection({self.name!r}, lines {self.start}-{self.end}, {len(self.keys)} keys)"
+
+
+class IniFile:
+    """A parsed INI file; sections are keyed by lower-case name in file order."""
+
+    __slots__ = ('path', 'lines', 'newline', 'preamble_end', 'sections', 'duplicates')
+
+    def __init__(self, path: str, text: str):
+        self.path = path
+        self.newline = '\r\n' if '\r\n' in text else '\n'
+        self.lines = text.splitlines()
+        self.sections: Dict[str, IniSection] = {}
+        # Repeated sections keep their lines but aren't merged into
+        self.duplicates: List[IniSection] = []
+
+        current: Optional[IniSection] = None
+        self.preamble_end = len(self.lines)
+        for index, line in enumerate(self.lines):
+            stripped = line.strip()
+            if stripped.startswith('[') and ']' in stripped:
+                current = IniSection(stripped[1:stripped.index(']')].strip(), index)
+                if self.preamble_end == len(self.lines):
+                    self.preamble_end = index
+                lower = current.name.lower()
+                if lower in self.sections:
+                    self.duplicates.append(current)
+                else:
+                    self.sections[lower] = current
+                continue
+            if current is None:
+                continue
+            current.end = index + 1
+            key = line_key(line)
+            if key is not None:
+                current.keys[key] = index
+
+    def section(self, name: str) -> Optional[IniSection]:
+        return self.sections.get(name.lower())
+
+    def value(self, section: IniSection, key: str) -> Optional[str]:
+        """Return the value a section sets for key, or None."""
+        index = section.keys.get(key.lower())
+        if index is None:
+            return None
+        return self.lines[index].split('=', 1)[1].strip()
+
+    def __repr__(self):
+        return f"IniFile({self.path!r}, {len(self.sections)} sections, {len(self.lines)} lines)"
+
+
+def line_key(line: str) -> Optional[str]:
+    """Return the lower-case key a line sets, or None for blanks and comments."""
+    stripped = line.lstrip()
+    if not stripped or stripped[0] in ';#' or '=' not in stripped:
+        return None
+    return stripped.split('=', 1)[0].strip().lower()
+
+
+def load(path: str) -> IniFile:
+    """
+    Return the parsed file at path, from the cache when it hasn't changed.
+
+    Costs one stat on a cache hit. Raises OSError if the file can't be read.
+    """
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    with _lock:
+        ini = _cache.get(key)
+        if ini is not None:
+            _cache.move_to_end(key)
+            return ini
+
+    with open(path, 'r', encoding=ENCODING, newline='') as f:
+        ini = IniFile(path, f.read())
+
+    with _lock:
+        _cache[key] = ini
+        while len(_cache) > MAX_CACHED_FILES:
+            _cache.popitem(last=False)
+    return ini
+
+
+def clear_cache():
+    """Forget every parsed file."""
+    with _lock:
+        _cache.clear()
+
+
+def parse_patterns(text: str) -> List[str]:
+    """Split comma- or line-separated selection patterns, dropping blanks."""
+    return [part.strip() for part in text.replace('\n', ',').split(',') if part.strip()]
+
+
+def select(ini: IniFile, patterns: Iterable[str]) -> Dict[str, Optional[Set[str]]]:
+    """
+    Match patterns against a file's sections and keys.
+
+    Returns lower-case section name -> None for whole sections, or the set of
+    lower-case keys chosen in that section. A whole-section match wins over
+    key matches in the same section.
+    """
+    selection: Dict[str, Optional[Set[str]]] = {}
+    for pattern in patterns:
+        section_pattern, sep, key_pattern = pattern.lower().partition('/')
+        section_pattern = section_pattern.strip()
+        key_pattern = key_pattern.strip()
+        for lower, section in ini.sections.items():
+            if not fnmatchcase(lower, section_pattern):
+                continue
+            if not sep:
+                selection[lower] = None
+                continue
+            keys = {key for key in section.keys if fnmatchcase(key, key_pattern)}
+            if keys and selection.get(lower, set()) is not None:
+                selection.setdefault(lower, set()).update(keys)
+    return selection
+
+
+def _section_body(ini: IniFile, section: IniSection) -> Tuple[int, int]:
+    """Return the (start, end) of a section's lines after the header, minus trailing blanks."""
+    end = section.end
+    while end > section.start + 1 and not ini.lines[end - 1].strip():
+        end -= 1
+    return section.start + 1, end
+
+
+def _merged_lines(source: IniFile, target: IniFile,
+                  selection: Dict[str, Optional[Set[str]]]) -> Iterator[str]:
+    """Yield the target's lines with the selected parts of the source merged in."""
+    lines = target.lines
+    yield from lines[:target.preamble_end]
+
+    ordered = sorted(list(target.sections.values()) + target.duplicates, key=lambda s: s.start)
+    for section in ordered:
+        lower = section.name.lower()
+        source_section = source.sections.get(lower)
+        if lower not in selection or target.sections[lower] is not section or source_section is None:
+            yield from lines[section.start:section.end]
+            continue
+
+        keys = selection[lower]
+        body_start, body_end = _section_body(target, section)
+        if keys is None:
+            # Whole section: the source's lines under the target's header
+            start, end = _section_body(source, source_section)
+            yield lines[section.start]
+            yield from source.lines[start:end]
+        else:
+            yield from lines[section.start:body_start]
+            written = set()
+            for index in range(body_start, body_end):
+                key = line_key(lines[index])
+                if key in keys and key in source_section.keys:
+                    if key not in written:
+                        written.add(key)
+                        yield source.lines[source_section.keys[key]]
+                    # Repeats of a replaced key are dropped so the new value wins
+                    continue
+                yield lines[index]
+            for key in sorted(keys - written):
+                if key in source_section.keys:
+                    yield source.lines[source_section.keys[key]]
+        yield from lines[body_end:section.end]
+
+    # Selected sections the target doesn't have yet go at the end
+    for lower, keys in selection.items():
+        if lower in target.sections:
+            continue
+        source_section = source.sections[lower]
+        yield source.lines[source_section.start]
+        if keys is None:
+            start, end = _section_body(source, source_section)
+            yield from source.lines[start:end]
+        else:
+            for key in sorted(keys):
+                yield source.lines[source_section.keys[key]]
+
+
+def merge_sections(source_path: str, target_path: str, patterns: Iterable[str]) -> bool:
+    """
+    Merge the source's sections/keys matching patterns into target_path.
+
+    Everything else in the target is left as it was; a missing target is
+    created with just the selected parts. The result is streamed to a
+    temporary file and renamed into place, and only if it differs from the
+    target. Returns True if the target was written.
+    """
+    source = load(source_path)
+    selection = select(source, patterns)
+    if not selection:
+        return False
+    try:
+        target = load(target_path)
+        exists = True
+    except FileNotFoundError:
+        target = IniFile(target_path, '')
+        target.newline = source.newline
+        exists = False
+
+    original = target.lines
+    changed = not exists
+    count = 0
+    tmp_path = f"{target_path}.{os.urandom(4).hex()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding=ENCODING, newline='') as f:
+            batch = []
+            for line in _merged_lines(source, target, selection):
+                if not changed and (count >= len(original) or original[count] != line):
+                    changed = True
+                count += 1
+                batch.append(line + target.newline)
+                if len(batch) >= WRITE_BATCH_LINES:
+                    f.writelines(batch)
+                    batch.clear()
+            f.writelines(batch)
+        changed = changed or count != len(original)
+        if changed:
+            os.replace(tmp_path, target_path)
+        else:
+            os.unlink(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return changed
@@ -0,0 +1,177 @@
+"""Several Project Quarm installs scanned and used as one character index.
+
+Characters from a multi-install scan are keyed "install:Name" (':' cannot
+appear in a Windows file name, so the split is unambiguous). File operations
+accept either a single directory or an install -> directory mapping; with a
+mapping, target names must be qualified and written file names come back
+qualified the same way, e.g. "test:UI_Bob_pq.proj.ini".
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from character_scanner import CharacterFiles, classify_filename
+from scan_cache import directory_stamp, load_character_index, update_files
+
+
+INSTALL_SEPARATOR = ':'
+
+# A single Quarm directory, or install name -> directory
+Directory = Union[str, Dict[str, str]]
+
+# Upper bound on installs scanned at once
+MAX_SCAN_WORKERS = 8
+
+
+class IndexChanges(NamedTuple):
+    """Characters an in-place index update added, changed or removed."""
+
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+
+
+def qualify(install: str, name: str) -> str:
+    """Return name tagged with its install."""
+    return f"{install}{INSTALL_SEPARATOR}{name}"
+
+
+def split_qualified(name: str) -> Tuple[Optional[str], str]:
+    """Split "install:Name" into (install, Name); unqualified names give (None, name)."""
+    install, sep, bare = name.partition(INSTALL_SEPARATOR)
+    if not sep:
+        return None, name
+    return install, bare
+
+
+def resolve(directory: Directory, name: str) -> Tuple[str, str]:
+    """
+    Return (directory, bare name) for a possibly qualified character name.
+
+    Raises ValueError if directory is a mapping and name names no known install.
+    """
+    if isinstance(directory, str):
+        return directory, name
+    install, bare = split_qualified(name)
+    if install is None or install not in directory:
+        raise ValueError(f"'{name}' must be qualified with one of: {', '.join(directory)}")
+    return directory[install], bare
+
+
+def qualify_like(name: str, filename: str) -> str:
+    """Tag filename with the install of a (possibly qualified) character name."""
+    install, _bare = split_qualified(name)
+    return filename if install is None else qualify(install, filename)
+
+
+def merge_indexes(indexes: Dict[str, Dict[str, CharacterFiles]]) -> Dict[str, CharacterFiles]:
+    """Merge per-install indexes into one index keyed by qualified name."""
+    merged = {
+        qualify(install, name): files
+        for install, index in indexes.items()
+        for name, files in index.items()
+    }
+    return {name: merged[name] for name in sorted(merged)}
+
+
+def scan_installs(
+    directories: Dict[str, str],
+    force: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+) -> Dict[str, CharacterFiles]:
+    """
+    Scan every install concurrently and return the merged, tagged index.
+
+    Each install goes through the scan cache, so unchanged installs cost one
+    stat. progress, if given, is called with (installs done, total).
+    """
+    total = len(directories)
+    if not total:
+        return {}
+
+    indexes = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, total)) as executor:
+        futures = {
+            install: executor.submit(load_character_index, directory, force, None, cancel_check)
+            for install, directory in directories.items()
+        }
+        for done, (install, future) in enumerate(futures.items(), 1):
+            indexes[install] = future.result()
+            if progress:
+                progress(done, total)
+    return merge_indexes(indexes)
+
+
+# directory_stamp() per install (None for a single directory)
+DirectoryStamps = Dict[Optional[str], Optional[Tuple[int, int]]]
+
+
+def directory_stamps(directory: Directory) -> DirectoryStamps:
+    """Stamp every directory just before writing, for apply_written_files()."""
+    if isinstance(directory, str):
+        return {None: directory_stamp(directory)}
+    return {install: directory_stamp(path) for install, path in directory.items()}
+
+
+def apply_written_files(
+    characters: Dict[str, CharacterFiles],
+    directory: Directory,
+    written: Iterable[str],
+    before: Optional[DirectoryStamps] = None
+) -> IndexChanges:
+    """
+    Re-stat written files and update the index and scan cache in place.
+
+    written holds file names, qualified when directory is a mapping. Costs
+    one stat per file however many characters are indexed; characters seen
+    for the first time are appended to the index. before, the
+    directory_stamps() taken before writing, lets the scan cache keep its
+    listing (see scan_cache.update_files); without it, as for files another
+    program wrote, the next scan re-lists. Returns which characters were
+    added, changed or removed (all of their files gone), so views can update
+    just those.
+    """
+    if isinstance(directory, str):
+        groups = {None: (directory, list(written))}
+    else:
+        groups = {install: (path, []) for install, path in directory.items()}
+        for name in written:
+            install, filename = split_qualified(name)
+            if install in groups:
+                groups[install][1].append(filename)
+
+    # Whether each touched character was indexed before the update, in touch order
+    existed: Dict[str, bool] = {}
+    for install, (path, filenames) in groups.items():
+        if not filenames:
+            continue
+        stamp = before.get(install) if before is not None else None
+        for filename, entry in update_files(path, filenames, stamp).items():
+            classified = classify_filename(filename)
+            if classified is None:
+                continue
+            char_name, kind = classified
+            if install is not None:
+                char_name = qualify(install, char_name)
+            char_files = characters.get(char_name)
+            existed.setdefault(char_name, char_files is not None)
+            if char_files is None:
+                if entry is None:
+                    continue
+                char_files = characters[char_name] = CharacterFiles()
+            setattr(char_files, kind, entry)
+            if not char_files:
+                del characters[char_name]
+
+    return IndexChanges(
+        [name for name, before in existed.items() if not before and name in characters],
+        [name for name, before in existed.items() if before and name in characters],
+        [name for name, before in existed.items() if before and name not in characters]
+    )
+
+
+def check_install_name(name: str):
+    """Raise ValueError if name cannot be used as an install (profile) name."""
+    if not name or set(name) & set(INSTALL_SEPARATOR + '/\\') or name in ('.', '..'):
+        raise ValueError(f"'{name}' is not a valid profile name")
@@ -1,19 +1,35 @@
-"""Main entry point for the application."""
+"""Main entry point for the application.
 
-import customtkinter as ctk
-from character_manager import CharacterManager
+With no arguments the GUI starts; any arguments run the headless CLI (see
+cli.py) without importing Tk or CustomTkinter.
+"""
 
-# Set appearance mode and color theme
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
+import startup_timing
+import sys
 
 
-def main():
-    """Main entry point."""
+def run_gui():
+    """Start the GUI."""
+    import customtkinter as ctk
+    from character_manager import CharacterManager
+    startup_timing.mark('imports')
+
+    # Set appearance mode and color theme
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("blue")
+
     root = ctk.CTk()
     app = CharacterManager(root)
     root.mainloop()
 
 
+def main():
+    """Main entry point."""
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    run_gui()
+
+
 if __name__ == "__main__":
     main()
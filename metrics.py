@@ -0,0 +1,206 @@
+"""Lightweight tracing for the scan, copy and export hot paths.
+
+Set QUARM_METRICS=1 to append one JSON line per traced operation to
+metrics.jsonl next to config.json; the file is rotated at MAX_BYTES. Set
+QUARM_PROFILE=1 to also save a cProfile capture of traced operations under
+profiles/ there. With both unset, span() returns a shared no-op object, so
+instrumented code pays a function call per operation and nothing else.
+
+    with metrics.span('copy', source=name) as span:
+        ...
+        span.add(files=1, bytes=size)
+        if span:  # only compute expensive fields when tracing
+            span.set(characters=len(index))
+"""
+
+import json
+import os
+import threading
+import time
+
+from config import CONFIG_DIR
+
+
+ENABLED = os.getenv('QUARM_METRICS', '') not in ('', '0')
+PROFILE = os.getenv('QUARM_PROFILE', '') not in ('', '0')
+
+METRICS_FILE = CONFIG_DIR / "metrics.jsonl"
+PROFILE_DIR = CONFIG_DIR / "profiles"
+
+# Rotate the metrics file at this size, keeping this many old files
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 3
+
+# Newest profile captures kept on disk
+PROFILE_KEEP = 20
+
+_write_lock = threading.Lock()
+_profile_lock = threading.Lock()
+_profiling = False
+
+
+class _NullSpan:
+    """Stand-in returned by span() when tracing is off; every method is a no-op."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def add(self, **counts):
+        pass
+
+    def set(self, **fields):
+        pass
+
+    def phase(self, name: str):
+        return self
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Phase:
+    """Adds the time spent inside a with-block to a span's phase total."""
+
+    __slots__ = ('span', 'name', 'start')
+
+    def __init__(self, span: 'Span', name: str):
+        self.span = span
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        phases = self.span.phases
+        phases[self.name] = phases.get(self.name, 0.0) + elapsed
+        return False
+
+
+class Span:
+    """A timed operation with counters and named sub-phase durations."""
+
+    __slots__ = ('name', 'fields', 'phases', '_start', '_profiler')
+
+    def __init__(self, name: str, fields: dict):
+        self.name = name
+        self.fields = fields
+        self.phases = {}
+        self._profiler = None
+
+    def __bool__(self):
+        return True
+
+    def add(self, **counts):
+        """Increment numeric counters such as files or bytes."""
+        for key, value in counts.items():
+            self.fields[key] = self.fields.get(key, 0) + value
+
+    def set(self, **fields):
+        """Set fields on the record."""
+        self.fields.update(fields)
+
+    def phase(self, name: str) -> _Phase:
+        """Time a sub-phase (e.g. listing, stat, compress) of this operation."""
+        return _Phase(self, name)
+
+    def __enter__(self):
+        if PROFILE:
+            self._profiler = _start_profile()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = (time.perf_counter() - self._start) * 1000
+        if self._profiler is not None:
+            _stop_profile(self._profiler, self.name)
+        if ENABLED:
+            record = {
+                'ts': round(time.time(), 3),
+                'op': self.name,
+                'ms': round(elapsed, 3),
+                'thread': threading.current_thread().name,
+                'ok': exc_type is None,
+            }
+            if exc_type is not None:
+                record['error'] = exc_type.__name__
+            record.update(self.fields)
+            if self.phases:
+                record['phases'] = {name: round(ms, 3) for name, ms in self.phases.items()}
+            _write(record)
+        return False
+
+
+def span(name: str, **fields):
+    """Return a context manager tracing one operation, or a no-op when disabled."""
+    if not (ENABLED or PROFILE):
+        return _NULL_SPAN
+    return Span(name, fields)
+
+
+def _rotate():
+    """Shift metrics.jsonl -> .1 -> .2 ..., dropping the oldest."""
+    for index in range(BACKUP_COUNT - 1, 0, -1):
+        older = f"{METRICS_FILE}.{index}"
+        if os.path.exists(older):
+            os.replace(older, f"{METRICS_FILE}.{index + 1}")
+    os.replace(METRICS_FILE, f"{METRICS_FILE}.1")
+
+
+def _write(record: dict):
+    """Append a record to the metrics file, rotating it when full."""
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        try:
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            if METRICS_FILE.exists() and METRICS_FILE.stat().st_size + len(line) > MAX_BYTES:
+                _rotate()
+            with open(METRICS_FILE, 'a') as f:
+                f.write(line)
+        except OSError:
+            # Metrics must never break the operation being measured
+            pass
+
+
+def _start_profile():
+    """Start a profiler unless one is already running; returns it or None."""
+    global _profiling
+    import cProfile
+
+    with _profile_lock:
+        if _profiling:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is active
+            return None
+        _profiling = True
+        return profiler
+
+
+def _stop_profile(profiler, name: str):
+    """Stop a profiler and save its capture, pruning old captures."""
+    global _profiling
+    profiler.disable()
+    with _profile_lock:
+        _profiling = False
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        profiler.dump_stats(str(PROFILE_DIR / f"{name}-{stamp}-{os.getpid()}-{id(profiler):x}.prof"))
+        captures = sorted(PROFILE_DIR.glob('*.prof'), key=lambda p: p.stat().st_mtime)
+        for old in captures[:-PROFILE_KEEP]:
+            old.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,118 @@
+"""Sorted name index with incremental type-to-filter search."""
+
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+
+class NameIndex:
+    """
+    Names sorted case-insensitively, searchable by prefix, substring and
+    fuzzy (in-order subsequence) match.
+
+    The index is built once per scan and kept up to date with add() and
+    remove() after writes; the prefix tier is found by bisection and results
+    are ranked prefix, then substring, then fuzzy matches, each in sorted
+    order.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        pairs = sorted((name.lower(), name) for name in names)
+        self.keys = [key for key, _name in pairs]
+        self.names = [name for _key, name in pairs]
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name: str) -> Optional[int]:
+        """Insert a name in sorted position; returns it, or None if already present."""
+        key = name.lower()
+        pos = bisect_left(self.keys, key)
+        # Names with equal keys are ordered by name, as when built
+        while pos < len(self.keys) and self.keys[pos] == key and self.names[pos] < name:
+            pos += 1
+        if pos < len(self.keys) and self.names[pos] == name:
+            return None
+        self.keys.insert(pos, key)
+        self.names.insert(pos, name)
+        return pos
+
+    def remove(self, name: str) -> Optional[int]:
+        """Remove a name; returns its former position, or None if absent."""
+        key = name.lower()
+        pos = bisect_left(self.keys, key)
+        while pos < len(self.keys) and self.keys[pos] == key:
+            if self.names[pos] == name:
+                del self.keys[pos]
+                del self.names[pos]
+                return pos
+            pos += 1
+        return None
+
+    def prefix_range(self, query: str) -> range:
+        """Positions of names starting with the lower-case query."""
+        start = bisect_left(self.keys, query)
+        # '\uffff' sorts after any character a name can contain
+        return range(start, bisect_left(self.keys, query + '\uffff', start))
+
+    def match(self, query: str, candidates: Optional[List[int]] = None) -> List[int]:
+        """
+        Return positions matching the lower-case query, ranked.
+
+        candidates restricts the search to earlier matches; any match of a
+        longer query is also a match of its prefix, so callers narrowing as
+        the user types can pass the previous result.
+        """
+        prefix = self.prefix_range(query)
+        keys = self.keys
+        positions = range(len(keys)) if candidates is None else candidates
+
+        prefix_tier, substring_tier, fuzzy_tier = [], [], []
+        for pos in positions:
+            if pos in prefix:
+                prefix_tier.append(pos)
+                continue
+            key = keys[pos]
+            if query in key:
+                substring_tier.append(pos)
+                continue
+            chars = iter(key)
+            if all(c in chars for c in query):
+                fuzzy_tier.append(pos)
+
+        if candidates is not None:
+            # Candidates arrive ranked for the shorter query; restore sorted order per tier
+            prefix_tier.sort()
+            substring_tier.sort()
+            fuzzy_tier.sort()
+        return prefix_tier + substring_tier + fuzzy_tier
+
+
+class IncrementalFilter:
+    """
+    Type-to-filter state for one picker.
+
+    While the query only grows, each keystroke searches the previous matches
+    instead of the whole index.
+    """
+
+    def __init__(self, index: NameIndex):
+        self.index = index
+        self._query = ''
+        self._matches: Optional[List[int]] = None
+
+    def reset(self):
+        """Forget the previous matches, e.g. after names were added or removed."""
+        self._query, self._matches = '', None
+
+    def filter(self, query: str, exclude: Optional[str] = None) -> List[str]:
+        """Return names matching query (all names if empty), without exclude."""
+        query = query.strip().lower()
+        names = self.index.names
+        if not query:
+            self._query, self._matches = '', None
+            return [name for name in names if name != exclude] if exclude is not None else list(names)
+
+        candidates = self._matches if self._query and query.startswith(self._query) else None
+        self._matches = self.index.match(query, candidates)
+        self._query = query
+        return [names[pos] for pos in self._matches if names[pos] != exclude]
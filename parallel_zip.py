@@ -0,0 +1,177 @@
+"""Parallel ZIP writer that deflates archive members concurrently."""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from character_scanner import FileEntry
+
+
+# Chunk size used when reading member files
+READ_BUFFER_SIZE = 64 * 1024
+
+# Members compressed ahead of the writer, per worker, to bound memory use
+WINDOW_PER_WORKER = 4
+
+_LOCAL_HEADER = struct.Struct('<I5H3I2H')
+_CENTRAL_HEADER = struct.Struct('<I4B4H3I5H2I')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_END_LOCATOR = struct.Struct('<IIQI')
+
+_LOCAL_HEADER_SIG = 0x04034b50
+_CENTRAL_HEADER_SIG = 0x02014b50
+_END_RECORD_SIG = 0x06054b50
+_ZIP64_END_RECORD_SIG = 0x06064b50
+_ZIP64_END_LOCATOR_SIG = 0x07064b50
+
+_METHOD_DEFLATED = 8
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+_FLAG_UTF8 = 0x800
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_COUNT_LIMIT = 0xFFFF
+
+# Match zipfile.ZipInfo's default so archives look the same as serial ones
+_CREATE_SYSTEM = 0 if sys.platform == 'win32' else 3
+_EXTERNAL_ATTR = 0o644 << 16
+
+
+def zip_date_time(mtime: float) -> Tuple[int, int, int, int, int, int]:
+    """Convert an mtime to a ZIP date_time tuple (ZIP cannot store pre-1980 dates)."""
+    return time.localtime(max(mtime, 315532800))[:6]
+
+
+def fits_without_zip64_offsets(members: List[Tuple[FileEntry, str]]) -> bool:
+    """
+    Return True if the archive is guaranteed to stay below 4 GiB.
+
+    The parallel writer does not emit per-member ZIP64 extras, so larger
+    archives must use the zipfile-based serial writer.
+    """
+    # Deflate can expand incompressible input by a few bytes per 16 KiB block
+    bound = sum(entry.size + entry.size // 1000 + 128 + 2 * len(arcname) for entry, arcname in members)
+    return bound < _ZIP64_LIMIT
+
+
+def _encode_name(arcname: str) -> Tuple[bytes, int]:
+    """Encode a member name the way zipfile does, flagging UTF-8 when needed."""
+    try:
+        return arcname.encode('ascii'), 0
+    except UnicodeEncodeError:
+        return arcname.encode('utf-8'), _FLAG_UTF8
+
+
+def _deflate_member(path: str, level: int) -> Tuple[int, int, bytes]:
+    """Deflate one file to a raw stream; returns (crc32, size, compressed bytes)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+    chunks = []
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(READ_BUFFER_SIZE)
+            if not data:
+                break
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+            chunks.append(compressor.compress(data))
+    chunks.append(compressor.flush())
+    return crc, size, b''.join(chunks)
+
+
+def _dos_time(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    """Pack a date_time tuple into DOS (time, date) fields."""
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def write_parallel_zip(
+    zip_path: str,
+    members: List[Tuple[FileEntry, str]],
+    compresslevel: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+):
+    """
+    Write a deflated ZIP archive, compressing members on a thread pool.
+
+    zlib releases the GIL while compressing, so members are deflated
+    concurrently into raw streams and then written in the given order. The
+    result is a standard archive that zipfile reads exactly like one it wrote
+    itself. Callers must check fits_without_zip64_offsets() first; ZIP64 end
+    records are written when the member count requires them.
+    """
+    level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+    workers = max_workers or os.cpu_count() or 1
+    total = len(members)
+    central = []
+    offset = 0
+
+    with open(zip_path, 'wb') as out, ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        next_submit = 0
+
+        def fill_window():
+            nonlocal next_submit
+            while next_submit < total and len(pending) < workers * WINDOW_PER_WORKER:
+                entry, _arcname = members[next_submit]
+                pending.append(executor.submit(_deflate_member, entry.path, level))
+                next_submit += 1
+
+        fill_window()
+        try:
+            for written, (entry, arcname) in enumerate(members, 1):
+                if cancel_check:
+                    cancel_check()
+
+                crc, size, data = pending.popleft().result()
+                fill_window()
+
+                name, flags = _encode_name(arcname)
+                dos_time, dos_date = _dos_time(zip_date_time(entry.mtime))
+                out.write(_LOCAL_HEADER.pack(
+                    _LOCAL_HEADER_SIG, _VERSION_DEFAULT, flags, _METHOD_DEFLATED,
+                    dos_time, dos_date, crc, len(data), size, len(name), 0
+                ))
+                out.write(name)
+                out.write(data)
+
+                central.append(_CENTRAL_HEADER.pack(
+                    _CENTRAL_HEADER_SIG, _VERSION_DEFAULT, _CREATE_SYSTEM, _VERSION_DEFAULT, 0,
+                    flags, _METHOD_DEFLATED, dos_time, dos_date, crc, len(data), size,
+                    len(name), 0, 0, 0, 0, _EXTERNAL_ATTR, offset
+                ) + name)
+                offset += _LOCAL_HEADER.size + len(name) + len(data)
+
+                if progress:
+                    progress(written, total)
+        except BaseException:
+            # Don't keep compressing members nobody will write
+            for future in pending:
+                future.cancel()
+            raise
+
+        central_offset = offset
+        for record in central:
+            out.write(record)
+        central_size = out.tell() - central_offset
+
+        count = total
+        if count > _ZIP64_COUNT_LIMIT:
+            zip64_offset = out.tell()
+            out.write(_ZIP64_END_RECORD.pack(
+                _ZIP64_END_RECORD_SIG, _ZIP64_END_RECORD.size - 12, _VERSION_ZIP64, _VERSION_ZIP64,
+                0, 0, count, count, central_size, central_offset
+            ))
+            out.write(_ZIP64_END_LOCATOR.pack(_ZIP64_END_LOCATOR_SIG, 0, zip64_offset, 1))
+            count = _ZIP64_COUNT_LIMIT
+        out.write(_END_RECORD.pack(
+            _END_RECORD_SIG, 0, 0, count, count, central_size, central_offset, 0
+        ))
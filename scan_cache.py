@@ -0,0 +1,265 @@
+"""Persistent scan index cache stored alongside config.json."""
+
+import atexit
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import metrics
+from config import CONFIG_DIR
+from character_scanner import (
+    CHARACTER_FILE_SUFFIXES, CharacterFiles, FileEntry, build_character_index
+)
+
+
+# Creates: <CONFIG_DIR>/scan_cache.json
+CACHE_FILE = CONFIG_DIR / "scan_cache.json"
+CACHE_VERSION = 1
+
+# How many directory entries to process between progress/cancel callbacks
+PROGRESS_INTERVAL = 256
+
+# Seconds to wait after update_files() before rewriting the cache file, so
+# a write after each copy doesn't cost a dump of every cached directory
+SAVE_DELAY = 1.0
+
+_lock = threading.Lock()
+_cache: Optional[dict] = None
+_save_timer: Optional[threading.Timer] = None
+
+
+def _directory_key(directory: str) -> str:
+    """Normalize a directory path for use as a cache key."""
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def _load() -> dict:
+    """Return the in-memory cache, reading it from disk on first use."""
+    global _cache
+    if _cache is None:
+        _cache = {'version': CACHE_VERSION, 'directories': {}}
+        if CACHE_FILE.exists():
+            try:
+                with open(CACHE_FILE, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    _cache = data
+            except Exception:
+                # A corrupt cache is simply rebuilt
+                pass
+    return _cache
+
+
+def _save():
+    """Write the cache atomically so a crash never leaves a truncated file."""
+    global _save_timer
+    if _save_timer is not None:
+        _save_timer.cancel()
+        _save_timer = None
+    tmp_file = CACHE_FILE.with_suffix('.tmp')
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(_cache, f, separators=(',', ':'))
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError:
+        # The cache is an optimization; failing to persist it is not an error
+        pass
+
+
+def _schedule_save():
+    """(Re)start the timer that saves the cache; call with _lock held."""
+    global _save_timer
+    if _save_timer is not None:
+        _save_timer.cancel()
+    _save_timer = threading.Timer(SAVE_DELAY, flush)
+    _save_timer.daemon = True
+    _save_timer.start()
+
+
+def flush():
+    """Write a pending cache update now."""
+    with _lock:
+        if _save_timer is not None:
+            _save()
+
+
+atexit.register(flush)
+
+
+def _index_from_record(directory: str, record: dict) -> Dict[str, CharacterFiles]:
+    """Build a character index from a cached directory record."""
+    return build_character_index(
+        (name, FileEntry(os.path.join(directory, name), size, mtime))
+        for name, (size, mtime, _inode) in record['files'].items()
+    )
+
+
+def directory_stamp(directory: str) -> Optional[Tuple[int, int]]:
+    """
+    Return a directory's (mtime_ns, inode), or None if it can't be stat-ed.
+
+    Take it just before writing files and pass it to update_files(), which
+    only trusts the cached listing if it was still current at that point.
+    """
+    try:
+        dir_stat = os.stat(directory)
+    except OSError:
+        return None
+    return dir_stat.st_mtime_ns, dir_stat.st_ino
+
+
+def _relist(
+    directory: str,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+) -> Dict[str, list]:
+    """
+    List the directory once and stat every character file.
+
+    Cached records are not reused, even for an unchanged inode: the game
+    rewrites files in place, which keeps the inode but changes size and
+    mtime. On Windows scandir returns the stat data with the listing. Every
+    PROGRESS_INTERVAL entries cancel_check is called (it should raise to
+    abort) and progress receives the number of character files found so far.
+    """
+    files: Dict[str, list] = {}
+    with os.scandir(directory) as it:
+        for count, entry in enumerate(it, 1):
+            if count % PROGRESS_INTERVAL == 0:
+                if cancel_check:
+                    cancel_check()
+                if progress:
+                    progress(len(files))
+            name = entry.name
+            if not name.endswith(CHARACTER_FILE_SUFFIXES):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            files[name] = [st.st_size, st.st_mtime, st.st_ino]
+    return files
+
+
+def load_character_index(
+    directory: str,
+    force: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel_check: Optional[Callable[[], None]] = None
+) -> Dict[str, CharacterFiles]:
+    """
+    Return the character index for a directory, using the on-disk cache.
+
+    When the directory's mtime and inode match the cached record the index is
+    rebuilt from the cache at the cost of a single stat. Otherwise the
+    directory is re-listed and the cache updated. Pass force=True to ignore
+    the cached stat data entirely. progress and cancel_check are forwarded
+    to the directory listing; if cancel_check raises, the cache is left
+    untouched.
+
+    Note that rewriting an existing file in place does not change the
+    directory's mtime; use update_files() or refresh_files() after writing
+    files.
+    """
+    with metrics.span('scan_cache.load', directory=directory, force=force) as span:
+        dir_stat = os.stat(directory)
+        key = _directory_key(directory)
+
+        with _lock:
+            with span.phase('load_cache'):
+                cache = _load()
+            record = cache['directories'].get(key)
+            hit = (not force and record is not None
+                   and record['mtime_ns'] == dir_stat.st_mtime_ns
+                   and record['inode'] == dir_stat.st_ino)
+            if hit:
+                span.set(cache_hit=True, files=len(record['files']))
+                return _index_from_record(directory, record)
+
+        # List outside the lock so several installs can be scanned at once
+        with span.phase('relist'):
+            files = _relist(directory, progress, cancel_check)
+        record = {
+            'mtime_ns': dir_stat.st_mtime_ns,
+            'inode': dir_stat.st_ino,
+            'files': files,
+        }
+        with _lock:
+            cache['directories'][key] = record
+            with span.phase('save_cache'):
+                _save()
+        span.set(cache_hit=False, files=len(files))
+        return _index_from_record(directory, record)
+
+
+def update_files(
+    directory: str,
+    filenames: Iterable[str],
+    before: Optional[Tuple[int, int]] = None
+) -> Dict[str, Optional[FileEntry]]:
+    """
+    Re-stat specific files after they were written and update the cache.
+
+    This costs one stat per file instead of a full directory listing; the
+    cache file itself is rewritten shortly afterwards (see SAVE_DELAY).
+    The cached listing is only marked current when before, the
+    directory_stamp() taken before the write, matches it: otherwise files
+    other programs added in the meantime would stay hidden, so the record is
+    left stale and the next load re-lists the directory.
+    Returns file name -> new entry, or None for files that no longer exist.
+    """
+    key = _directory_key(directory)
+    entries: Dict[str, Optional[FileEntry]] = {}
+
+    with _lock:
+        record = _load()['directories'].get(key)
+        files = record['files'] if record is not None else {}
+        for name in filenames:
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                files.pop(name, None)
+                entries[name] = None
+                continue
+            files[name] = [st.st_size, st.st_mtime, st.st_ino]
+            entries[name] = FileEntry(path, st.st_size, st.st_mtime)
+        if record is not None:
+            if before is not None and before == (record['mtime_ns'], record['inode']):
+                after = directory_stamp(directory)
+                if after is not None:
+                    record['mtime_ns'], record['inode'] = after
+            _schedule_save()
+    return entries
+
+
+def refresh_files(
+    directory: str,
+    filenames: Iterable[str],
+    before: Optional[Tuple[int, int]] = None
+) -> Dict[str, CharacterFiles]:
+    """Re-stat specific files after they were written and return the rebuilt index (see update_files)."""
+    update_files(directory, filenames, before)
+
+    with _lock:
+        record = _load()['directories'].get(_directory_key(directory))
+        if record is not None:
+            return _index_from_record(directory, record)
+
+    # Nothing cached yet for this directory
+    return load_character_index(directory)
+
+
+def clear_cache(directory: Optional[str] = None):
+    """Forget cached data for one directory, or for all directories."""
+    with _lock:
+        cache = _load()
+        if directory is None:
+            cache['directories'].clear()
+        else:
+            cache['directories'].pop(_directory_key(directory), None)
+        _save()
@@ -0,0 +1,50 @@
+"""Startup timing probe.
+
+Set QUARM_STARTUP_TIMING=1 to record how long the app takes to finish its
+imports, map its window and complete the first scan. Each run appends one
+JSON line to startup_timing.log next to config.json (and prints it to stderr
+when there is a console), which also works for the windowed frozen build.
+"""
+
+import os
+import sys
+import time
+
+# Imported first by main.py, so this approximates interpreter start-up
+START = time.perf_counter()
+
+ENABLED = os.getenv('QUARM_STARTUP_TIMING', '') not in ('', '0')
+
+LOG_NAME = "startup_timing.log"
+
+_marks = {}
+_reported = False
+
+
+def mark(name: str):
+    """Record the first time a startup milestone is reached."""
+    if ENABLED and name not in _marks:
+        _marks[name] = round((time.perf_counter() - START) * 1000, 1)
+
+
+def report(**extra):
+    """Write the recorded milestones once per process."""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+
+    import json
+    from config import CONFIG_DIR
+
+    record = {'frozen': bool(getattr(sys, 'frozen', False)), 'ms': dict(_marks)}
+    record.update(extra)
+    line = json.dumps(record)
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CONFIG_DIR / LOG_NAME, 'a') as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
+    if sys.stderr:
+        print(f"startup timing: {line}", file=sys.stderr)
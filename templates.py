@@ -0,0 +1,287 @@
+"""Named layout templates captured from a character's files.
+
+A template keeps a copy of one character's UI, config and spellsets files
+under a name, so new characters can be created from it after the original
+character has changed or been deleted:
+
+    <CONFIG_DIR>/templates/<name>/
+        template.json        {"name", "source", "created", "kinds"}
+        ui.ini, config.ini, spellsets.ini
+
+Loaded templates are kept in memory, least recently used evicted first, and
+are reloaded when their manifest changes on disk.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import metrics
+from backup_store import backup_files
+from character_scanner import FILE_KINDS, CharacterFiles, character_filename
+from config import CONFIG_DIR
+from copy_plan import MAX_COPY_WORKERS
+from installs import Directory, qualify_like, resolve
+
+
+TEMPLATES_DIR = CONFIG_DIR / "templates"
+MANIFEST_NAME = "template.json"
+
+# Templates kept in memory, least recently used evicted first
+MAX_CACHED_TEMPLATES = 16
+
+# Characters Windows doesn't allow in folder names
+_INVALID_NAME_CHARS = set('<>:"/\\|?*')
+
+_lock = threading.Lock()
+_cache: 'OrderedDict[str, Tuple[int, Template]]' = OrderedDict()
+
+
+class Template:
+    """A named copy of one character's files."""
+
+    __slots__ = ('name', 'source', 'created', 'bodies')
+
+    def __init__(self, name: str, source: str, created: float, bodies: Dict[str, bytes]):
+        self.name = name
+        # The character the files were captured from
+        self.source = source
+        self.created = created
+        # File kind -> file body, in FILE_KINDS order
+        self.bodies = bodies
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self.bodies)
+
+    def __repr__(self):
+        return f"Template({self.name!r}, source={self.source!r}, kinds={self.kinds})"
+
+
+def check_template_name(name: str):
+    """Raise ValueError if name cannot be used as a template name."""
+    if (not name or name != name.strip() or name.startswith('.') or name.endswith('.')
+            or set(name) & _INVALID_NAME_CHARS):
+        raise ValueError(f"'{name}' is not a valid template name")
+
+
+def check_character_name(name: str):
+    """Raise ValueError if a (bare) character name can't be used in a file name."""
+    if not name or name != name.strip() or set(name) & _INVALID_NAME_CHARS:
+        raise ValueError(f"'{name}' is not a valid character name")
+
+
+def parse_names(text: str) -> List[str]:
+    """Split pasted character names (one per line or comma-separated), dropping blanks and repeats."""
+    names = (part.strip() for part in text.replace(',', '\n').splitlines())
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _template_dir(name: str):
+    return TEMPLATES_DIR / name
+
+
+def _existing_manifest(name: str) -> os.stat_result:
+    """Stat a template's manifest; raises ValueError if there is no such template."""
+    try:
+        check_template_name(name)
+        return os.stat(_template_dir(name) / MANIFEST_NAME)
+    except (ValueError, FileNotFoundError):
+        raise ValueError(f"No template named '{name}'")
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write data next to path and rename it into place."""
+    tmp_path = f"{path}.{os.urandom(4).hex()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def save_template(
+    name: str,
+    source: str,
+    char_files: CharacterFiles,
+    kinds: Iterable[str] = FILE_KINDS,
+    overwrite: bool = False
+) -> Template:
+    """
+    Capture a character's files of the given kinds as a named template.
+
+    Raises ValueError for an invalid or (without overwrite) existing name,
+    or when the character has none of the kinds.
+    """
+    check_template_name(name)
+    kinds = set(kinds)
+    bodies = {}
+    for kind in (kind for kind in FILE_KINDS if kind in kinds):
+        entry = char_files.get(kind)
+        if entry is not None:
+            with open(entry.path, 'rb') as f:
+                bodies[kind] = f.read()
+    if not bodies:
+        raise ValueError(f"'{source}' has none of the selected file types")
+
+    directory = _template_dir(name)
+    with _lock:
+        if (directory / MANIFEST_NAME).exists() and not overwrite:
+            raise ValueError(f"A template named '{name}' already exists")
+        directory.mkdir(parents=True, exist_ok=True)
+        for kind in FILE_KINDS:
+            path = directory / f"{kind}.ini"
+            if kind in bodies:
+                _write_atomic(str(path), bodies[kind])
+            elif path.exists():
+                path.unlink()
+        template = Template(name, source, time.time(), bodies)
+        manifest = {'name': name, 'source': source, 'created': template.created, 'kinds': template.kinds}
+        # The manifest goes last, so a template is never listed before its files exist
+        _write_atomic(str(directory / MANIFEST_NAME), json.dumps(manifest, indent=2).encode())
+        _cache.pop(name, None)
+    return template
+
+
+def list_templates() -> List[dict]:
+    """Return the manifests of every saved template, sorted by name."""
+    manifests = []
+    try:
+        entries = list(os.scandir(TEMPLATES_DIR))
+    except FileNotFoundError:
+        return manifests
+    for entry in entries:
+        try:
+            with open(os.path.join(entry.path, MANIFEST_NAME), 'r') as f:
+                manifests.append(json.load(f))
+        except (OSError, ValueError):
+            # Not a template, or a damaged one
+            continue
+    manifests.sort(key=lambda manifest: manifest['name'].lower())
+    return manifests
+
+
+def load_template(name: str) -> Template:
+    """
+    Return a template, from memory when its manifest hasn't changed.
+
+    Raises ValueError if there is no template of that name.
+    """
+    directory = _template_dir(name)
+    mtime_ns = _existing_manifest(name).st_mtime_ns
+
+    with _lock:
+        cached = _cache.get(name)
+        if cached is not None and cached[0] == mtime_ns:
+            _cache.move_to_end(name)
+            return cached[1]
+
+        with open(directory / MANIFEST_NAME, 'r') as f:
+            manifest = json.load(f)
+        bodies = {}
+        for kind in manifest['kinds']:
+            with open(directory / f"{kind}.ini", 'rb') as f:
+                bodies[kind] = f.read()
+        template = Template(manifest['name'], manifest['source'], manifest['created'], bodies)
+
+        _cache[name] = (mtime_ns, template)
+        _cache.move_to_end(name)
+        while len(_cache) > MAX_CACHED_TEMPLATES:
+            _cache.popitem(last=False)
+    return template
+
+
+def delete_template(name: str):
+    """Delete a saved template; raises ValueError if there is none of that name."""
+    _existing_manifest(name)
+    with _lock:
+        _cache.pop(name, None)
+        shutil.rmtree(_template_dir(name))
+
+
+def _write_character(template: Template, target_dir: str, bare_name: str, char_name: str) -> List[str]:
+    """Write a template's files for one character; returns the written names."""
+    written = []
+    for kind, body in template.bodies.items():
+        filename = character_filename(kind, bare_name)
+        _write_atomic(os.path.join(target_dir, filename), body)
+        written.append(qualify_like(char_name, filename))
+    return written
+
+
+def apply_template(
+    template: Template,
+    names: List[str],
+    characters: Dict[str, CharacterFiles],
+    directory: Directory,
+    overwrite: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_workers: int = MAX_COPY_WORKERS,
+    backup: bool = True
+) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """
+    Create a template's files for many characters in one batch.
+
+    Names must be qualified when directory is a mapping. Characters that
+    already exist are refused unless overwrite is set; their files are then
+    backed up first (unless backup=False) in one snapshot. Characters are
+    written concurrently on a bounded thread pool, and progress, if given,
+    is called with (completed, total) as each finishes.
+
+    Returns tuple of (written file names per character, error message per
+    character).
+    """
+    written: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+    targets: Dict[str, Tuple[str, str]] = {}
+    for char_name in dict.fromkeys(names):
+        try:
+            target_dir, bare_name = resolve(directory, char_name)
+            check_character_name(bare_name)
+        except ValueError as e:
+            errors[char_name] = str(e)
+            continue
+        if char_name in characters and not overwrite:
+            errors[char_name] = "Character already exists"
+            continue
+        targets[char_name] = (target_dir, bare_name)
+
+    total = len(targets)
+    if not total:
+        return written, errors
+
+    if backup:
+        replaced = [
+            qualify_like(char_name, character_filename(kind, bare_name))
+            for char_name, (_target_dir, bare_name) in targets.items() if char_name in characters
+            for kind in template.bodies
+        ]
+        if replaced:
+            backup_files(directory, replaced, f"template {template.name}")
+
+    with metrics.span('template.apply', template=template.name, characters=total) as span, \
+            ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+        futures = {
+            executor.submit(_write_character, template, target_dir, bare_name, char_name): char_name
+            for char_name, (target_dir, bare_name) in targets.items()
+        }
+        for completed, future in enumerate(as_completed(futures), 1):
+            char_name = futures[future]
+            try:
+                written[char_name] = future.result()
+                span.add(files=len(written[char_name]))
+            except OSError as e:
+                errors[char_name] = str(e)
+            if progress:
+                progress(completed, total)
+        span.set(errors=len(errors))
+
+    return written, errors
@@ -1,11 +1,219 @@
 """UI component builders for the application."""
 
 import customtkinter as ctk
-from typing import Callable
+from typing import Callable, Iterable, List, Optional, Set
 
 
-def create_directory_section(parent, quarm_dir: str, on_browse: Callable, on_scan: Callable) -> ctk.CTkEntry:
-    """Create the directory selection section."""
+# Copy mode menu labels -> copy_engine.COPY_MODES
+COPY_MODE_CHOICES = {
+    "Copy": 'copy',
+    "Shared file (hard link)": 'hardlink',
+    "Reflink (clone)": 'reflink',
+}
+
+# Compression menu labels -> file_operations.COMPRESSION_LEVELS keys
+COMPRESSION_CHOICES = {
+    "Stored": 'stored',
+    "Fast": 'fast',
+    "Normal": 'normal',
+    "Max": 'max',
+}
+
+
+class VirtualCheckList(ctk.CTkFrame):
+    """
+    A scrollable checkbox list that only creates widgets for the visible rows.
+    
+    Row widgets are recycled while scrolling. Selection is stored as data: a
+    set of names toggled relative to an "all selected" flag, so selecting or
+    deselecting everything never touches more than the visible rows.
+    set_filter() shows a subset of the items; selection of hidden items is
+    kept, and Select/Deselect All then apply to the shown items only.
+    """
+    
+    # Rows scrolled per mouse wheel notch
+    WHEEL_STEP = 3
+    ROW_PADY = 2
+    
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._all_items: List[str] = []
+        self._items: List[str] = []
+        self._inverted = False
+        self._toggled: Set[str] = set()
+        self._offset = 0
+        self._visible_count = 1
+        self._row_stride = None
+        self._rows: List[ctk.CTkCheckBox] = []
+        
+        self._body = ctk.CTkFrame(self, fg_color="transparent")
+        self._body.pack(side="left", fill="both", expand=True, padx=(8, 0), pady=6)
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y", padx=(0, 4), pady=6)
+        
+        self._body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self._body)
+    
+    # Data operations
+    
+    def set_items(self, items: Iterable[str]):
+        """Replace the list contents and clear any filter; selection of names still present is kept."""
+        self._all_items = list(items)
+        self._items = self._all_items
+        self._clamp_offset()
+        self._render()
+    
+    def insert_item(self, index: int, name: str, selected: bool = False):
+        """Insert one item at index of the full list without disturbing scroll or selection."""
+        self._all_items.insert(index, name)
+        if self.is_selected(name) != selected:
+            self._toggled.symmetric_difference_update((name,))
+        self._clamp_offset()
+        self._render()
+    
+    def remove_item(self, name: str):
+        """Remove one item from the full list, forgetting its selection."""
+        if name in self._all_items:
+            self._all_items.remove(name)
+        if self._items is not self._all_items and name in self._items:
+            self._items.remove(name)
+        self._toggled.discard(name)
+        self._clamp_offset()
+        self._render()
+    
+    def set_filter(self, visible: Optional[List[str]]):
+        """Show only the given items (a subset of the list), or all items for None."""
+        self._items = self._all_items if visible is None else visible
+        self._offset = 0
+        self._clamp_offset()
+        self._render()
+    
+    def get_items(self) -> List[str]:
+        return self._all_items
+    
+    def is_selected(self, name: str) -> bool:
+        return (name in self._toggled) != self._inverted
+    
+    def set_selected(self, name: str, selected: bool):
+        if selected != self.is_selected(name):
+            self._toggled.symmetric_difference_update((name,))
+            self._render()
+    
+    def get_selected(self) -> List[str]:
+        """Return selected item names in list order, including filtered-out ones."""
+        return [name for name in self._all_items if (name in self._toggled) != self._inverted]
+    
+    def select_only(self, names: Iterable[str]):
+        """Select exactly the given names, deselecting everything else."""
+        self._inverted = False
+        self._toggled = set(names)
+        self._render()
+    
+    def _set_shown(self, selected: bool):
+        """Select or deselect just the items shown by the current filter."""
+        for name in self._items:
+            if self.is_selected(name) != selected:
+                self._toggled.symmetric_difference_update((name,))
+    
+    def select_all(self):
+        if self._items is self._all_items:
+            self._inverted = True
+            self._toggled = set()
+        else:
+            self._set_shown(True)
+        self._render()
+    
+    def deselect_all(self):
+        if self._items is self._all_items:
+            self._inverted = False
+            self._toggled = set()
+        else:
+            self._set_shown(False)
+        self._render()
+    
+    # Scrolling and rendering
+    
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        widget.bind("<Button-4>", lambda e: self._scroll_by(-self.WHEEL_STEP), add="+")
+        widget.bind("<Button-5>", lambda e: self._scroll_by(self.WHEEL_STEP), add="+")
+    
+    def _on_mousewheel(self, event):
+        self._scroll_by(-self.WHEEL_STEP if event.delta > 0 else self.WHEEL_STEP)
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._offset = int(float(amount) * len(self._items))
+        elif action == "scroll":
+            step = self._visible_count if unit == "pages" else 1
+            self._offset += int(amount) * step
+        self._clamp_offset()
+        self._render()
+    
+    def _scroll_by(self, rows: int):
+        self._offset += rows
+        self._clamp_offset()
+        self._render()
+    
+    def _clamp_offset(self):
+        max_offset = max(0, len(self._items) - self._visible_count)
+        self._offset = min(max(0, self._offset), max_offset)
+    
+    def _make_row(self, index: int) -> ctk.CTkCheckBox:
+        row = ctk.CTkCheckBox(self._body, text="", command=lambda: self._on_row_toggled(index))
+        self._bind_wheel(row)
+        return row
+    
+    def _on_resize(self, event):
+        if self._row_stride is None:
+            # Measure one row to learn the real (scaled) row height
+            probe = self._make_row(0)
+            probe.pack(anchor="w", fill="x", pady=self.ROW_PADY)
+            probe.update_idletasks()
+            self._rows.append(probe)
+            self._row_stride = max(probe.winfo_reqheight(), 1) + 2 * self.ROW_PADY
+        
+        self._visible_count = max(1, event.height // self._row_stride)
+        while len(self._rows) < self._visible_count:
+            self._rows.append(self._make_row(len(self._rows)))
+        while len(self._rows) > self._visible_count:
+            self._rows.pop().destroy()
+        
+        self._clamp_offset()
+        self._render()
+    
+    def _on_row_toggled(self, index: int):
+        item_index = self._offset + index
+        if item_index < len(self._items):
+            self._toggled.symmetric_difference_update((self._items[item_index],))
+    
+    def _render(self):
+        """Bind the visible slice of items onto the recycled row widgets."""
+        for index, row in enumerate(self._rows):
+            item_index = self._offset + index
+            if item_index >= len(self._items):
+                # Rows past the end are always a suffix, so re-packing keeps order
+                row.pack_forget()
+                continue
+            name = self._items[item_index]
+            row.configure(text=name)
+            if self.is_selected(name):
+                row.select()
+            else:
+                row.deselect()
+            if not row.winfo_manager():
+                row.pack(anchor="w", fill="x", pady=self.ROW_PADY)
+        
+        total = len(self._items)
+        if total:
+            self._scrollbar.set(self._offset / total, min(1.0, (self._offset + self._visible_count) / total))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+
+def create_directory_section(parent, quarm_dir: str, on_browse: Callable, on_scan: Callable,
+                             on_focus_out: Optional[Callable] = None) -> ctk.CTkEntry:
+    """Create the directory selection section; on_focus_out defaults to on_scan."""
     dir_frame = ctk.CTkFrame(parent, fg_color="transparent")
     dir_frame.pack(fill="x", padx=10, pady=10)
     
@@ -21,14 +229,52 @@ def create_directory_section(parent, quarm_dir: str, on_browse: Callable, on_sca
     
     # Auto-scan when Enter is pressed or field loses focus
     dir_entry.bind("<Return>", lambda e: on_scan())
-    dir_entry.bind("<FocusOut>", lambda e: on_scan())
+    dir_entry.bind("<FocusOut>", lambda e: (on_focus_out or on_scan)())
     
     ctk.CTkButton(dir_input_frame, text="Browse", command=on_browse, width=100).pack(side="left")
     
     return dir_entry
 
 
-def create_copy_tab(parent, on_new_char_change: Callable, on_copy: Callable) -> dict:
+def create_profile_row(parent, on_toggle: Callable, on_save_profile: Callable) -> dict:
+    """Create the install profile controls and return widget references."""
+    widgets = {}
+    
+    widgets['frame'] = ctk.CTkFrame(parent, fg_color="transparent")
+    widgets['frame'].pack(fill="x", padx=20, pady=(0, 5))
+    
+    widgets['profiles_switch'] = ctk.CTkSwitch(widgets['frame'], text="Use all active profiles", command=on_toggle)
+    widgets['profiles_switch'].pack(side="left")
+    
+    widgets['save_profile_button'] = ctk.CTkButton(
+        widgets['frame'], text="Save Directory as Profile", command=on_save_profile, width=180
+    )
+    widgets['save_profile_button'].pack(side="left", padx=10)
+    
+    widgets['profiles_label'] = ctk.CTkLabel(widgets['frame'], text="", font=("Arial", 12))
+    widgets['profiles_label'].pack(side="left")
+    
+    return widgets
+
+
+def create_progress_row(parent, on_cancel: Callable) -> dict:
+    """Create the background task progress row and return widget references."""
+    widgets = {}
+    
+    widgets['frame'] = ctk.CTkFrame(parent, fg_color="transparent")
+    widgets['frame'].pack(fill="x", padx=20, pady=(0, 5))
+    
+    widgets['label'] = ctk.CTkLabel(widgets['frame'], text="", font=("Arial", 12))
+    widgets['label'].pack(side="left")
+    
+    # Progress bar and cancel button are only packed while a task is running
+    widgets['progress'] = ctk.CTkProgressBar(widgets['frame'], mode="indeterminate", width=200)
+    widgets['cancel_button'] = ctk.CTkButton(widgets['frame'], text="Cancel", command=on_cancel, width=80)
+    
+    return widgets
+
+
+def create_copy_tab(parent, on_new_char_change: Callable, on_copy: Callable, on_multi_toggle: Callable) -> dict:
     """Create the Copy Configuration tab and return widget references."""
     widgets = {}
     
@@ -37,22 +283,55 @@ def create_copy_tab(parent, on_new_char_change: Callable, on_copy: Callable) ->
     
     # Source character selection
     ctk.CTkLabel(copy_content_frame, text="From Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(15, 3))
-    widgets['source_combo'] = ctk.CTkComboBox(copy_content_frame, values=[], width=300, state="readonly")
-    widgets['source_combo'].pack(anchor="w", padx=20, pady=(0, 10))
-    
-    # Target character selection
-    ctk.CTkLabel(copy_content_frame, text="To Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
-    widgets['target_combo'] = ctk.CTkComboBox(copy_content_frame, values=[], width=300, state="readonly")
-    widgets['target_combo'].pack(anchor="w", padx=20, pady=(0, 10))
+    source_row = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
+    source_row.pack(fill="x", padx=20, pady=(0, 10))
+    widgets['source_combo'] = ctk.CTkComboBox(source_row, values=[], width=300, state="readonly")
+    widgets['source_combo'].pack(side="left")
+    widgets['source_filter'] = ctk.CTkEntry(source_row, placeholder_text="Type to filter", width=160)
+    widgets['source_filter'].pack(side="left", padx=(10, 0))
+    
+    # Switch between a single target and many targets
+    widgets['multi_switch'] = ctk.CTkSwitch(copy_content_frame, text="Copy to multiple characters", command=on_multi_toggle)
+    widgets['multi_switch'].pack(anchor="w", padx=20, pady=(0, 10))
+    
+    # Single target: existing character or new character name
+    widgets['single_target_frame'] = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
+    widgets['single_target_frame'].pack(fill="x")
+    
+    ctk.CTkLabel(widgets['single_target_frame'], text="To Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    target_row = ctk.CTkFrame(widgets['single_target_frame'], fg_color="transparent")
+    target_row.pack(fill="x", padx=20, pady=(0, 10))
+    widgets['target_combo'] = ctk.CTkComboBox(target_row, values=[], width=300, state="readonly")
+    widgets['target_combo'].pack(side="left")
+    widgets['target_filter'] = ctk.CTkEntry(target_row, placeholder_text="Type to filter", width=160)
+    widgets['target_filter'].pack(side="left", padx=(10, 0))
     
     # New character entry
-    ctk.CTkLabel(copy_content_frame, text="Or New Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
-    widgets['new_char_entry'] = ctk.CTkEntry(copy_content_frame, placeholder_text="Enter character name", width=300)
+    ctk.CTkLabel(widgets['single_target_frame'], text="Or New Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['new_char_entry'] = ctk.CTkEntry(widgets['single_target_frame'], placeholder_text="Enter character name", width=300)
     widgets['new_char_entry'].pack(anchor="w", padx=20, pady=(0, 10))
     widgets['new_char_entry'].bind("<KeyRelease>", lambda e: on_new_char_change())
     
+    # Multiple targets: packed in place of the single target frame when the switch is on
+    widgets['multi_target_frame'] = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
+    
+    ctk.CTkLabel(widgets['multi_target_frame'], text="To Characters:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['target_list_filter'] = ctk.CTkEntry(widgets['multi_target_frame'], placeholder_text="Type to filter", width=300)
+    widgets['target_list_filter'].pack(anchor="w", padx=20, pady=(0, 5))
+    multi_list_frame = ctk.CTkFrame(widgets['multi_target_frame'], fg_color="transparent")
+    multi_list_frame.pack(fill="x", padx=20, pady=(0, 10))
+    
+    widgets['target_list'] = VirtualCheckList(multi_list_frame, height=160, border_width=2, border_color=("gray60", "gray40"))
+    widgets['target_list'].pack(side="left", fill="x", expand=True)
+    
+    multi_buttons_frame = ctk.CTkFrame(multi_list_frame, fg_color="transparent")
+    multi_buttons_frame.pack(side="left", fill="y", padx=(10, 0))
+    ctk.CTkButton(multi_buttons_frame, text="Select All", command=widgets['target_list'].select_all, width=120).pack(fill="x", pady=(0, 3))
+    ctk.CTkButton(multi_buttons_frame, text="Deselect All", command=widgets['target_list'].deselect_all, width=120).pack(fill="x")
+    
     # File type checkboxes
-    ctk.CTkLabel(copy_content_frame, text="File Types to Copy:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['file_types_label'] = ctk.CTkLabel(copy_content_frame, text="File Types to Copy:", font=("Arial", 12))
+    widgets['file_types_label'].pack(anchor="w", padx=20, pady=(0, 3))
     
     checkbox_frame = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
     checkbox_frame.pack(fill="x", padx=20, pady=(0, 12))
@@ -69,9 +348,30 @@ def create_copy_tab(parent, on_new_char_change: Callable, on_copy: Callable) ->
     widgets['spellsets_checkbox'].pack(side="left", padx=10)
     widgets['spellsets_checkbox'].select()
     
+    # Copy options
+    options_frame = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
+    options_frame.pack(fill="x", padx=20, pady=(0, 12))
+    
+    widgets['skip_identical_checkbox'] = ctk.CTkCheckBox(options_frame, text="Skip identical files", state="normal")
+    widgets['skip_identical_checkbox'].pack(side="left", padx=10)
+    
+    ctk.CTkLabel(options_frame, text="Copy mode:", font=("Arial", 12)).pack(side="left", padx=(20, 5))
+    widgets['copy_mode_menu'] = ctk.CTkOptionMenu(options_frame, values=list(COPY_MODE_CHOICES), width=150)
+    widgets['copy_mode_menu'].pack(side="left")
+    widgets['copy_mode_menu'].set("Copy")
+    
+    # Section-level copy: merge only matching sections/keys into the targets
+    sections_frame = ctk.CTkFrame(copy_content_frame, fg_color="transparent")
+    sections_frame.pack(fill="x", padx=20, pady=(0, 12))
+    ctk.CTkLabel(sections_frame, text="Only sections:", font=("Arial", 12)).pack(side="left", padx=(10, 5))
+    widgets['sections_entry'] = ctk.CTkEntry(sections_frame, width=300,
+                                             placeholder_text="e.g. HotButton*, Main/Width (blank copies whole files)")
+    widgets['sections_entry'].pack(side="left")
+    
     # Copy button - left aligned
-    ctk.CTkButton(copy_content_frame, text="Copy Configuration", command=on_copy,
-                 font=("Arial", 12, "bold"), height=40).pack(anchor="w", padx=20, pady=(10, 15))
+    widgets['copy_button'] = ctk.CTkButton(copy_content_frame, text="Copy Configuration", command=on_copy,
+                                           font=("Arial", 12, "bold"), height=40)
+    widgets['copy_button'].pack(anchor="w", padx=20, pady=(10, 15))
     
     return widgets
 
@@ -92,10 +392,12 @@ def create_export_tab(parent, on_select_all: Callable, on_deselect_all: Callable
     left_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
     
     ctk.CTkLabel(left_frame, text="Select Characters to Export:", font=("Arial", 12)).pack(anchor="w", pady=(0, 3))
+    widgets['char_filter'] = ctk.CTkEntry(left_frame, placeholder_text="Type to filter")
+    widgets['char_filter'].pack(fill="x", pady=(0, 5))
     
-    # Scrollable character list with border
-    widgets['char_listbox'] = ctk.CTkScrollableFrame(left_frame, border_width=2, border_color=("gray60", "gray40"))
-    widgets['char_listbox'].pack(fill="both", expand=True)
+    # Virtualized character list with border
+    widgets['char_list'] = VirtualCheckList(left_frame, border_width=2, border_color=("gray60", "gray40"))
+    widgets['char_list'].pack(fill="both", expand=True)
     
     # Right side - Controls and options
     right_frame = ctk.CTkFrame(main_export_frame, fg_color="transparent")
@@ -127,8 +429,219 @@ def create_export_tab(parent, on_select_all: Callable, on_deselect_all: Callable
     widgets['export_spellsets_checkbox'].pack(anchor="w", pady=2)
     widgets['export_spellsets_checkbox'].select()
     
+    # Compression level
+    ctk.CTkLabel(right_frame, text="Compression:", font=("Arial", 12)).pack(anchor="w", pady=(0, 3))
+    widgets['compression_menu'] = ctk.CTkOptionMenu(right_frame, values=list(COMPRESSION_CHOICES), width=120)
+    widgets['compression_menu'].pack(anchor="w", pady=(0, 15))
+    widgets['compression_menu'].set("Normal")
+    
+    widgets['dedup_checkbox'] = ctk.CTkCheckBox(right_frame, text="Deduplicate identical files", state="normal")
+    widgets['dedup_checkbox'].pack(anchor="w", pady=(0, 15))
+    
     # Export button - left aligned
-    ctk.CTkButton(export_content_frame, text="Export Selected to ZIP", command=on_export,
-                 font=("Arial", 12, "bold"), height=40).pack(anchor="w", padx=20, pady=(10, 15))
+    widgets['export_button'] = ctk.CTkButton(export_content_frame, text="Export Selected to ZIP", command=on_export,
+                                             font=("Arial", 12, "bold"), height=40)
+    widgets['export_button'].pack(anchor="w", padx=20, pady=(10, 15))
+    
+    return widgets
+
+
+def create_import_tab(parent, on_browse: Callable, on_analyze: Callable, on_import: Callable) -> dict:
+    """Create the Import Characters tab and return widget references."""
+    widgets = {}
+    
+    import_content_frame = parent
+    
+    # Archive selection
+    ctk.CTkLabel(import_content_frame, text="Export Archive:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(15, 3))
+    archive_frame = ctk.CTkFrame(import_content_frame, fg_color="transparent")
+    archive_frame.pack(fill="x", padx=20, pady=(0, 10))
+    
+    widgets['archive_entry'] = ctk.CTkEntry(archive_frame, width=300)
+    widgets['archive_entry'].pack(side="left", padx=(0, 10))
+    widgets['archive_entry'].bind("<Return>", lambda e: on_analyze())
+    ctk.CTkButton(archive_frame, text="Browse", command=on_browse, width=100).pack(side="left")
+    
+    # Main horizontal container for character list and options
+    main_import_frame = ctk.CTkFrame(import_content_frame, fg_color="transparent")
+    main_import_frame.pack(fill="both", expand=True, padx=20)
+    
+    # Left side - characters found in the archive
+    left_frame = ctk.CTkFrame(main_import_frame, fg_color="transparent")
+    left_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
+    
+    widgets['summary_label'] = ctk.CTkLabel(left_frame, text="Select an archive to import.", font=("Arial", 12), anchor="w", justify="left")
+    widgets['summary_label'].pack(anchor="w", pady=(0, 3))
+    
+    widgets['char_list'] = VirtualCheckList(left_frame, border_width=2, border_color=("gray60", "gray40"))
+    widgets['char_list'].pack(fill="both", expand=True)
+    
+    # Right side - selection, rename mapping and options
+    right_frame = ctk.CTkFrame(main_import_frame, fg_color="transparent")
+    right_frame.pack(side="right", fill="y", padx=(10, 0))
+    
+    ctk.CTkLabel(right_frame, text="Selection:", font=("Arial", 12)).pack(anchor="w", pady=(0, 3))
+    import_controls_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
+    import_controls_frame.pack(fill="x", pady=(0, 15))
+    ctk.CTkButton(import_controls_frame, text="Select All", command=widgets['char_list'].select_all, width=160).pack(fill="x", pady=(0, 3))
+    ctk.CTkButton(import_controls_frame, text="Deselect All", command=widgets['char_list'].deselect_all, width=160).pack(fill="x")
+    
+    ctk.CTkLabel(right_frame, text="Rename (Old=New per line):", font=("Arial", 12)).pack(anchor="w", pady=(0, 3))
+    widgets['rename_textbox'] = ctk.CTkTextbox(right_frame, width=160, height=80)
+    widgets['rename_textbox'].pack(fill="x", pady=(0, 3))
+    ctk.CTkButton(right_frame, text="Apply Rename", command=on_analyze, width=160).pack(fill="x", pady=(0, 15))
+    
+    widgets['overwrite_checkbox'] = ctk.CTkCheckBox(right_frame, text="Overwrite existing files", state="normal")
+    widgets['overwrite_checkbox'].pack(anchor="w", pady=(0, 15))
+    
+    # Import button - left aligned
+    widgets['import_button'] = ctk.CTkButton(import_content_frame, text="Import Selected", command=on_import,
+                                             font=("Arial", 12, "bold"), height=40)
+    widgets['import_button'].pack(anchor="w", padx=20, pady=(10, 15))
+    
+    return widgets
+
+
+def create_backups_tab(parent, on_character_change: Callable, on_backup_select: Callable,
+                       on_restore: Callable, on_prune: Callable) -> dict:
+    """Create the Backups tab and return widget references."""
+    widgets = {}
+    
+    backups_content_frame = parent
+    
+    # Character and backup pickers
+    ctk.CTkLabel(backups_content_frame, text="Character:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(15, 3))
+    widgets['char_combo'] = ctk.CTkComboBox(backups_content_frame, values=[], width=300, state="readonly",
+                                            command=on_character_change)
+    widgets['char_combo'].pack(anchor="w", padx=20, pady=(0, 10))
+    
+    ctk.CTkLabel(backups_content_frame, text="Backup:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['backup_combo'] = ctk.CTkComboBox(backups_content_frame, values=[], width=450, state="readonly",
+                                              command=on_backup_select)
+    widgets['backup_combo'].pack(anchor="w", padx=20, pady=(0, 10))
+    
+    # Files held by the selected backup
+    ctk.CTkLabel(backups_content_frame, text="Files in Backup:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['details_textbox'] = ctk.CTkTextbox(backups_content_frame, height=150, state="disabled")
+    widgets['details_textbox'].pack(fill="both", expand=True, padx=20)
+    
+    widgets['store_label'] = ctk.CTkLabel(backups_content_frame, text="", font=("Arial", 11), text_color="gray")
+    widgets['store_label'].pack(anchor="w", padx=20, pady=(3, 0))
+    
+    # Restore button - left aligned, with pruning beside it
+    button_frame = ctk.CTkFrame(backups_content_frame, fg_color="transparent")
+    button_frame.pack(fill="x", padx=20, pady=(10, 15))
+    widgets['restore_button'] = ctk.CTkButton(button_frame, text="Restore Backup", command=on_restore,
+                                              font=("Arial", 12, "bold"), height=40)
+    widgets['restore_button'].pack(side="left")
+    ctk.CTkButton(button_frame, text="Prune Old Backups", command=on_prune, width=140).pack(side="left", padx=(10, 0))
+    
+    return widgets
+
+
+def create_duplicates_tab(parent, on_find: Callable, on_cluster_select: Callable, on_use_source: Callable,
+                          on_use_targets: Callable, on_export: Callable) -> dict:
+    """Create the Identical Files tab and return widget references."""
+    widgets = {}
+    
+    duplicates_content_frame = parent
+    
+    # Run the analysis
+    find_row = ctk.CTkFrame(duplicates_content_frame, fg_color="transparent")
+    find_row.pack(fill="x", padx=20, pady=(15, 10))
+    widgets['find_button'] = ctk.CTkButton(find_row, text="Find Identical Files", command=on_find, width=160)
+    widgets['find_button'].pack(side="left")
+    widgets['summary_label'] = ctk.CTkLabel(find_row, text="", font=("Arial", 11), text_color="gray")
+    widgets['summary_label'].pack(side="left", padx=(10, 0))
+    
+    # Groups of characters sharing a file
+    ctk.CTkLabel(duplicates_content_frame, text="Group:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['cluster_combo'] = ctk.CTkComboBox(duplicates_content_frame, values=[], width=450, state="readonly",
+                                               command=on_cluster_select)
+    widgets['cluster_combo'].pack(anchor="w", padx=20, pady=(0, 10))
+    
+    ctk.CTkLabel(duplicates_content_frame, text="Characters in Group:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['members_textbox'] = ctk.CTkTextbox(duplicates_content_frame, height=150, state="disabled")
+    widgets['members_textbox'].pack(fill="both", expand=True, padx=20)
+    
+    # Hand the group to the Copy and Export tabs
+    button_frame = ctk.CTkFrame(duplicates_content_frame, fg_color="transparent")
+    button_frame.pack(fill="x", padx=20, pady=(10, 15))
+    ctk.CTkButton(button_frame, text="Copy From Group", command=on_use_source, width=140).pack(side="left")
+    ctk.CTkButton(button_frame, text="Copy To Group", command=on_use_targets, width=140).pack(side="left", padx=(10, 0))
+    ctk.CTkButton(button_frame, text="Export Group", command=on_export, width=140).pack(side="left", padx=(10, 0))
+    
+    return widgets
+
+
+def create_templates_tab(parent, on_save: Callable, on_template_select: Callable, on_delete: Callable,
+                         on_apply: Callable) -> dict:
+    """Create the Templates tab and return widget references."""
+    widgets = {}
+    
+    templates_content_frame = parent
+    
+    # Capture a character's files under a name
+    ctk.CTkLabel(templates_content_frame, text="Save Character as Template:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(15, 3))
+    save_row = ctk.CTkFrame(templates_content_frame, fg_color="transparent")
+    save_row.pack(fill="x", padx=20, pady=(0, 10))
+    widgets['char_combo'] = ctk.CTkComboBox(save_row, values=[], width=220, state="readonly")
+    widgets['char_combo'].pack(side="left")
+    widgets['char_filter'] = ctk.CTkEntry(save_row, placeholder_text="Type to filter", width=120)
+    widgets['char_filter'].pack(side="left", padx=(10, 0))
+    widgets['name_entry'] = ctk.CTkEntry(save_row, placeholder_text="Template name", width=160)
+    widgets['name_entry'].pack(side="left", padx=(10, 0))
+    ctk.CTkButton(save_row, text="Save Template", command=on_save, width=120).pack(side="left", padx=(10, 0))
+    
+    # Pick a saved template
+    ctk.CTkLabel(templates_content_frame, text="Template:", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    template_row = ctk.CTkFrame(templates_content_frame, fg_color="transparent")
+    template_row.pack(fill="x", padx=20, pady=(0, 3))
+    widgets['template_combo'] = ctk.CTkComboBox(template_row, values=[], width=300, state="readonly",
+                                                command=on_template_select)
+    widgets['template_combo'].pack(side="left")
+    ctk.CTkButton(template_row, text="Delete", command=on_delete, width=80).pack(side="left", padx=(10, 0))
+    widgets['details_label'] = ctk.CTkLabel(templates_content_frame, text="", font=("Arial", 11), text_color="gray")
+    widgets['details_label'].pack(anchor="w", padx=20, pady=(0, 10))
+    
+    # New characters to create from it
+    ctk.CTkLabel(templates_content_frame, text="New Character Names (one per line):", font=("Arial", 12)).pack(anchor="w", padx=20, pady=(0, 3))
+    widgets['names_textbox'] = ctk.CTkTextbox(templates_content_frame, height=120)
+    widgets['names_textbox'].pack(fill="both", expand=True, padx=20)
+    
+    widgets['overwrite_checkbox'] = ctk.CTkCheckBox(templates_content_frame, text="Overwrite existing characters")
+    widgets['overwrite_checkbox'].pack(anchor="w", padx=20, pady=(10, 0))
+    
+    widgets['apply_button'] = ctk.CTkButton(templates_content_frame, text="Create Characters", command=on_apply,
+                                            font=("Arial", 12, "bold"), height=40)
+    widgets['apply_button'].pack(anchor="w", padx=20, pady=(10, 15))
+    
+    return widgets
+
+
+def create_diff_dialog(parent, message: str, on_confirm: Callable, on_cancel: Callable) -> dict:
+    """Create the overwrite confirmation window with a change summary and diff; returns widget references."""
+    widgets = {}
+    
+    window = ctk.CTkToplevel(parent)
+    window.title("Confirm Overwrite")
+    window.geometry("700x550")
+    window.transient(parent)
+    window.protocol("WM_DELETE_WINDOW", on_cancel)
+    widgets['window'] = window
+    
+    ctk.CTkLabel(window, text=message, font=("Arial", 12), justify="left", wraplength=650).pack(anchor="w", padx=20, pady=(15, 5))
+    widgets['summary_label'] = ctk.CTkLabel(window, text="Comparing files...", font=("Arial", 12, "bold"),
+                                            justify="left", wraplength=650)
+    widgets['summary_label'].pack(anchor="w", padx=20, pady=(0, 5))
+    
+    # Section and key changes, filled in as they are found
+    widgets['diff_textbox'] = ctk.CTkTextbox(window, font=("Courier", 11), state="disabled", wrap="none")
+    widgets['diff_textbox'].pack(fill="both", expand=True, padx=20)
+    
+    button_frame = ctk.CTkFrame(window, fg_color="transparent")
+    button_frame.pack(fill="x", padx=20, pady=(10, 15))
+    ctk.CTkButton(button_frame, text="Copy", command=on_confirm, font=("Arial", 12, "bold"), height=40).pack(side="left")
+    ctk.CTkButton(button_frame, text="Cancel", command=on_cancel, width=100, height=40).pack(side="left", padx=(10, 0))
     
     return widgets
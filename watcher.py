@@ -0,0 +1,230 @@
+"""Watch scanned directories for character files the game writes.
+
+A watcher runs on a daemon thread and collects the names of character files
+that were created, rewritten, deleted or renamed. The UI drains them in
+batches with drain() and hands them to installs.apply_written_files(), which
+re-stats just those files, so the index stays current without rescanning.
+
+On Linux the watcher uses inotify through ctypes. Elsewhere, or when inotify
+is unavailable (e.g. the watch limit is reached), it falls back to polling:
+each directory is listed with os.scandir every POLL_INTERVAL seconds and
+compared with the previous listing. On Windows scandir returns size and
+mtime without extra system calls, so a poll costs one directory listing.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from character_scanner import CHARACTER_FILE_SUFFIXES
+from installs import Directory, qualify
+
+
+# Seconds between directory listings of the polling watcher
+POLL_INTERVAL = 2.0
+
+# Seconds the inotify thread waits for events before checking for stop()
+STOP_CHECK_INTERVAL = 0.5
+
+# inotify flags (see inotify(7))
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Events that may change a character file; IN_CLOSE_WRITE rather than
+# IN_MODIFY, so a file being written is picked up once it is complete
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct('iIII')
+READ_BUFFER_SIZE = 64 * 1024
+
+
+def _list_character_files(path: str) -> Dict[str, Tuple[int, int, int]]:
+    """Return character file name -> (size, mtime_ns, inode) for one directory."""
+    files = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            if not entry.name.endswith(CHARACTER_FILE_SUFFIXES):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            files[entry.name] = (st.st_size, st.st_mtime_ns, st.st_ino)
+    return files
+
+
+class DirectoryWatcher:
+    """
+    Base class: watches a Directory (one path, or install -> path) on a
+    daemon thread and collects changed character file names.
+    """
+
+    def __init__(self, directory: Directory):
+        # install (None for a single directory) -> path
+        self.directories: Dict[Optional[str], str] = (
+            {None: directory} if isinstance(directory, str) else dict(directory)
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'DirectoryWatcher':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop watching; the thread exits within STOP_CHECK_INTERVAL/POLL_INTERVAL."""
+        self._stop_event.set()
+
+    def drain(self) -> List[str]:
+        """Return and forget the file names changed since the last call, qualified like the index."""
+        with self._lock:
+            names, self._pending = self._pending, set()
+        return sorted(names)
+
+    def _changed(self, install: Optional[str], filenames):
+        """Record changed file names from the watcher thread."""
+        names = [name if install is None else qualify(install, name)
+                 for name in filenames if name.endswith(CHARACTER_FILE_SUFFIXES)]
+        if names:
+            with self._lock:
+                self._pending.update(names)
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class PollingWatcher(DirectoryWatcher):
+    """Finds changes by comparing directory listings taken POLL_INTERVAL apart."""
+
+    def __init__(self, directory: Directory, interval: float = POLL_INTERVAL):
+        super().__init__(directory)
+        self.interval = interval
+
+    def _run(self):
+        listings = {}
+        for install, path in self.directories.items():
+            try:
+                listings[install] = _list_character_files(path)
+            except OSError:
+                listings[install] = None
+
+        while not self._stop_event.wait(self.interval):
+            for install, path in self.directories.items():
+                try:
+                    current = _list_character_files(path)
+                except OSError:
+                    # Keep the last listing while the directory is unreachable
+                    continue
+                previous = listings[install]
+                listings[install] = current
+                if previous is None:
+                    continue
+                self._changed(install, [
+                    name for name in previous.keys() | current.keys()
+                    if previous.get(name) != current.get(name)
+                ])
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Receives changes from the Linux kernel through inotify."""
+
+    def __init__(self, directory: Directory):
+        super().__init__(directory)
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        # Watch descriptor -> install; names seen per install, to resync after an overflow
+        self._installs: Dict[int, Optional[str]] = {}
+        self._names: Dict[Optional[str], Set[str]] = {}
+        try:
+            for install, path in self.directories.items():
+                wd = libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), path)
+                self._installs[wd] = install
+                self._names[install] = set(_list_character_files(path))
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _resync(self):
+        """Report every file of every directory after the kernel dropped events."""
+        for install, path in self.directories.items():
+            try:
+                current = set(_list_character_files(path))
+            except OSError:
+                continue
+            self._changed(install, self._names[install] | current)
+            self._names[install] = current
+
+    def _handle(self, data: bytes):
+        """Record the file names in a buffer of inotify events."""
+        changed: Dict[Optional[str], List[str]] = {}
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].split(b'\0', 1)[0]
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._resync()
+                continue
+            if mask & IN_IGNORED or wd not in self._installs or not raw_name:
+                continue
+            install = self._installs[wd]
+            name = os.fsdecode(raw_name)
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._names[install].discard(name)
+            else:
+                self._names[install].add(name)
+            changed.setdefault(install, []).append(name)
+
+        for install, names in changed.items():
+            self._changed(install, names)
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self._fd], [], [], STOP_CHECK_INTERVAL)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(self._fd, READ_BUFFER_SIZE)
+                except BlockingIOError:
+                    continue
+                self._handle(data)
+        finally:
+            os.close(self._fd)
+
+
+def create_watcher(directory: Directory) -> DirectoryWatcher:
+    """Return an unstarted inotify watcher on Linux, or a polling watcher."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            # No inotify symbols, or out of instances/watches
+            pass
+    return PollingWatcher(directory)